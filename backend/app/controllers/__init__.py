@@ -3,11 +3,13 @@ from .issues import IssueController
 from .comments import CommentController
 from .labels import LabelController
 from .reports import ReportController
+from .admin import AdminController
 
 __all__ = [
     "UserController",
     "IssueController",
     "CommentController",
     "LabelController",
-    "ReportController"
+    "ReportController",
+    "AdminController"
 ]
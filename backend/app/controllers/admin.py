@@ -0,0 +1,70 @@
+from typing import List
+
+from fastapi import HTTPException, Response
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.database import async_engine, async_read_engine, PoolInstrumentation
+from app.core.profiling import profile_store, stats_file, stats_report
+from app.core.slow_queries import slow_query_log
+from app.schemas import DatabasePoolStats, PoolStats, RequestProfile, SlowQuery, SlowQueryReport
+
+
+class AdminController:
+    """Controller for operational endpoints"""
+
+    @staticmethod
+    def get_pool_stats() -> DatabasePoolStats:
+        """Get live connection pool statistics for the primary and replica"""
+        pools = [AdminController._pool_stats("primary", async_engine)]
+        if async_read_engine is not None:
+            pools.append(AdminController._pool_stats("replica", async_read_engine))
+        return DatabasePoolStats(pools=pools)
+
+    @staticmethod
+    def get_slow_queries(limit: int) -> SlowQueryReport:
+        """Get this worker's most recent slow statements with their plans"""
+        return SlowQueryReport(
+            threshold_ms=slow_query_log.threshold_ms,
+            queries=[SlowQuery(**entry) for entry in slow_query_log.entries()[:limit]],
+        )
+
+    @staticmethod
+    def get_profiles() -> List[RequestProfile]:
+        """Get this worker's recent request profiles, without their stacks"""
+        return [RequestProfile(**profile) for profile in profile_store.list()]
+
+    @staticmethod
+    def get_profile(profile_id: str, output_format: str, sort: str) -> Response:
+        """Get one profile as a pstats text report or a .pstats file"""
+        profile = profile_store.get(profile_id)
+        if profile is None:
+            raise HTTPException(
+                status_code=404,
+                detail="Profile not found (it may have been taken by another worker)"
+            )
+        if output_format == "pstats":
+            return Response(
+                stats_file(profile["profiler"]),
+                media_type="application/octet-stream",
+                headers={"Content-Disposition": f'attachment; filename="{profile_id}.pstats"'}
+            )
+        return PlainTextResponse(stats_report(profile["profiler"], sort))
+
+    @staticmethod
+    def _pool_stats(name: str, db_engine: AsyncEngine) -> PoolStats:
+        """Helper method to read the counters of one engine's pool"""
+        pool = db_engine.pool
+        if not isinstance(pool, PoolInstrumentation):
+            return PoolStats(name=name, pool_class=type(pool).__name__)
+
+        return PoolStats(
+            name=name,
+            pool_class=type(pool).__name__,
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            waiters=pool.waiters(),
+            checkout_wait_ms=pool.checkout_wait_ms.snapshot(),
+        )
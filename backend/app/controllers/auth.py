@@ -1,5 +1,7 @@
 from datetime import datetime, timedelta, timezone
-from sqlalchemy.orm import Session
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from app.models.user import User as UserModel
 from app.schemas.auth import (
@@ -11,23 +13,24 @@ from app.schemas.auth import (
     PasswordResetResponse,
     PasswordResetConfirm,
 )
-from app.core.auth import (
-    verify_password,
-    get_password_hash,
-    create_access_token,
-)
+from fastapi.security import HTTPAuthorizationCredentials
+from app.core.auth import create_access_token, decode_access_token
+from app.core.config import settings
+from app.core.revocation import revocation_list
+from app.core.passwords import password_hasher
 import random
 import string
 
 
 class AuthController:
     @staticmethod
-    def register_user(user_data: UserRegister, db: Session) -> LoginResponse:
+    async def register_user(user_data: UserRegister, db: AsyncSession) -> LoginResponse:
         """Register a new user"""
         # Check if username already exists
-        existing_user = db.query(UserModel).filter(
+        result = await db.execute(select(UserModel).where(
             UserModel.username == user_data.username
-        ).first()
+        ))
+        existing_user = result.scalars().first()
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -35,17 +38,18 @@ class AuthController:
             )
 
         # Check if email already exists
-        existing_email = db.query(UserModel).filter(
+        result = await db.execute(select(UserModel).where(
             UserModel.email == user_data.email
-        ).first()
+        ))
+        existing_email = result.scalars().first()
         if existing_email:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
 
-        # Create new user
-        hashed_password = get_password_hash(user_data.password)
+        # Create new user; bcrypt is CPU-bound, so it runs in the password pool
+        hashed_password = await password_hasher.hash(user_data.password)
         db_user = UserModel(
             username=user_data.username,
             email=user_data.email,
@@ -55,8 +59,8 @@ class AuthController:
         )
 
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
+        await db.refresh(db_user)
 
         # Create access token
         access_token = create_access_token(
@@ -78,12 +82,13 @@ class AuthController:
         )
 
     @staticmethod
-    def login_user(credentials: UserLogin, db: Session) -> LoginResponse:
+    async def login_user(credentials: UserLogin, db: AsyncSession) -> LoginResponse:
         """Authenticate user and return token"""
         # Find user by email
-        user = db.query(UserModel).filter(
+        result = await db.execute(select(UserModel).where(
             UserModel.email == credentials.email
-        ).first()
+        ))
+        user = result.scalars().first()
 
         if not user:
             raise HTTPException(
@@ -93,7 +98,7 @@ class AuthController:
             )
 
         # Verify password
-        if not verify_password(credentials.password, user.hashed_password):
+        if not await password_hasher.verify(credentials.password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
@@ -107,6 +112,11 @@ class AuthController:
                 detail="Inactive user"
             )
 
+        # Upgrade the stored hash now that the plain password is at hand
+        if password_hasher.needs_rehash(user.hashed_password):
+            user.hashed_password = await password_hasher.hash(credentials.password)
+            await db.commit()
+
         # Create access token
         access_token = create_access_token(
             data={"sub": str(user.id), "username": user.username}
@@ -132,14 +142,15 @@ class AuthController:
         return ''.join(random.choices(string.ascii_uppercase + string.digits, k=9))
 
     @staticmethod
-    def request_password_reset(
-        request: PasswordResetRequest, db: Session
+    async def request_password_reset(
+        request: PasswordResetRequest, db: AsyncSession
     ) -> PasswordResetResponse:
         """Generate password reset code"""
         # Find user by email
-        user = db.query(UserModel).filter(
+        result = await db.execute(select(UserModel).where(
             UserModel.email == request.email
-        ).first()
+        ))
+        user = result.scalars().first()
 
         if not user:
             # For security, don't reveal if email exists
@@ -157,7 +168,7 @@ class AuthController:
         # Save reset code to user
         user.reset_code = reset_code
         user.reset_code_expires = reset_code_expires
-        db.commit()
+        await db.commit()
 
         return PasswordResetResponse(
             reset_code=reset_code,
@@ -165,14 +176,15 @@ class AuthController:
         )
 
     @staticmethod
-    def reset_password(
-        reset_data: PasswordResetConfirm, db: Session
+    async def reset_password(
+        reset_data: PasswordResetConfirm, db: AsyncSession
     ) -> dict:
         """Reset user password with code"""
         # Find user by email
-        user = db.query(UserModel).filter(
+        result = await db.execute(select(UserModel).where(
             UserModel.email == reset_data.email
-        ).first()
+        ))
+        user = result.scalars().first()
 
         if not user:
             raise HTTPException(
@@ -202,13 +214,30 @@ class AuthController:
                 )
 
         # Reset password
-        user.hashed_password = get_password_hash(reset_data.new_password)
+        user.hashed_password = await password_hasher.hash(reset_data.new_password)
         user.reset_code = None
         user.reset_code_expires = None
-        db.commit()
+        await db.commit()
 
         return {"success": True, "message": "Password reset successfully"}
 
+    @staticmethod
+    async def logout_user(
+        credentials: Optional[HTTPAuthorizationCredentials],
+        db: AsyncSession
+    ) -> dict:
+        """Revoke the presented token, if any, so it is rejected from now on"""
+        if credentials is not None:
+            token_data = decode_access_token(credentials.credentials)
+            if token_data.jti is not None:
+                expires_at = token_data.exp or (
+                    datetime.now(timezone.utc)
+                    + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+                ).timestamp()
+                await revocation_list.revoke(db, token_data.jti, token_data.user_id, expires_at)
+
+        return {"success": True, "message": "Logged out successfully"}
+
     @staticmethod
     def get_current_user_info(user: UserModel) -> UserResponse:
         """Get current user information"""
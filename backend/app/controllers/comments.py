@@ -1,7 +1,9 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 
-from app.models import Comment as CommentModel, Issue as IssueModel, User as UserModel
+from app.core.statements import ISSUE_EXISTS, USER_BY_ID
+from app.models import Comment as CommentModel, Issue as IssueModel
 from app.schemas import CommentCreate
 
 
@@ -9,19 +11,20 @@ class CommentController:
     """Controller for comment-related business logic"""
 
     @staticmethod
-    def create_comment(
+    async def create_comment(
         issue_id: int,
         comment: CommentCreate,
-        db: Session
+        db: AsyncSession
     ) -> CommentModel:
         """Add a comment to an issue"""
         # Validate issue exists
-        issue = db.query(IssueModel).filter(IssueModel.id == issue_id).first()
-        if not issue:
+        result = await db.execute(ISSUE_EXISTS, {"issue_id": issue_id})
+        if result.scalar() is None:
             raise HTTPException(status_code=404, detail="Issue not found")
 
         # Validate author exists
-        author = db.query(UserModel).filter(UserModel.id == comment.author_id).first()
+        result = await db.execute(USER_BY_ID, {"user_id": comment.author_id})
+        author = result.scalars().first()
         if not author:
             raise HTTPException(status_code=404, detail="Author not found")
 
@@ -37,7 +40,15 @@ class CommentController:
             issue_id=issue_id
         )
         db.add(db_comment)
-        db.commit()
-        db.refresh(db_comment)
+        # Counted in SQL so concurrent comments cannot lose an increment
+        await db.execute(
+            update(IssueModel)
+            .where(IssueModel.id == issue_id)
+            .values(comment_count=IssueModel.comment_count + 1, updated_at=IssueModel.updated_at)
+        )
+        await db.commit()
+        await db.refresh(db_comment)
 
+        # Attach the author already loaded so serialization needs no lazy load
+        db_comment.author = author
         return db_comment
@@ -1,15 +1,23 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select, delete, Select
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, UploadFile
-from typing import List, Dict, Any
-from datetime import datetime
+from starlette.concurrency import run_in_threadpool
+from typing import List, Dict, Any, AsyncContextManager, AsyncIterator, Callable
+from datetime import datetime, timezone
 import csv
+import enum
 import io
 
+from app.core.config import settings
+from app.core.history_archive import read_archived_history
+from app.core.statements import ISSUE_BY_ID, ISSUE_COMMENTS, ISSUE_LABELS, ISSUE_ROWS, USER_BY_ID
+
 from app.models import (
     Issue as IssueModel,
     IssueStatus,
     Comment as CommentModel,
-    Label as LabelModel,
     IssueLabel,
     User as UserModel,
     IssueHistory
@@ -23,32 +31,47 @@ from app.schemas import (
 )
 
 
+# Import columns first, so an export can be imported again as is
+EXPORT_COLUMNS = (
+    "title", "description", "status", "priority", "creator_id", "assignee_id",
+    "id", "created_at", "resolved_at", "comment_count"
+)
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
 class IssueController:
     """Controller for issue-related business logic"""
 
     @staticmethod
-    def create_issue(issue: IssueCreate, db: Session) -> IssueModel:
+    async def create_issue(issue: IssueCreate, db: AsyncSession) -> IssueModel:
         """Create a new issue"""
         # Validate creator exists
-        creator = db.query(UserModel).filter(UserModel.id == issue.creator_id).first()
+        result = await db.execute(USER_BY_ID, {"user_id": issue.creator_id})
+        creator = result.scalars().first()
         if not creator:
             raise HTTPException(status_code=404, detail="Creator not found")
 
         # Validate assignee if provided
         if issue.assignee_id:
-            assignee = db.query(UserModel).filter(
-                UserModel.id == issue.assignee_id
-            ).first()
+            result = await db.execute(USER_BY_ID, {"user_id": issue.assignee_id})
+            assignee = result.scalars().first()
             if not assignee:
                 raise HTTPException(status_code=404, detail="Assignee not found")
 
         db_issue = IssueModel(**issue.model_dump())
         db.add(db_issue)
-        db.commit()
-        db.refresh(db_issue)
+        await db.commit()
+        await db.refresh(db_issue)
 
         # Create history entry
-        IssueController._create_history_entry(
+        await IssueController._create_history_entry(
             db=db,
             issue_id=db_issue.id,
             changed_by_id=issue.creator_id,
@@ -60,42 +83,101 @@ class IssueController:
         return db_issue
 
     @staticmethod
-    def get_issues(
+    async def get_issues(
         status: IssueStatus | None,
         assignee_id: int | None,
         creator_id: int | None,
         skip: int,
         limit: int,
-        db: Session
-    ) -> List[IssueModel]:
-        """Get list of issues with filtering and pagination"""
-        query = db.query(IssueModel)
+        db: AsyncSession
+    ) -> List[RowMapping]:
+        """Get list of issues with filtering and pagination, as plain rows"""
+        query = IssueController._filter_issues(ISSUE_ROWS, status, assignee_id, creator_id)
+        result = await db.execute(query.offset(skip).limit(limit))
+        return result.mappings().all()
+
+    @staticmethod
+    async def get_issues_batch(issue_ids: List[int], db: AsyncSession) -> List[RowMapping]:
+        """Get several issues in one query, as plain rows in the order requested"""
+        issue_ids = list(dict.fromkeys(issue_ids))
+        if len(issue_ids) > settings.ISSUE_BATCH_MAX_IDS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {settings.ISSUE_BATCH_MAX_IDS} issues can be fetched at once"
+            )
+
+        result = await db.execute(ISSUE_ROWS.where(IssueModel.id.in_(issue_ids)))
+        rows = {row["id"]: row for row in result.mappings()}
+        missing = [issue_id for issue_id in issue_ids if issue_id not in rows]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Issues not found: {missing}")
+        return [rows[issue_id] for issue_id in issue_ids]
 
+    @staticmethod
+    async def export_issues_csv(
+        status: IssueStatus | None,
+        assignee_id: int | None,
+        creator_id: int | None,
+        read_session: Callable[[], AsyncContextManager[AsyncSession]]
+    ) -> AsyncIterator[str]:
+        """Stream issues as CSV, in columns the CSV import accepts
+
+        Runs while the response streams, after the endpoint's dependencies are
+        closed, so it opens its session from read_session and closes it when
+        done or when the client goes away.
+        """
+        columns = [IssueModel.__table__.c[name] for name in EXPORT_COLUMNS]
+        query = IssueController._filter_issues(select(*columns), status, assignee_id, creator_id)
+        query = query.order_by(IssueModel.id).execution_options(
+            yield_per=settings.ISSUE_EXPORT_BATCH_SIZE
+        )
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        yield buffer.getvalue()
+
+        async with read_session() as db:
+            result = await db.stream(query)
+            async for rows in result.partitions():
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows(
+                    [_csv_value(value) for value in row] for row in rows
+                )
+                yield buffer.getvalue()
+
+    @staticmethod
+    def _filter_issues(
+        query: Select,
+        status: IssueStatus | None,
+        assignee_id: int | None,
+        creator_id: int | None
+    ) -> Select:
         if status:
-            query = query.filter(IssueModel.status == status)
+            query = query.where(IssueModel.status == status)
         if assignee_id:
-            query = query.filter(IssueModel.assignee_id == assignee_id)
+            query = query.where(IssueModel.assignee_id == assignee_id)
         if creator_id:
-            query = query.filter(IssueModel.creator_id == creator_id)
-
-        return query.offset(skip).limit(limit).all()
+            query = query.where(IssueModel.creator_id == creator_id)
+        return query
 
     @staticmethod
-    def get_issue_by_id(issue_id: int, db: Session) -> Dict[str, Any]:
+    async def get_issue_by_id(issue_id: int, db: AsyncSession) -> Dict[str, Any]:
         """Get issue with comments and labels"""
-        issue = db.query(IssueModel).filter(IssueModel.id == issue_id).first()
+        params = {"issue_id": issue_id}
+        result = await db.execute(ISSUE_BY_ID, params)
+        issue = result.scalars().first()
         if not issue:
             raise HTTPException(status_code=404, detail="Issue not found")
 
-        # Get comments
-        comments = db.query(CommentModel).filter(
-            CommentModel.issue_id == issue_id
-        ).all()
+        # Get comments, with authors loaded up front for serialization
+        result = await db.execute(ISSUE_COMMENTS, params)
+        comments = result.scalars().all()
 
         # Get labels
-        labels = db.query(LabelModel).join(IssueLabel).filter(
-            IssueLabel.issue_id == issue_id
-        ).all()
+        result = await db.execute(ISSUE_LABELS, params)
+        labels = result.scalars().all()
 
         return {
             **issue.__dict__,
@@ -104,14 +186,15 @@ class IssueController:
         }
 
     @staticmethod
-    def update_issue(
+    async def update_issue(
         issue_id: int,
         issue_update: IssueUpdate,
         current_user_id: int,
-        db: Session
+        db: AsyncSession
     ) -> IssueModel:
         """Update issue with optimistic concurrency control"""
-        db_issue = db.query(IssueModel).filter(IssueModel.id == issue_id).first()
+        result = await db.execute(ISSUE_BY_ID, {"issue_id": issue_id})
+        db_issue = result.scalars().first()
         if not db_issue:
             raise HTTPException(status_code=404, detail="Issue not found")
 
@@ -145,12 +228,12 @@ class IssueController:
         # Increment version
         db_issue.version += 1
 
-        db.commit()
-        db.refresh(db_issue)
+        await db.commit()
+        await db.refresh(db_issue)
 
         # Create history entries
         for change in changes:
-            IssueController._create_history_entry(
+            await IssueController._create_history_entry(
                 db=db,
                 issue_id=issue_id,
                 changed_by_id=current_user_id,
@@ -160,17 +243,18 @@ class IssueController:
         return db_issue
 
     @staticmethod
-    def bulk_status_update(
+    async def bulk_status_update(
         bulk_update: IssueBulkStatusUpdate,
         current_user_id: int,
-        db: Session
+        db: AsyncSession
     ) -> Dict[str, str]:
         """Transactional bulk status update with rollback on error"""
         try:
             # Start transaction
-            issues = db.query(IssueModel).filter(
+            result = await db.execute(select(IssueModel).where(
                 IssueModel.id.in_(bulk_update.issue_ids)
-            ).all()
+            ))
+            issues = result.scalars().all()
 
             if len(issues) != len(bulk_update.issue_ids):
                 raise HTTPException(
@@ -190,7 +274,7 @@ class IssueController:
                     issue.resolved_at = datetime.now()
 
                 # Create history entry
-                IssueController._create_history_entry(
+                await IssueController._create_history_entry(
                     db=db,
                     issue_id=issue.id,
                     changed_by_id=current_user_id,
@@ -199,20 +283,20 @@ class IssueController:
                     new_value=bulk_update.status.value
                 )
 
-            db.commit()
+            await db.commit()
             return {"message": f"Successfully updated {len(issues)} issues"}
 
         except HTTPException:
-            db.rollback()
+            await db.rollback()
             raise
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             raise HTTPException(status_code=400, detail=str(e))
 
     @staticmethod
     async def import_issues_from_csv(
         file: UploadFile,
-        db: Session
+        db: AsyncSession
     ) -> CSVImportResult:
         """Import issues from CSV file with validation"""
         if not file.filename.endswith('.csv'):
@@ -227,7 +311,7 @@ class IssueController:
         failed = 0
 
         for row_num, row in enumerate(reader, start=2):
-            result = IssueController._process_csv_row(row, row_num, db)
+            result = await IssueController._process_csv_row(row, row_num, db)
             results.append(result)
 
             if result.success:
@@ -235,7 +319,7 @@ class IssueController:
             else:
                 failed += 1
 
-        db.commit()
+        await db.commit()
 
         return CSVImportResult(
             total_rows=len(results),
@@ -245,21 +329,47 @@ class IssueController:
         )
 
     @staticmethod
-    def get_issue_timeline(issue_id: int, db: Session) -> List[IssueHistory]:
-        """Get issue history timeline"""
-        issue = db.query(IssueModel).filter(IssueModel.id == issue_id).first()
+    async def get_issue_timeline(
+        issue_id: int,
+        db: AsyncSession,
+        include_archived: bool = False
+    ) -> List[IssueHistory]:
+        """Get issue history timeline, optionally including archived months"""
+        result = await db.execute(ISSUE_BY_ID, {"issue_id": issue_id})
+        issue = result.scalars().first()
         if not issue:
             raise HTTPException(status_code=404, detail="Issue not found")
 
-        timeline = db.query(IssueHistory).filter(
+        result = await db.execute(select(IssueHistory).options(
+            selectinload(IssueHistory.changed_by)
+        ).where(
             IssueHistory.issue_id == issue_id
-        ).order_by(IssueHistory.changed_at.desc()).all()
+        ).order_by(IssueHistory.changed_at.desc()))
+        timeline = list(result.scalars().all())
+
+        if include_archived:
+            archived = await run_in_threadpool(
+                read_archived_history, issue_id, settings.HISTORY_ARCHIVE_DIR, issue.created_at
+            )
+            user_ids = {row["changed_by_id"] for row in archived}
+            result = await db.execute(select(UserModel).where(UserModel.id.in_(user_ids)))
+            users = {user.id: user for user in result.scalars()}
+            # Transient objects, never added to the session
+            timeline += [
+                IssueHistory(**row, changed_by=users.get(row["changed_by_id"]))
+                for row in archived
+            ]
+            # SQLite hands back naive datetimes; archives are always UTC
+            timeline.sort(
+                key=lambda event: event.changed_at.replace(tzinfo=event.changed_at.tzinfo or timezone.utc),
+                reverse=True
+            )
 
         return timeline
 
     @staticmethod
-    def _create_history_entry(
-        db: Session,
+    async def _create_history_entry(
+        db: AsyncSession,
         issue_id: int,
         changed_by_id: int,
         field_name: str,
@@ -275,13 +385,13 @@ class IssueController:
             new_value=new_value
         )
         db.add(history)
-        db.commit()
+        await db.commit()
 
     @staticmethod
-    def _process_csv_row(
+    async def _process_csv_row(
         row: Dict[str, str],
         row_num: int,
-        db: Session
+        db: AsyncSession
     ) -> CSVImportRow:
         """Process a single CSV row"""
         errors = []
@@ -303,7 +413,8 @@ class IssueController:
 
             # Validate creator exists
             creator_id = int(row['creator_id'])
-            creator = db.query(UserModel).filter(UserModel.id == creator_id).first()
+            result = await db.execute(USER_BY_ID, {"user_id": creator_id})
+            creator = result.scalars().first()
             if not creator:
                 return CSVImportRow(
                     row_number=row_num,
@@ -315,9 +426,8 @@ class IssueController:
             assignee_id = row.get('assignee_id')
             if assignee_id:
                 assignee_id = int(assignee_id)
-                assignee = db.query(UserModel).filter(
-                    UserModel.id == assignee_id
-                ).first()
+                result = await db.execute(USER_BY_ID, {"user_id": assignee_id})
+                assignee = result.scalars().first()
                 if not assignee:
                     return CSVImportRow(
                         row_number=row_num,
@@ -337,7 +447,7 @@ class IssueController:
                 assignee_id=assignee_id
             )
             db.add(issue)
-            db.flush()  # Get the issue ID without committing
+            await db.flush()  # Get the issue ID without committing
 
             issue_id = issue.id
             return CSVImportRow(
@@ -354,9 +464,10 @@ class IssueController:
             )
 
     @staticmethod
-    def delete_issue(issue_id: int, current_user_id: int, db: Session) -> dict:
+    async def delete_issue(issue_id: int, current_user_id: int, db: AsyncSession) -> dict:
         """Delete an issue (only by creator)"""
-        db_issue = db.query(IssueModel).filter(IssueModel.id == issue_id).first()
+        result = await db.execute(ISSUE_BY_ID, {"issue_id": issue_id})
+        db_issue = result.scalars().first()
 
         if not db_issue:
             raise HTTPException(status_code=404, detail="Issue not found")
@@ -369,12 +480,12 @@ class IssueController:
             )
 
         # Delete associated records first (cascade)
-        db.query(CommentModel).filter(CommentModel.issue_id == issue_id).delete()
-        db.query(IssueLabel).filter(IssueLabel.issue_id == issue_id).delete()
-        db.query(IssueHistory).filter(IssueHistory.issue_id == issue_id).delete()
+        await db.execute(delete(CommentModel).where(CommentModel.issue_id == issue_id))
+        await db.execute(delete(IssueLabel).where(IssueLabel.issue_id == issue_id))
+        await db.execute(delete(IssueHistory).where(IssueHistory.issue_id == issue_id))
 
         # Delete the issue
-        db.delete(db_issue)
-        db.commit()
+        await db.delete(db_issue)
+        await db.commit()
 
         return {"success": True, "message": "Issue deleted successfully"}
@@ -1,7 +1,9 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select, delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 from typing import List
 
+from app.core.issue_counters import label_summary
 from app.models import Label as LabelModel, Issue as IssueModel, IssueLabel
 from app.schemas import LabelCreate
 
@@ -10,38 +12,42 @@ class LabelController:
     """Controller for label-related business logic"""
 
     @staticmethod
-    def create_label(label: LabelCreate, db: Session) -> LabelModel:
+    async def create_label(label: LabelCreate, db: AsyncSession) -> LabelModel:
         """Create a new label"""
         # Check if label already exists
-        existing = db.query(LabelModel).filter(LabelModel.name == label.name).first()
+        result = await db.execute(select(LabelModel).where(LabelModel.name == label.name))
+        existing = result.scalars().first()
         if existing:
             raise HTTPException(status_code=400, detail="Label already exists")
 
         db_label = LabelModel(**label.model_dump())
         db.add(db_label)
-        db.commit()
-        db.refresh(db_label)
+        await db.commit()
+        await db.refresh(db_label)
         return db_label
 
     @staticmethod
-    def get_labels(skip: int, limit: int, db: Session) -> List[LabelModel]:
+    async def get_labels(skip: int, limit: int, db: AsyncSession) -> List[LabelModel]:
         """Get list of labels"""
-        return db.query(LabelModel).offset(skip).limit(limit).all()
+        result = await db.execute(select(LabelModel).offset(skip).limit(limit))
+        return result.scalars().all()
 
     @staticmethod
-    def replace_issue_labels(
+    async def replace_issue_labels(
         issue_id: int,
         label_ids: List[int],
-        db: Session
+        db: AsyncSession
     ) -> List[LabelModel]:
         """Replace all labels for an issue atomically"""
         # Validate issue exists
-        issue = db.query(IssueModel).filter(IssueModel.id == issue_id).first()
+        result = await db.execute(select(IssueModel).where(IssueModel.id == issue_id))
+        issue = result.scalars().first()
         if not issue:
             raise HTTPException(status_code=404, detail="Issue not found")
 
         # Validate all labels exist
-        labels = db.query(LabelModel).filter(LabelModel.id.in_(label_ids)).all()
+        result = await db.execute(select(LabelModel).where(LabelModel.id.in_(label_ids)))
+        labels = result.scalars().all()
         if len(labels) != len(label_ids):
             raise HTTPException(
                 status_code=404,
@@ -49,22 +55,34 @@ class LabelController:
             )
 
         try:
+            # Updating the issue row first locks it, so concurrent replacements
+            # serialize and the label summary always matches issue_labels
+            await db.execute(
+                update(IssueModel)
+                .where(IssueModel.id == issue_id)
+                .values(
+                    label_names=label_summary(label.name for label in labels),
+                    updated_at=IssueModel.updated_at
+                )
+            )
+
             # Remove all existing labels
-            db.query(IssueLabel).filter(IssueLabel.issue_id == issue_id).delete()
+            await db.execute(delete(IssueLabel).where(IssueLabel.issue_id == issue_id))
 
             # Add new labels
             for label_id in label_ids:
                 issue_label = IssueLabel(issue_id=issue_id, label_id=label_id)
                 db.add(issue_label)
 
-            db.commit()
+            await db.commit()
 
             # Return updated labels
-            updated_labels = db.query(LabelModel).filter(
+            result = await db.execute(select(LabelModel).where(
                 LabelModel.id.in_(label_ids)
-            ).all()
+            ))
+            updated_labels = result.scalars().all()
             return updated_labels
 
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             raise HTTPException(status_code=400, detail=str(e))
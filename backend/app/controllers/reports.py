@@ -1,28 +1,65 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List
+from sqlalchemy import Select, func, select, case, distinct, literal, null, tuple_, type_coerce, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+from itertools import combinations
+from typing import List, Dict, Any
 
-from app.models import Issue as IssueModel, User as UserModel, IssueStatus
-from app.schemas import TopAssignee, LatencyReport
+from app.core.config import settings
+
+from app.models import (
+    Issue as IssueModel,
+    User as UserModel,
+    Label as LabelModel,
+    IssueLabel,
+    IssueStatus,
+    IssuePriority
+)
+from app.schemas import (
+    ReportFilter,
+    TopAssignee,
+    TopLabel,
+    LatencyReport,
+    CubeCell,
+    CubeReport
+)
+
+CUBE_DIMENSIONS = ("status", "priority", "assignee", "label")
 
 
 class ReportController:
     """Controller for report-related business logic"""
 
     @staticmethod
-    def get_top_assignees(limit: int, db: Session) -> List[TopAssignee]:
+    async def get_top_assignees(
+        limit: int,
+        db: AsyncSession,
+        filters: ReportFilter | None = None
+    ) -> List[TopAssignee]:
         """Get top assignees by number of issues"""
-        results = db.query(
-            UserModel.id.label('assignee_id'),
+        # Aggregate on issues alone first so the count can be served from
+        # ix_issues_assignee_status_priority, then resolve names for the top rows only
+        issue_count = func.count().label('issue_count')
+        counts_query = select(
+            IssueModel.assignee_id.label('assignee_id'),
+            issue_count
+        ).where(IssueModel.assignee_id.isnot(None))
+        counts_query = ReportController._apply_filters(counts_query, filters)
+        counts = counts_query.group_by(
+            IssueModel.assignee_id
+        ).order_by(
+            issue_count.desc(), IssueModel.assignee_id
+        ).limit(limit).subquery()
+
+        result = await db.execute(select(
+            counts.c.assignee_id,
             UserModel.username.label('assignee_name'),
-            func.count(IssueModel.id).label('issue_count')
+            counts.c.issue_count
         ).join(
-            IssueModel, UserModel.id == IssueModel.assignee_id
-        ).group_by(
-            UserModel.id, UserModel.username
+            UserModel, UserModel.id == counts.c.assignee_id
         ).order_by(
-            func.count(IssueModel.id).desc()
-        ).limit(limit).all()
+            counts.c.issue_count.desc(), counts.c.assignee_id
+        ))
+        results = result.all()
 
         return [
             TopAssignee(
@@ -34,12 +71,54 @@ class ReportController:
         ]
 
     @staticmethod
-    def get_average_resolution_time(db: Session) -> LatencyReport:
+    async def get_top_labels(
+        limit: int,
+        db: AsyncSession,
+        filters: ReportFilter | None = None
+    ) -> List[TopLabel]:
+        """Get top labels by number of issues"""
+        issue_count = func.count().label('issue_count')
+        counts_query = select(
+            IssueLabel.label_id.label('label_id'),
+            issue_count
+        ).join(
+            IssueModel, IssueModel.id == IssueLabel.issue_id
+        )
+        counts_query = ReportController._apply_filters(counts_query, filters)
+        counts = counts_query.group_by(
+            IssueLabel.label_id
+        ).order_by(
+            issue_count.desc(), IssueLabel.label_id
+        ).limit(limit).subquery()
+
+        result = await db.execute(select(
+            counts.c.label_id,
+            LabelModel.name.label('label_name'),
+            counts.c.issue_count
+        ).join(
+            LabelModel, LabelModel.id == counts.c.label_id
+        ).order_by(
+            counts.c.issue_count.desc(), counts.c.label_id
+        ))
+        results = result.all()
+
+        return [
+            TopLabel(
+                label_id=r.label_id,
+                label_name=r.label_name,
+                issue_count=r.issue_count
+            )
+            for r in results
+        ]
+
+    @staticmethod
+    async def get_average_resolution_time(db: AsyncSession) -> LatencyReport:
         """Get average resolution time for resolved issues"""
-        resolved_issues = db.query(IssueModel).filter(
+        result = await db.execute(select(IssueModel).where(
             IssueModel.status == IssueStatus.RESOLVED,
             IssueModel.resolved_at.isnot(None)
-        ).all()
+        ))
+        resolved_issues = result.scalars().all()
 
         if not resolved_issues:
             return LatencyReport(
@@ -58,3 +137,240 @@ class ReportController:
             average_resolution_time_hours=round(avg_time_hours, 2),
             total_resolved_issues=len(resolved_issues)
         )
+
+    @staticmethod
+    async def get_report_cube(
+        dims: List[str],
+        db: AsyncSession,
+        filters: ReportFilter | None = None
+    ) -> CubeReport:
+        """Get issue counts and mean resolution time for every subtotal of the given dimensions"""
+        dims = list(dict.fromkeys(dims))
+        unknown = [d for d in dims if d not in CUBE_DIMENSIONS]
+        if not dims or unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"dims must be a comma-separated subset of {', '.join(CUBE_DIMENSIONS)}"
+            )
+
+        await ReportController._check_cube_size(dims, db)
+
+        # Every subset of dims, from the full group-by down to the grand total
+        grouping_sets = [
+            subset
+            for size in range(len(dims), -1, -1)
+            for subset in combinations(dims, size)
+        ]
+
+        if db.get_bind().dialect.name == "postgresql":
+            rows = await ReportController._cube_with_grouping_sets(dims, grouping_sets, db, filters)
+        else:
+            rows = await ReportController._cube_with_union(dims, grouping_sets, db, filters)
+
+        cells = []
+        for row in rows:
+            grouped_by = [d for d in dims if getattr(row, f"grouping_{d}") == 0]
+            values: Dict[str, Any] = {
+                "status": row.status if "status" in grouped_by else None,
+                "priority": row.priority if "priority" in grouped_by else None,
+                "assignee_id": row.assignee if "assignee" in grouped_by else None,
+                "label_id": row.label if "label" in grouped_by else None,
+            }
+            average = row.average_resolution_seconds
+            cells.append(CubeCell(
+                grouped_by=grouped_by,
+                issue_count=row.issue_count,
+                average_resolution_time_hours=(
+                    round(float(average) / 3600, 2) if average is not None else None
+                ),
+                **values
+            ))
+
+        cells.sort(key=lambda cell: (
+            -len(cell.grouped_by),
+            [dims.index(d) for d in cell.grouped_by],
+            [str(getattr(cell, field)) for field in ("status", "priority", "assignee_id", "label_id")]
+        ))
+        return CubeReport(dims=dims, cells=cells)
+
+    @staticmethod
+    async def _check_cube_size(dims: List[str], db: AsyncSession) -> None:
+        """Reject cubes whose worst-case number of cells exceeds the configured cap"""
+        estimate = 1
+        for d in dims:
+            if d == "status":
+                cardinality = len(IssueStatus)
+            elif d == "priority":
+                cardinality = len(IssuePriority)
+            elif d == "assignee":
+                # Unassigned issues form their own group
+                cardinality = await db.scalar(
+                    select(func.count(distinct(IssueModel.assignee_id)))
+                ) + 1
+            else:
+                cardinality = await db.scalar(select(func.count(LabelModel.id))) + 1
+            # One extra cell per dimension for its subtotal
+            estimate *= cardinality + 1
+
+        if estimate > settings.REPORT_CUBE_MAX_CELLS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Report cube would have up to {estimate} cells "
+                       f"(limit {settings.REPORT_CUBE_MAX_CELLS}); use fewer dimensions"
+            )
+
+    @staticmethod
+    def _cube_base_query(
+        dims: List[str],
+        columns: List[Any],
+        label_counts: Any,
+        filters: ReportFilter | None
+    ) -> Select:
+        """Helper method to build the joined and filtered source of a cube query"""
+        query = select(*columns).select_from(IssueModel)
+        if "label" in dims:
+            query = query.outerjoin(
+                IssueLabel, IssueLabel.issue_id == IssueModel.id
+            ).outerjoin(
+                label_counts, label_counts.c.issue_id == IssueModel.id
+            )
+        return ReportController._apply_filters(query, filters)
+
+    @staticmethod
+    def _cube_aggregates(
+        dims: List[str],
+        label_grouped: Any,
+        label_counts: Any,
+        db: AsyncSession
+    ) -> List[Any]:
+        """Helper method to build the count and mean resolution time columns of a cube query
+
+        Joining labels repeats an issue once per label. Counting distinct ids keeps
+        counts exact, and subtotals that are not grouped by label weight each joined
+        row by 1 / label_count so every issue contributes once to the mean.
+        """
+        seconds = ReportController._resolution_seconds(db)
+        issue_count = func.count(distinct(IssueModel.id)).label("issue_count")
+        if "label" not in dims:
+            return [issue_count, func.avg(seconds).label("average_resolution_seconds")]
+
+        weight = 1.0 / func.coalesce(label_counts.c.label_count, 1)
+        weighted_average = (
+            func.sum(seconds * weight)
+            / func.nullif(func.sum(case((seconds.isnot(None), weight))), 0)
+        )
+        if isinstance(label_grouped, bool):
+            average = func.avg(seconds) if label_grouped else weighted_average
+        else:
+            average = case((label_grouped, func.avg(seconds)), else_=weighted_average)
+        return [issue_count, average.label("average_resolution_seconds")]
+
+    @staticmethod
+    async def _cube_with_grouping_sets(
+        dims: List[str],
+        grouping_sets: List[tuple],
+        db: AsyncSession,
+        filters: ReportFilter | None
+    ) -> List[Any]:
+        """Compute all grouping sets in a single GROUP BY GROUPING SETS query"""
+        dimension_columns = ReportController._cube_columns()
+        label_counts = ReportController._label_counts() if "label" in dims else None
+        columns = [dimension_columns[d].label(d) for d in dims]
+        columns += [func.grouping(dimension_columns[d]).label(f"grouping_{d}") for d in dims]
+        label_grouped = (
+            func.grouping(dimension_columns["label"]) == 0 if "label" in dims else None
+        )
+        columns += ReportController._cube_aggregates(dims, label_grouped, label_counts, db)
+
+        query = ReportController._cube_base_query(dims, columns, label_counts, filters)
+        result = await db.execute(query.group_by(func.grouping_sets(*[
+            tuple_(*[dimension_columns[d] for d in grouping_set])
+            for grouping_set in grouping_sets
+        ])))
+        return result.all()
+
+    @staticmethod
+    async def _cube_with_union(
+        dims: List[str],
+        grouping_sets: List[tuple],
+        db: AsyncSession,
+        filters: ReportFilter | None
+    ) -> List[Any]:
+        """Compute all grouping sets as a UNION ALL of plain GROUP BY queries"""
+        dimension_columns = ReportController._cube_columns()
+        label_counts = ReportController._label_counts() if "label" in dims else None
+        statements = []
+        for grouping_set in grouping_sets:
+            columns = [
+                dimension_columns[d].label(d) if d in grouping_set
+                else type_coerce(null(), dimension_columns[d].type).label(d)
+                for d in dims
+            ]
+            columns += [
+                literal(0 if d in grouping_set else 1).label(f"grouping_{d}")
+                for d in dims
+            ]
+            columns += ReportController._cube_aggregates(
+                dims, "label" in grouping_set, label_counts, db
+            )
+
+            query = ReportController._cube_base_query(dims, columns, label_counts, filters)
+            statements.append(query.group_by(*[dimension_columns[d] for d in grouping_set]))
+
+        result = await db.execute(union_all(*statements))
+        return result.all()
+
+    @staticmethod
+    def _cube_columns() -> Dict[str, Any]:
+        return {
+            "status": IssueModel.status,
+            "priority": IssueModel.priority,
+            "assignee": IssueModel.assignee_id,
+            "label": IssueLabel.label_id,
+        }
+
+    @staticmethod
+    def _label_counts():
+        """Number of labels per issue, used to weight label-joined rows"""
+        return select(
+            IssueLabel.issue_id.label("issue_id"),
+            func.count().label("label_count")
+        ).group_by(IssueLabel.issue_id).subquery("label_counts")
+
+    @staticmethod
+    def _resolution_seconds(db: AsyncSession):
+        """Resolution time in seconds for resolved issues, NULL otherwise"""
+        if db.get_bind().dialect.name == "postgresql":
+            seconds = func.extract("epoch", IssueModel.resolved_at - IssueModel.created_at)
+        else:
+            seconds = (
+                func.julianday(IssueModel.resolved_at) - func.julianday(IssueModel.created_at)
+            ) * 86400.0
+        return case(
+            (
+                (IssueModel.status == IssueStatus.RESOLVED) & IssueModel.resolved_at.isnot(None),
+                seconds
+            ),
+            else_=None
+        )
+
+    @staticmethod
+    def _apply_filters(query: Select, filters: ReportFilter | None) -> Select:
+        """Helper method to restrict a report query to the matching issues"""
+        if filters is None:
+            return query
+
+        if filters.status:
+            query = query.where(IssueModel.status == filters.status)
+        if filters.priority:
+            query = query.where(IssueModel.priority == filters.priority)
+        if filters.label_id:
+            query = query.where(IssueModel.id.in_(
+                select(IssueLabel.issue_id).where(IssueLabel.label_id == filters.label_id)
+            ))
+        if filters.created_after:
+            query = query.where(IssueModel.created_at >= filters.created_after)
+        if filters.created_before:
+            query = query.where(IssueModel.created_at < filters.created_before)
+
+        return query
@@ -1,4 +1,5 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 from typing import List
 from app.models import User as UserModel
@@ -9,12 +10,13 @@ class UserController:
     """Controller for user-related business logic"""
 
     @staticmethod
-    def create_user(user: UserCreate, db: Session) -> UserModel:
+    async def create_user(user: UserCreate, db: AsyncSession) -> UserModel:
         """Create a new user"""
         # Check if username or email already exists
-        existing = db.query(UserModel).filter(
+        result = await db.execute(select(UserModel).where(
             (UserModel.username == user.username) | (UserModel.email == user.email)
-        ).first()
+        ))
+        existing = result.scalars().first()
 
         if existing:
             raise HTTPException(
@@ -24,24 +26,26 @@ class UserController:
 
         db_user = UserModel(**user.model_dump())
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
+        await db.refresh(db_user)
         return db_user
 
     @staticmethod
-    def get_users(skip: int, limit: int, db: Session) -> List[UserModel]:
+    async def get_users(skip: int, limit: int, db: AsyncSession) -> List[UserModel]:
         """Get list of users with pagination"""
-        return db.query(UserModel).offset(skip).limit(limit).all()
+        result = await db.execute(select(UserModel).offset(skip).limit(limit))
+        return result.scalars().all()
 
     @staticmethod
-    def get_user_by_id(user_id: int, db: Session) -> UserModel:
+    async def get_user_by_id(user_id: int, db: AsyncSession) -> UserModel:
         """Get a specific user by ID"""
-        user = db.query(UserModel).filter(UserModel.id == user_id).first()
+        result = await db.execute(select(UserModel).where(UserModel.id == user_id))
+        user = result.scalars().first()
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         return user
 
     @staticmethod
-    def validate_user_exists(user_id: int, db: Session) -> UserModel:
+    async def validate_user_exists(user_id: int, db: AsyncSession) -> UserModel:
         """Validate that a user exists and return it"""
-        return UserController.get_user_by_id(user_id, db)
+        return await UserController.get_user_by_id(user_id, db)
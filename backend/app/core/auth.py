@@ -1,29 +1,39 @@
+import hashlib
+import logging
+import time
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-import bcrypt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
 from app.core.database import get_db
 from app.core.config import settings
+from app.core.password_hashing import check_password, hash_password
+from app.core.revocation import revocation_list
+from app.core.statements import USER_BY_ID
 from app.models.user import User as UserModel
 from app.schemas.auth import TokenData
 
+logger = logging.getLogger(__name__)
+
 # HTTP Bearer token
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against a hash"""
-    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+    """Verify a password against a hash (blocking; request handlers use password_hasher)"""
+    return check_password(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password"""
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-    return hashed.decode('utf-8')
+    """Hash a password (blocking; request handlers use password_hasher)"""
+    return hash_password(password, settings.BCRYPT_ROUNDS)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -34,23 +44,41 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
-    to_encode.update({"exp": expire})
+    # jti identifies the token for revocation on logout
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
+# Verified tokens, keyed by SHA-256 digest, so repeat requests skip the signature check.
+# Entries never outlive the token's exp; failures are never cached.
+token_cache = TTLCache(settings.TOKEN_CACHE_SIZE, settings.TOKEN_CACHE_TTL_SECONDS)
+
+
 def decode_access_token(token: str) -> TokenData:
-    """Decode and verify a JWT token"""
+    """Decode and verify a JWT token, reusing the result for a token seen before"""
+    key = hashlib.sha256(token.encode("utf-8")).digest() if token_cache.enabled else None
+    if key is not None:
+        token_data = token_cache.get(key)
+        if token_data is not None:
+            return token_data
+
+    token_data, expires_at = _verify_access_token(token)
+    if key is not None:
+        ttl_seconds = None if expires_at is None else expires_at - time.time()
+        token_cache.set(key, token_data, ttl_seconds=ttl_seconds)
+    return token_data
+
+
+def _verify_access_token(token: str):
+    """Check the signature and claims; returns the token data and its exp timestamp"""
     try:
-        print(f"DEBUG: Attempting to decode token...")
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        print(f"DEBUG: Token payload: {payload}")
         user_id_str: str = payload.get("sub")
         username: str = payload.get("username")
-        print(f"DEBUG: Extracted user_id_str={user_id_str}, username={username}")
 
         if user_id_str is None:
-            print("DEBUG: user_id_str is None, raising 401")
+            logger.debug("Token has no subject")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Could not validate credentials",
@@ -59,18 +87,21 @@ def decode_access_token(token: str) -> TokenData:
 
         # Convert string user_id back to integer
         user_id = int(user_id_str)
-        print(f"DEBUG: Converted user_id to int: {user_id}")
 
-        return TokenData(user_id=user_id, username=username)
+        expires_at = payload.get("exp")
+        token_data = TokenData(
+            user_id=user_id, username=username, jti=payload.get("jti"), exp=expires_at
+        )
+        return token_data, expires_at
     except JWTError as e:
-        print(f"DEBUG: JWTError occurred: {str(e)}")
+        logger.debug("Token rejected: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
     except ValueError as e:
-        print(f"DEBUG: ValueError converting user_id: {str(e)}")
+        logger.debug("Token subject is not a user id: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -78,43 +109,106 @@ def decode_access_token(token: str) -> TokenData:
         )
 
 
-def get_current_user(
+# Column values of recently authenticated users, keyed by id. Each worker has its own
+# cache, so a change made through another worker is seen within USER_CACHE_TTL_SECONDS.
+# Only what authorization and /auth/me read is kept: no password hash or reset code
+# sits in a long-lived cache, and users served from it have those attributes unset.
+user_cache = TTLCache(settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL_SECONDS)
+USER_CACHE_COLUMNS = ("id", "username", "email", "full_name", "is_active")
+
+
+def invalidate_user(user_id: int) -> None:
+    """Drop a user from the authentication cache"""
+    user_cache.pop(user_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session: Session, flush_context) -> None:
+    changed = {
+        obj.id for obj in list(session.dirty) + list(session.deleted)
+        if isinstance(obj, UserModel) and obj.id is not None
+    }
+    if changed:
+        session.info.setdefault("changed_user_ids", set()).update(changed)
+        for user_id in changed:
+            invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session) -> None:
+    # Again after commit: a request may have cached the old row in between
+    for user_id in session.info.pop("changed_user_ids", ()):
+        invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session: Session) -> None:
+    session.info.pop("changed_user_ids", None)
+
+
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> UserModel:
     """Get the current authenticated user"""
-    try:
-        token = credentials.credentials
-        print(f"DEBUG: Received token: {token[:20]}...")  # Print first 20 chars
-        token_data = decode_access_token(token)
-        print(f"DEBUG: Token decoded successfully, user_id: {token_data.user_id}")
+    token_data = decode_access_token(credentials.credentials)
+    if await revocation_list.is_revoked(db, token_data.jti):
+        logger.debug("Authentication failed: token of user %s was revoked", token_data.user_id)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
-        user = db.query(UserModel).filter(UserModel.id == token_data.user_id).first()
+    columns = user_cache.get(token_data.user_id)
+    if columns is not None:
+        # A fresh transient instance per request, so no request can alter another's user
+        return UserModel(**columns)
 
-        if user is None:
-            print(f"DEBUG: User not found for user_id: {token_data.user_id}")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+    generation = user_cache.generation
+    result = await db.execute(USER_BY_ID, {"user_id": token_data.user_id})
+    user = result.scalars().first()
 
-        if not user.is_active:
-            print(f"DEBUG: User {user.id} is inactive")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Inactive user"
-            )
+    if user is None:
+        logger.debug("Authentication failed: user %s not found", token_data.user_id)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    if not user.is_active:
+        logger.debug("Authentication failed: user %s is inactive", user.id)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Inactive user"
+        )
 
-        print(f"DEBUG: Authentication successful for user: {user.username}")
-        return user
-    except Exception as e:
-        print(f"DEBUG: Authentication failed with error: {str(e)}")
-        raise
+    user_cache.set(
+        user.id, {key: getattr(user, key) for key in USER_CACHE_COLUMNS}, generation=generation
+    )
+    logger.debug("Authenticated user %s", user.id)
+    return user
 
 
-def get_current_active_user(
+async def get_current_active_user(
     current_user: UserModel = Depends(get_current_user)
 ) -> UserModel:
     """Get the current active user (alias for consistency)"""
     return current_user
+
+
+def is_admin(user: UserModel) -> bool:
+    return user.email in settings.ADMIN_EMAILS
+
+
+async def get_current_admin_user(
+    current_user: UserModel = Depends(get_current_user)
+) -> UserModel:
+    """Get the current user, requiring admin privileges"""
+    if not is_admin(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required"
+        )
+    return current_user
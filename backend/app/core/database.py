@@ -1,17 +1,250 @@
+import contextlib
+import time
+import threading
+from typing import Any, AsyncContextManager, Callable, Dict, Optional
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from .config import settings
+from .metrics import Histogram
 
-engine = create_engine(settings.DATABASE_URL)
+
+class PoolInstrumentation:
+    """Pool mixin that records how long callers wait to check out a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_wait_ms = Histogram()
+        self._waiters = 0
+        self._waiters_lock = threading.Lock()
+
+    def _do_get(self):
+        # Only a caller finding every connection, overflow included, in use has to wait
+        waiting = self._exhausted()
+        if waiting:
+            with self._waiters_lock:
+                self._waiters += 1
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.checkout_wait_ms.observe((time.perf_counter() - start) * 1000)
+            if waiting:
+                with self._waiters_lock:
+                    self._waiters -= 1
+
+    def _exhausted(self) -> bool:
+        max_overflow = getattr(self, "_max_overflow", -1)
+        # A negative max_overflow means no limit, so nobody ever waits
+        return max_overflow >= 0 and self.checkedout() >= self.size() + max_overflow
+
+    def waiters(self) -> int:
+        """Number of callers currently blocked on checkout because the pool is exhausted"""
+        return self._waiters
+
+
+class InstrumentedQueuePool(PoolInstrumentation, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(PoolInstrumentation, AsyncAdaptedQueuePool):
+    pass
+
+
+def to_async_url(url: str) -> str:
+    """Swap a database URL's driver for its asyncio counterpart"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "postgresql":
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+    elif backend == "sqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False)
+
+
+def _engine_options(url: str, is_async: bool) -> Dict[str, Any]:
+    """Pool and timeout settings from Settings, shared by sync and async engines"""
+    options: Dict[str, Any] = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if not url.startswith("sqlite"):
+        options.update(
+            poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    if settings.DB_STATEMENT_TIMEOUT_MS and url.startswith("postgresql"):
+        timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+
+def build_engine(url: str) -> Engine:
+    """Create a sync engine, used by scripts and schema setup"""
+    return create_engine(url, **_engine_options(url, is_async=False))
+
+
+def build_async_engine(url: str) -> AsyncEngine:
+    """Create an asyncio engine, used by request handlers"""
+    return create_async_engine(to_async_url(url), **_engine_options(url, is_async=True))
+
+
+engine = build_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Request handlers use AsyncSession; objects stay usable after commit since
+# lazy loading is not available once the handler has returned
+async_engine = build_async_engine(settings.DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Optional read replica; reads fall back to the primary when it is not configured
+async_read_engine = (
+    build_async_engine(settings.DATABASE_READ_URL) if settings.DATABASE_READ_URL else None
+)
+AsyncReadSessionLocal = (
+    async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+    if async_read_engine is not None else None
+)
+
 Base = declarative_base()
 
+# Cookie carrying the read-your-writes deadline, so stickiness survives across workers
+PRIMARY_UNTIL_COOKIE = "primary_until"
+
+
+class ReadReplicaRouter:
+    """Chooses between the primary and the read replica for read-only requests"""
+
+    MAX_TRACKED_CLIENTS = 10000
 
-def get_db():
-    db = SessionLocal()
+    def __init__(
+        self,
+        primary_factory: Callable[[], AsyncSession],
+        replica_factory: Optional[Callable[[], AsyncSession]],
+        sticky_seconds: int,
+        retry_seconds: int
+    ):
+        self.primary_factory = primary_factory
+        self.replica_factory = replica_factory
+        self.sticky_seconds = sticky_seconds
+        self.retry_seconds = retry_seconds
+        self._recent_writes: Dict[str, float] = {}
+        self._replica_down_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.replica_factory is not None
+
+    def record_write(self, client_key: str) -> float:
+        """Pin a client's reads to the primary and return the deadline"""
+        now = time.monotonic()
+        until = now + self.sticky_seconds
+        with self._lock:
+            if len(self._recent_writes) >= self.MAX_TRACKED_CLIENTS:
+                self._recent_writes = {
+                    key: deadline for key, deadline in self._recent_writes.items()
+                    if deadline > now
+                }
+            self._recent_writes[client_key] = until
+        return time.time() + self.sticky_seconds
+
+    def is_sticky(self, client_key: str) -> bool:
+        """Check whether a client wrote recently enough to need the primary"""
+        deadline = self._recent_writes.get(client_key)
+        return deadline is not None and deadline > time.monotonic()
+
+    def mark_replica_down(self) -> None:
+        """Route all reads to the primary until the retry window passes"""
+        self._replica_down_until = time.monotonic() + self.retry_seconds
+
+    def replica_available(self) -> bool:
+        return self.enabled and self._replica_down_until <= time.monotonic()
+
+    async def session_for(
+        self,
+        client_key: str,
+        primary_until: float | None = None
+    ) -> AsyncSession:
+        """Open a session on the replica unless the client must read from the primary"""
+        if primary_until is not None and primary_until > time.time():
+            return self.primary_factory()
+        if self.is_sticky(client_key) or not self.replica_available():
+            return self.primary_factory()
+
+        db = self.replica_factory()
+        try:
+            # Check out a connection eagerly so an unreachable replica is detected here
+            await db.connection()
+        except (DBAPIError, OSError, PoolTimeoutError):
+            # asyncpg raises plain OSErrors (connection refused, timeouts), a full pool TimeoutError
+            await db.close()
+            self.mark_replica_down()
+            return self.primary_factory()
+        return db
+
+
+replica_router = ReadReplicaRouter(
+    primary_factory=AsyncSessionLocal,
+    replica_factory=AsyncReadSessionLocal,
+    sticky_seconds=settings.READ_AFTER_WRITE_SECONDS,
+    retry_seconds=settings.READ_REPLICA_RETRY_SECONDS,
+)
+
+
+def get_client_key(request: Request) -> str:
+    """Identify a client for read-your-writes stickiness"""
+    authorization = request.headers.get("authorization")
+    if authorization:
+        return f"auth:{hash(authorization)}"
+    host = request.client.host if request.client else "unknown"
+    return f"host:{host}"
+
+
+async def get_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _primary_until(request: Request) -> float | None:
+    try:
+        return float(request.cookies.get(PRIMARY_UNTIL_COOKIE, ""))
+    except ValueError:
+        return None
+
+
+async def get_read_db(request: Request):
+    """Session for read-only endpoints, served by the replica when possible"""
+    db = await replica_router.session_for(get_client_key(request), _primary_until(request))
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
+
+
+def get_read_session_factory(request: Request) -> Callable[[], AsyncContextManager[AsyncSession]]:
+    """Opens read sessions for work that outlives the endpoint, such as a streamed body
+
+    Dependency sessions are closed once the endpoint returns, before a
+    StreamingResponse starts iterating, so streams open their own session.
+    """
+    client_key = get_client_key(request)
+    primary_until = _primary_until(request)
+
+    @contextlib.asynccontextmanager
+    async def read_session():
+        db = await replica_router.session_for(client_key, primary_until)
+        try:
+            yield db
+        finally:
+            await db.close()
+
+    return read_session
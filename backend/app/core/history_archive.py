@@ -0,0 +1,291 @@
+"""Monthly partitioning and archival of issue_history
+
+On PostgreSQL, issue_history is range-partitioned by month on changed_at
+(see migration 0003). Old months are detached, exported to gzipped JSON Lines
+files and dropped. On other databases the same retention policy is applied by
+exporting and deleting rows, so archives look the same everywhere.
+
+Each archive file has a small JSON manifest next to it listing the issues it
+holds, so reading one issue's archived history only opens the files that
+contain it.
+"""
+import functools
+import gzip
+import json
+import os
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, FrozenSet, List, Optional, Set
+
+from sqlalchemy import column, delete, func, select, table, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.models import IssueHistory
+
+PARTITION_NAME = re.compile(r"^issue_history_p(\d{4})_(\d{2})$")
+ARCHIVE_NAME = re.compile(r"^issue_history_(\d{4})_(\d{2})\.jsonl\.gz$")
+HISTORY_COLUMNS = [
+    "id", "issue_id", "changed_by_id", "field_name", "old_value", "new_value", "changed_at"
+]
+
+
+def month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    month_index = value.year * 12 + value.month - 1 + months
+    return value.replace(year=month_index // 12, month=month_index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"issue_history_p{month.year:04d}_{month.month:02d}"
+
+
+def archive_path(archive_dir: str, month: datetime) -> str:
+    return os.path.join(archive_dir, f"issue_history_{month.year:04d}_{month.month:02d}.jsonl.gz")
+
+
+def manifest_path(path: str) -> str:
+    """Manifest of the issue ids in an archive file"""
+    return path[:-len(".jsonl.gz")] + ".issues.json"
+
+
+def is_partitioned(connection: Connection) -> bool:
+    """Whether issue_history is a partitioned table (PostgreSQL only)"""
+    if connection.dialect.name != "postgresql":
+        return False
+    return connection.execute(text(
+        "SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = 'issue_history'"
+    )).first() is not None
+
+
+def list_partitions(connection: Connection) -> List[datetime]:
+    """Months that currently have their own partition, oldest first"""
+    names = connection.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = 'issue_history'"
+    )).scalars()
+    months = []
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        if match:
+            months.append(datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc))
+    return sorted(months)
+
+
+def default_partition(connection: Connection) -> Optional[str]:
+    """Name of issue_history's default partition, if it has one"""
+    return connection.execute(text(
+        "SELECT d.relname FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid "
+        "JOIN pg_class d ON d.oid = pt.partdefid "
+        "WHERE c.relname = 'issue_history'"
+    )).scalar()
+
+
+def create_partition(connection: Connection, month: datetime) -> None:
+    """Create the partition holding one month of history, if missing"""
+    name = partition_name(month)
+    if connection.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None:
+        return
+    upper = add_months(month, 1)
+    connection.execute(text(
+        f"CREATE TABLE {name} (LIKE issue_history INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    ))
+    default = default_partition(connection)
+    if default is not None:
+        # Attaching fails while the default partition holds rows of the new
+        # range (written before the month had a partition), so move them over
+        columns = ", ".join(HISTORY_COLUMNS)
+        connection.execute(text(
+            f"WITH moved AS ("
+            f"DELETE FROM {default} WHERE changed_at >= :lower AND changed_at < :upper "
+            f"RETURNING {columns}) "
+            f"INSERT INTO {name} ({columns}) SELECT {columns} FROM moved"
+        ), {"lower": month, "upper": upper})
+    connection.execute(text(
+        f"ALTER TABLE issue_history ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{month:%Y-%m-%d} 00:00:00+00') TO ('{upper:%Y-%m-%d} 00:00:00+00')"
+    ))
+
+
+def ensure_partitions(engine: Engine, months_ahead: int, now: datetime | None = None) -> List[datetime]:
+    """Make sure partitions exist from the current month through months_ahead"""
+    current = month_start(now or datetime.now(timezone.utc))
+    months = [add_months(current, offset) for offset in range(months_ahead + 1)]
+    with engine.begin() as connection:
+        if not is_partitioned(connection):
+            return []
+        for month in months:
+            create_partition(connection, month)
+    return months
+
+
+def _serialize(row: Dict[str, Any]) -> str:
+    values = dict(row)
+    if values["changed_at"] is not None:
+        values["changed_at"] = values["changed_at"].isoformat()
+    return json.dumps(values)
+
+
+def _export(connection: Connection, source, condition, path: str, issue_ids: Set[int]) -> int:
+    """Append matching rows to a gzipped JSON Lines file; returns the row count
+
+    The ids of the issues exported are added to issue_ids.
+    """
+    columns = [source.c[name] for name in HISTORY_COLUMNS]
+    query = select(*columns)
+    if condition is not None:
+        query = query.where(condition)
+
+    count = 0
+    archive = None
+    result = connection.execution_options(stream_results=True).execute(query.order_by(source.c.id))
+    try:
+        for row in result.mappings():
+            if archive is None:
+                # Appending adds a new gzip member, so a retried run never truncates earlier exports
+                archive = gzip.open(path, "at", encoding="utf-8")
+            archive.write(_serialize(row) + "\n")
+            issue_ids.add(row["issue_id"])
+            count += 1
+    finally:
+        if archive is not None:
+            archive.close()
+    return count
+
+
+def _write_manifest(path: str, issue_ids: Set[int]) -> None:
+    manifest = manifest_path(path)
+    # A retried run appends to the archive, so keep the issues exported before
+    existing = _read_manifest(manifest)
+    if existing is not None:
+        issue_ids = issue_ids | existing
+    partial = manifest + ".tmp"
+    with open(partial, "w", encoding="utf-8") as f:
+        json.dump(sorted(issue_ids), f)
+    os.replace(partial, manifest)
+
+
+def _read_manifest(manifest: str) -> Optional[FrozenSet[int]]:
+    try:
+        mtime = os.stat(manifest).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _load_manifest(manifest, mtime)
+
+
+@functools.lru_cache(maxsize=1024)
+def _load_manifest(manifest: str, mtime: int) -> FrozenSet[int]:
+    # Keyed on the modification time, so a rewritten manifest is read again
+    with open(manifest, encoding="utf-8") as f:
+        return frozenset(json.load(f))
+
+
+def archive_month(connection: Connection, month: datetime, archive_dir: str) -> int:
+    """Export one month of history to archive_dir and remove it from the database"""
+    os.makedirs(archive_dir, exist_ok=True)
+    path = archive_path(archive_dir, month)
+    upper = add_months(month, 1)
+    issue_ids: Set[int] = set()
+
+    if is_partitioned(connection) and month in list_partitions(connection):
+        name = partition_name(month)
+        connection.execute(text(f"ALTER TABLE issue_history DETACH PARTITION {name}"))
+        detached = table(name, *[column(c) for c in HISTORY_COLUMNS])
+        count = _export(connection, detached, None, path, issue_ids)
+        if issue_ids:
+            _write_manifest(path, issue_ids)
+        connection.execute(text(f"DROP TABLE {name}"))
+        return count
+
+    history = IssueHistory.__table__
+    if connection.dialect.name != "postgresql":
+        # Naive datetimes for databases without time zone support
+        month, upper = month.replace(tzinfo=None), upper.replace(tzinfo=None)
+    condition = (history.c.changed_at >= month) & (history.c.changed_at < upper)
+    count = _export(connection, history, condition, path, issue_ids)
+    if issue_ids:
+        _write_manifest(path, issue_ids)
+    connection.execute(delete(history).where(condition))
+    return count
+
+
+def archive_history(
+    engine: Engine,
+    retain_months: int,
+    archive_dir: str,
+    now: datetime | None = None
+) -> Dict[str, int]:
+    """Archive every month older than the retention window; returns rows per month"""
+    cutoff = add_months(month_start(now or datetime.now(timezone.utc)), -retain_months)
+    archived: Dict[str, int] = {}
+
+    with engine.connect() as connection:
+        # Old partitions, even empty ones, plus every month that still has rows
+        # (on PostgreSQL those may sit in the default partition)
+        months = set()
+        if is_partitioned(connection):
+            months.update(month for month in list_partitions(connection) if month < cutoff)
+
+        oldest = connection.execute(select(func.min(IssueHistory.changed_at))).scalar()
+        if oldest is not None:
+            if oldest.tzinfo is None:
+                oldest = oldest.replace(tzinfo=timezone.utc)
+            month = month_start(oldest.astimezone(timezone.utc))
+            while month < cutoff:
+                months.add(month)
+                month = add_months(month, 1)
+
+    for month in sorted(months):
+        # One transaction per month, so a failure leaves earlier months archived
+        with engine.begin() as connection:
+            archived[f"{month:%Y-%m}"] = archive_month(connection, month, archive_dir)
+    return archived
+
+
+def read_archived_history(
+    issue_id: int,
+    archive_dir: str,
+    since: datetime | None = None
+) -> List[Dict[str, Any]]:
+    """Load the archived history rows of one issue
+
+    Only archives whose manifest lists the issue are decompressed (archives
+    written without a manifest are scanned). Passing the issue's creation
+    time as since also skips the months before it.
+    """
+    if not os.path.isdir(archive_dir):
+        return []
+    first_month = None
+    if since is not None:
+        # SQLite hands back naive datetimes, which are UTC
+        first_month = month_start(since.replace(tzinfo=since.tzinfo or timezone.utc).astimezone(timezone.utc))
+
+    rows: Dict[int, Dict[str, Any]] = {}
+    for name in sorted(os.listdir(archive_dir)):
+        match = ARCHIVE_NAME.match(name)
+        if not match:
+            continue
+        month = datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc)
+        if first_month is not None and month < first_month:
+            continue
+        path = os.path.join(archive_dir, name)
+        issue_ids = _read_manifest(manifest_path(path))
+        if issue_ids is not None and issue_id not in issue_ids:
+            continue
+        with gzip.open(path, "rt", encoding="utf-8") as archive:
+            for line in archive:
+                row = json.loads(line)
+                if row["issue_id"] != issue_id:
+                    continue
+                if row["changed_at"] is not None:
+                    row["changed_at"] = datetime.fromisoformat(row["changed_at"])
+                # Keyed by id so rows exported twice by a retried run appear once
+                rows[row["id"]] = row
+    return list(rows.values())
@@ -0,0 +1,73 @@
+"""Recomputation of the denormalized counters on issues
+
+comment_count and label_names are maintained incrementally by the comment
+and label controllers; this module rebuilds them from the source tables,
+e.g. after manual data fixes or an interrupted import.
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.engine import Engine
+
+from app.models import Comment, Issue, IssueLabel, Label
+
+
+def label_summary(names: Iterable[str]) -> List[str]:
+    """Compact label summary stored on the issue row"""
+    return sorted(names)
+
+
+def repair_issue_counters(engine: Engine, batch_size: int = 1000) -> int:
+    """Recompute counters for every issue; returns how many rows were wrong"""
+    issues = Issue.__table__
+    repair = update(issues).where(issues.c.id == bindparam("issue_id")).values(
+        comment_count=bindparam("new_comment_count"),
+        label_names=bindparam("new_label_names", type_=issues.c.label_names.type),
+        # Repairs are not user edits
+        updated_at=issues.c.updated_at
+    )
+
+    repaired = 0
+    last_id = 0
+    while True:
+        # One transaction per batch keeps locks short on large tables
+        with engine.begin() as connection:
+            rows = connection.execute(
+                select(issues.c.id, issues.c.comment_count, issues.c.label_names)
+                .where(issues.c.id > last_id)
+                .order_by(issues.c.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            first_id, last_id = rows[0].id, rows[-1].id
+
+            comment_counts: Dict[int, int] = dict(connection.execute(
+                select(Comment.issue_id, func.count(Comment.id))
+                .where(Comment.issue_id.between(first_id, last_id))
+                .group_by(Comment.issue_id)
+            ).all())
+
+            label_names: Dict[int, List[str]] = defaultdict(list)
+            for issue_id, name in connection.execute(
+                select(IssueLabel.issue_id, Label.name)
+                .join(Label, Label.id == IssueLabel.label_id)
+                .where(IssueLabel.issue_id.between(first_id, last_id))
+            ):
+                label_names[issue_id].append(name)
+
+            changes = []
+            for row in rows:
+                expected_count = comment_counts.get(row.id, 0)
+                expected_names = label_summary(label_names.get(row.id, []))
+                if row.comment_count != expected_count or row.label_names != expected_names:
+                    changes.append({
+                        "issue_id": row.id,
+                        "new_comment_count": expected_count,
+                        "new_label_names": expected_names,
+                    })
+            if changes:
+                connection.execute(repair, changes)
+                repaired += len(changes)
+    return repaired
@@ -0,0 +1,39 @@
+import bisect
+import threading
+from typing import Dict, List, Sequence
+
+# Bucket upper bounds in milliseconds
+DEFAULT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """Thread-safe cumulative histogram with fixed bucket bounds"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self.buckets = tuple(sorted(buckets))
+        # One extra slot for observations above the largest bound
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> Dict:
+        """Return cumulative bucket counts, as Prometheus does"""
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+
+        cumulative: List[Dict] = []
+        running = 0
+        for bound, bucket_count in zip(list(self.buckets) + [None], counts):
+            running += bucket_count
+            cumulative.append({"le": bound, "count": running})
+
+        return {"buckets": cumulative, "count": count, "sum": total}
@@ -0,0 +1,29 @@
+"""bcrypt functions run by the password hashing worker processes
+
+Worker processes import this module to unpickle the functions they are sent,
+so it must stay free of framework and settings imports: each one would
+slow down every worker start.
+"""
+from typing import Optional
+
+import bcrypt
+
+
+def hash_password(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=rounds)).decode("utf-8")
+
+
+def check_password(password: str, hashed_password: str) -> bool:
+    return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
+
+
+def hash_rounds(hashed_password: str) -> Optional[int]:
+    """Cost factor of a bcrypt hash ("$2b$12$..." -> 12)"""
+    try:
+        return int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def needs_rehash(hashed_password: str, rounds: int) -> bool:
+    return hash_rounds(hashed_password) != rounds
@@ -0,0 +1,90 @@
+"""bcrypt hashing off the event loop and off the request threadpool
+
+Hashing and verification run in a dedicated process pool of
+PASSWORD_HASH_WORKERS processes, so a login burst can neither block the
+event loop nor occupy the threads that serve other requests. At most
+PASSWORD_HASH_MAX_PENDING operations may be running or queued; beyond that
+callers get a 503 straight away instead of waiting behind the queue.
+
+The functions the pool processes execute live in app.core.password_hashing,
+which workers can import without loading the web framework.
+"""
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, Optional
+
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.password_hashing import check_password, hash_password, needs_rehash
+
+
+class PasswordHasher:
+    """Runs bcrypt in a size-limited process pool with a bounded queue"""
+
+    def __init__(self, workers: int, max_pending: int, rounds: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                # spawn rather than fork: the server process has threads and open connections
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    async def _run(self, func: Callable, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many authentication requests, please retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+        try:
+            if self.workers <= 0:
+                # No pool configured (tests, tiny deployments): use the threadpool as before
+                return await run_in_threadpool(func, *args)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password, self.rounds)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(check_password, password, hashed_password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Whether a stored hash was made with a different cost than configured"""
+        return needs_rehash(hashed_password, self.rounds)
+
+    async def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            # Joining the worker processes blocks, so not on the event loop
+            await run_in_threadpool(executor.shutdown, wait=True, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    rounds=settings.BCRYPT_ROUNDS,
+)
@@ -0,0 +1,249 @@
+"""On-demand profiles of single requests
+
+With PROFILING_ENABLED, an admin can send any request with an X-Profile
+header to have that one request profiled with cProfile. Without the setting
+no middleware is installed, so there is no cost at all; with it, other
+requests pay one header lookup.
+
+cProfile instruments the whole thread, and the event loop interleaves
+requests, so the profiler is switched on only while a step of the profiled
+request's own tasks runs and off at every await. The request's app call runs
+in a task of its own, and a task factory, installed only while a profile is
+running, gives the same treatment to the tasks created under it (middleware
+and task groups spawn some). Concurrent requests are therefore neither
+recorded nor slowed. Work done in the threadpool is not recorded.
+
+The last PROFILING_STORE_SIZE profiles are kept per worker and listed by
+GET /admin/profiles; each can be read as a pstats report or downloaded as a
+.pstats file for snakeviz and similar tools. They are also written to
+PROFILING_DIR when it is set, since with several workers a later request may
+not reach the worker that has the profile. The response carries the
+profile's id in X-Profile-Id.
+"""
+import asyncio
+import cProfile
+import collections
+import contextlib
+import io
+import logging
+import marshal
+import os
+import pstats
+import threading
+import time
+import uuid
+from collections.abc import Coroutine
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from fastapi.security import HTTPAuthorizationCredentials
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.auth import get_current_user, is_admin
+from app.core.config import settings
+from app.core.database import get_db
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+# Set to the request's profiler while a profiled request runs
+_profiled_by: ContextVar[Optional[cProfile.Profile]] = ContextVar("profiled_by", default=None)
+
+
+class _ProfiledCoroutine(Coroutine):
+    """Wraps a task's coroutine so the profiler runs during its steps only"""
+
+    def __init__(self, coro, profiler: cProfile.Profile):
+        self._coro = coro
+        self._profiler = profiler
+
+    def send(self, value):
+        self._profiler.enable()
+        try:
+            return self._coro.send(value)
+        finally:
+            self._profiler.disable()
+
+    def throw(self, *args):
+        self._profiler.enable()
+        try:
+            return self._coro.throw(*args)
+        finally:
+            self._profiler.disable()
+
+    def close(self):
+        return self._coro.close()
+
+    def __await__(self):
+        return self._coro.__await__()
+
+    def __getattr__(self, name):
+        # cr_frame, cr_running, __qualname__...: asyncio and anyio inspect them
+        return getattr(self._coro, name)
+
+
+class _ProfilingTaskFactory:
+    """Task factory wrapping the coroutines of tasks created by a profiled request"""
+
+    def __init__(self, previous: Optional[Callable]):
+        self.previous = previous
+        self.profiles = 0
+
+    def __call__(self, loop: asyncio.AbstractEventLoop, coro, **kwargs) -> asyncio.Task:
+        context = kwargs.get("context")
+        profiler = context.get(_profiled_by) if context is not None else _profiled_by.get()
+        if profiler is not None:
+            coro = _ProfiledCoroutine(coro, profiler)
+        if self.previous is not None:
+            return self.previous(loop, coro, **kwargs)
+        return asyncio.Task(coro, loop=loop, **kwargs)
+
+
+def _track_tasks(loop: asyncio.AbstractEventLoop) -> None:
+    factory = loop.get_task_factory()
+    if not isinstance(factory, _ProfilingTaskFactory):
+        factory = _ProfilingTaskFactory(factory)
+        loop.set_task_factory(factory)
+    factory.profiles += 1
+
+
+def _untrack_tasks(loop: asyncio.AbstractEventLoop) -> None:
+    factory = loop.get_task_factory()
+    if isinstance(factory, _ProfilingTaskFactory):
+        factory.profiles -= 1
+        if factory.profiles == 0:
+            # Back to plain task creation once no profile is running
+            loop.set_task_factory(factory.previous)
+
+
+def stats_report(profiler: cProfile.Profile, sort: str = "cumulative", limit: int = 60) -> str:
+    """pstats text report of the most expensive functions"""
+    output = io.StringIO()
+    pstats.Stats(profiler, stream=output).sort_stats(sort).print_stats(limit)
+    return output.getvalue()
+
+
+def stats_file(profiler: cProfile.Profile) -> bytes:
+    """The profile in the .pstats format written by Stats.dump_stats"""
+    return marshal.dumps(pstats.Stats(profiler).stats)
+
+
+class ProfileStore:
+    """The last profiles taken by this worker"""
+
+    def __init__(self, size: int, directory: Optional[str] = None):
+        self.directory = directory
+        self._profiles: Deque[Dict] = collections.deque(maxlen=max(size, 1))
+        self._lock = threading.Lock()
+
+    def add(self, profile: Dict) -> None:
+        with self._lock:
+            self._profiles.append(profile)
+        if self.directory:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                with open(os.path.join(self.directory, f"{profile['id']}.pstats"), "wb") as f:
+                    f.write(stats_file(profile["profiler"]))
+            except OSError as e:
+                logger.warning("Could not write profile %s: %s", profile["id"], e)
+
+    def get(self, profile_id: str) -> Optional[Dict]:
+        with self._lock:
+            return next((profile for profile in self._profiles if profile["id"] == profile_id), None)
+
+    def list(self) -> List[Dict]:
+        """Profiles, newest first"""
+        with self._lock:
+            return list(reversed(self._profiles))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+
+
+async def authorize_admin(scope: Scope) -> Optional[int]:
+    """Id of the admin whose bearer token the request carries, else None"""
+    scheme, _, token = Headers(scope=scope).get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    # The same session provider the endpoints get, so dependency overrides apply
+    provider = scope["app"].dependency_overrides.get(get_db, get_db)
+    try:
+        async with contextlib.asynccontextmanager(provider)() as db:
+            user = await get_current_user(HTTPAuthorizationCredentials(scheme=scheme, credentials=token), db)
+    except HTTPException:
+        return None
+    return user.id if is_admin(user) else None
+
+
+class ProfilingMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: ProfileStore,
+        authorize: Callable[[Scope], Awaitable[Optional[int]]] = authorize_admin
+    ) -> None:
+        self.app = app
+        self.store = store
+        self.authorize = authorize
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not Headers(scope=scope).get(PROFILE_HEADER):
+            await self.app(scope, receive, send)
+            return
+
+        user_id = await self.authorize(scope)
+        if user_id is None:
+            response = JSONResponse({"detail": "Profiling requires admin privileges"}, status_code=403)
+            await response(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex[:16]
+        status_code = 500
+
+        async def send_with_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)[PROFILE_ID_HEADER] = profile_id
+            await send(message)
+
+        profiler = cProfile.Profile()
+        loop = asyncio.get_running_loop()
+        _track_tasks(loop)
+        token = _profiled_by.set(profiler)
+        started = time.perf_counter()
+        try:
+            # A task of its own, created (and wrapped) by the factory
+            await loop.create_task(self.app(scope, receive, send_with_id))
+        finally:
+            _profiled_by.reset(token)
+            _untrack_tasks(loop)
+            duration_ms = (time.perf_counter() - started) * 1000
+            stats = pstats.Stats(profiler)
+            self.store.add({
+                "id": profile_id,
+                "created_at": datetime.now(timezone.utc),
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": getattr(scope.get("route"), "path", None),
+                "status_code": status_code,
+                "user_id": user_id,
+                "duration_ms": round(duration_ms, 3),
+                "profiled_ms": round(stats.total_tt * 1000, 3),
+                "function_calls": stats.total_calls,
+                "profiler": profiler,
+            })
+            logger.info(
+                "Profiled %s %s as %s: %.1f ms, %.1f ms on the event loop",
+                scope["method"], scope["path"], profile_id, duration_ms, stats.total_tt * 1000
+            )
+
+
+profile_store = ProfileStore(settings.PROFILING_STORE_SIZE, settings.PROFILING_DIR)
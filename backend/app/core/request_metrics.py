@@ -0,0 +1,294 @@
+"""Per-route request metrics in Prometheus text format, plus Server-Timing
+
+RequestMetricsMiddleware records, per method, route template (such as
+/api/v1/issues/{issue_id}) and status code: a latency histogram, request and
+response body size histograms, and the number of requests in flight.
+Requests that match no route share the route label "unmatched", so random
+paths cannot grow the label set.
+
+Each response also gets a Server-Timing header (milliseconds):
+- db: time spent executing SQL
+- app: endpoint and dependencies, excluding db
+- serialize: from the endpoint's return to the response start
+  (response model validation, encoding, rendering)
+- total: from receipt of the request to the response start
+
+With QUERY_DEBUG_HEADERS, responses also carry X-DB-Query-Count and
+X-DB-Time-Ms. Every request's statement count and SQL time are logged at
+DEBUG; requests issuing more than QUERY_COUNT_WARNING statements, the usual
+sign of an N+1 pattern, are logged as warnings.
+
+Metrics are kept per process; with several workers each scrape of /metrics
+sees one worker.
+"""
+import asyncio
+import functools
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS_SECONDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS_BYTES = (100, 1000, 10000, 100000, 1000000, 10000000)
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestTiming:
+    """Timings collected while one request is handled"""
+
+    __slots__ = ("queries", "db_seconds", "endpoint_done", "scope")
+
+    def __init__(self, scope: Optional[Scope] = None):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.endpoint_done: Optional[float] = None
+        self.scope = scope
+
+    def server_timing(self, started: float, now: float) -> str:
+        total = now - started
+        db = self.db_seconds
+        if self.endpoint_done is None:
+            # No endpoint ran (404, validation error, rejected by a dependency)
+            app, serialize = total - db, 0.0
+        else:
+            app = self.endpoint_done - started - db
+            serialize = now - self.endpoint_done
+        return ", ".join(
+            f"{name};dur={max(seconds, 0.0) * 1000:.1f}"
+            for name, seconds in (("db", db), ("app", app), ("serialize", serialize), ("total", total))
+        )
+
+
+# The mutable RequestTiming is shared with child tasks and SQLAlchemy's greenlets
+_current_timing: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    timing = _current_timing.get()
+    if timing is not None:
+        timing.queries += 1
+        if context is not None:
+            context._request_timing_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _stop_query_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    timing = _current_timing.get()
+    started = getattr(context, "_request_timing_start", None)
+    if timing is not None and started is not None:
+        timing.db_seconds += time.perf_counter() - started
+
+
+def current_route() -> Optional[str]:
+    """Method and route template of the request being handled, e.g. "GET /api/v1/issues/" """
+    timing = _current_timing.get()
+    if timing is None or timing.scope is None:
+        return None
+    return f"{timing.scope['method']} {getattr(timing.scope.get('route'), 'path', UNMATCHED_ROUTE)}"
+
+
+def _timed_endpoint(call: Callable) -> Callable:
+    if asyncio.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def timed(*args, **kwargs):
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                _mark_endpoint_done()
+    else:
+        @functools.wraps(call)
+        def timed(*args, **kwargs):
+            try:
+                return call(*args, **kwargs)
+            finally:
+                _mark_endpoint_done()
+    timed.request_timing_wrapped = True
+    return timed
+
+
+def _mark_endpoint_done() -> None:
+    timing = _current_timing.get()
+    if timing is not None:
+        timing.endpoint_done = time.perf_counter()
+
+
+def time_endpoints(routes: Iterable) -> None:
+    """Record when each API endpoint returns, to split app from serialization time"""
+    for route in routes:
+        if isinstance(route, APIRoute) and not getattr(route.dependant.call, "request_timing_wrapped", False):
+            # The request handler reads dependant.call on every request
+            route.dependant.call = _timed_endpoint(route.dependant.call)
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(
+        '{}="{}"'.format(
+            name, value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        )
+        for name, value in labels.items()
+    )
+
+
+class RequestMetrics:
+    """Registry of per-route request histograms and in-flight gauges"""
+
+    def __init__(self):
+        self._series: Dict[Tuple[str, str, str], Tuple[Histogram, Histogram, Histogram]] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def start(self, method: str) -> None:
+        with self._lock:
+            self._in_flight[method] = self._in_flight.get(method, 0) + 1
+
+    def finish(
+        self,
+        method: str,
+        route: str,
+        status_code: int,
+        seconds: float,
+        request_bytes: int,
+        response_bytes: int
+    ) -> None:
+        key = (method, route, str(status_code))
+        with self._lock:
+            self._in_flight[method] -= 1
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = (
+                    Histogram(LATENCY_BUCKETS_SECONDS),
+                    Histogram(SIZE_BUCKETS_BYTES),
+                    Histogram(SIZE_BUCKETS_BYTES),
+                )
+        latency, request_size, response_size = series
+        latency.observe(seconds)
+        request_size.observe(request_bytes)
+        response_size.observe(response_bytes)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            series = sorted(self._series.items())
+            in_flight = sorted(self._in_flight.items())
+
+        lines: List[str] = []
+        for index, (name, help_text) in enumerate((
+            ("http_request_duration_seconds", "Time from receiving a request to sending its last byte"),
+            ("http_request_size_bytes", "Request body size"),
+            ("http_response_size_bytes", "Response body size as sent, after compression"),
+        )):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for (method, route, status_code), histograms in series:
+                labels = _labels(method=method, route=route, status=status_code)
+                snapshot = histograms[index].snapshot()
+                for bucket in snapshot["buckets"]:
+                    le = "+Inf" if bucket["le"] is None else f"{bucket['le']:g}"
+                    lines.append(f'{name}_bucket{{{labels},le="{le}"}} {bucket["count"]}')
+                lines.append(f"{name}_sum{{{labels}}} {snapshot['sum']:.6f}")
+                lines.append(f"{name}_count{{{labels}}} {snapshot['count']}")
+
+        lines.append("# HELP http_requests_in_progress Requests currently being handled")
+        lines.append("# TYPE http_requests_in_progress gauge")
+        for method, count in in_flight:
+            lines.append(f"http_requests_in_progress{{{_labels(method=method)}}} {count}")
+        return "\n".join(lines) + "\n"
+
+
+class RequestMetricsMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        metrics: RequestMetrics,
+        server_timing: bool = True,
+        query_headers: bool = False,
+        query_count_warning: int = 0
+    ) -> None:
+        self.app = app
+        self.metrics = metrics
+        self.server_timing = server_timing
+        self.query_headers = query_headers
+        self.query_count_warning = query_count_warning
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        started = time.perf_counter()
+        timing = RequestTiming(scope)
+        token = _current_timing.set(timing)
+        status_code = 500
+        request_bytes = 0
+        response_bytes = 0
+
+        async def receive_counted() -> Message:
+            nonlocal request_bytes
+            message = await receive()
+            if message["type"] == "http.request":
+                request_bytes += len(message.get("body", b""))
+            return message
+
+        async def send_timed(message: Message) -> None:
+            nonlocal status_code, response_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                if self.server_timing:
+                    headers.append("Server-Timing", timing.server_timing(started, time.perf_counter()))
+                if self.query_headers:
+                    headers["X-DB-Query-Count"] = str(timing.queries)
+                    headers["X-DB-Time-Ms"] = f"{timing.db_seconds * 1000:.1f}"
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        self.metrics.start(method)
+        try:
+            await self.app(scope, receive_counted, send_timed)
+        finally:
+            _current_timing.reset(token)
+            # Routing stored the matched route in the (shared) scope
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            self.metrics.finish(
+                method,
+                route,
+                status_code,
+                time.perf_counter() - started,
+                request_bytes,
+                response_bytes,
+            )
+            self._log_queries(method, route, status_code, timing)
+
+    def _log_queries(self, method: str, route: str, status_code: int, timing: RequestTiming) -> None:
+        if 0 < self.query_count_warning < timing.queries:
+            level = logging.WARNING
+        elif logger.isEnabledFor(logging.DEBUG):
+            level = logging.DEBUG
+        else:
+            return
+        logger.log(
+            level, "%s %s -> %d: %d SQL statements, %.1f ms in the database",
+            method, route, status_code, timing.queries, timing.db_seconds * 1000
+        )
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,31 @@
+"""Fast JSON serialization for large list responses
+
+FastAPI validates a response against response_model, dumps it to Python
+objects and encodes those with the stdlib json module. When
+FAST_JSON_RESPONSES is enabled, the routes that opt in validate through a
+prebuilt TypeAdapter and let pydantic-core encode the result in one pass.
+The output is byte-identical to FastAPI's JSONResponse.
+
+Validation accepts ORM objects as well as row mappings; mappings are
+markedly cheaper to validate than attribute access on ORM instances.
+"""
+from typing import Any, Iterable, TypeVar
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+def dump_json(adapter: TypeAdapter, content: Any) -> bytes:
+    """Validate content (ORM objects or row mappings) and encode it to JSON"""
+    return adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+
+
+def json_list_response(adapter: TypeAdapter, items: Iterable[T]) -> Response | Iterable[T]:
+    """Serialize items on the fast path, or hand them back to the route's response_model"""
+    if not settings.FAST_JSON_RESPONSES:
+        return items
+    return Response(content=dump_json(adapter, items), media_type="application/json")
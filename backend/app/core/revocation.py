@@ -0,0 +1,107 @@
+"""Revoked access tokens, checked in memory
+
+Each worker holds the jti of every revoked, not yet expired token in a set,
+so checking a token costs a set lookup. The set is brought up to date with
+one query for rows added since the last refresh, at most every
+TOKEN_REVOCATION_REFRESH_SECONDS. A token revoked through another worker is
+therefore rejected here within that interval; one revoked through this
+worker is rejected immediately.
+
+Rows are found by id above the highest one seen, and also by revoked_at
+within REFRESH_OVERLAP_SECONDS before the previous refresh: ids are handed
+out when a row is inserted, not when it commits, so a revocation committed
+late can have a lower id than rows already loaded.
+"""
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.revoked_token import RevokedToken
+
+
+def _timestamp(value: datetime) -> float:
+    # SQLite returns naive datetimes; everything is stored in UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class RevocationList:
+    """In-memory view of the revoked_tokens table"""
+
+    REFRESH_OVERLAP_SECONDS = 60
+
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self.clear()
+
+    def clear(self) -> None:
+        self._expiry: Dict[str, float] = {}  # jti -> exp timestamp
+        self._last_id = 0
+        self._refreshed_at: Optional[float] = None
+        self._last_refresh_started: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+    def _refresh_due(self) -> bool:
+        return (
+            self._refreshed_at is None
+            or time.monotonic() - self._refreshed_at >= self.refresh_seconds
+        )
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """Load revocations added since the last refresh and forget expired ones"""
+        # Set first, so concurrent requests do not all start a refresh
+        self._refreshed_at = time.monotonic()
+        condition = RevokedToken.id > self._last_id
+        if self._last_refresh_started is not None:
+            # Re-read recent rows too, for ids committed out of order
+            window_start = self._last_refresh_started - timedelta(seconds=self.REFRESH_OVERLAP_SECONDS)
+            condition = or_(condition, RevokedToken.revoked_at >= window_start)
+        self._last_refresh_started = datetime.now(timezone.utc)
+        result = await db.execute(
+            select(RevokedToken.id, RevokedToken.jti, RevokedToken.expires_at)
+            .where(condition)
+            .order_by(RevokedToken.id)
+        )
+        for row_id, jti, expires_at in result:
+            self._expiry[jti] = _timestamp(expires_at)
+            self._last_id = max(self._last_id, row_id)
+
+        now = time.time()
+        expired = [jti for jti, expires in self._expiry.items() if expires <= now]
+        for jti in expired:
+            del self._expiry[jti]
+
+    async def is_revoked(self, db: AsyncSession, jti: Optional[str]) -> bool:
+        """Whether a token id was revoked; queries only when a refresh is due"""
+        if jti is None:
+            # Issued before tokens carried an id; these cannot be revoked
+            return False
+        if self._refresh_due():
+            await self.refresh(db)
+        return jti in self._expiry
+
+    async def revoke(self, db: AsyncSession, jti: str, user_id: int, expires_at: float) -> None:
+        """Record a revocation and purge rows whose tokens have expired"""
+        if jti not in self._expiry:
+            existing = await db.execute(select(RevokedToken.id).where(RevokedToken.jti == jti))
+            if existing.first() is None:
+                db.add(RevokedToken(
+                    jti=jti,
+                    user_id=user_id,
+                    expires_at=datetime.fromtimestamp(expires_at, tz=timezone.utc),
+                ))
+        await db.execute(
+            delete(RevokedToken).where(RevokedToken.expires_at <= datetime.now(timezone.utc))
+        )
+        await db.commit()
+        self._expiry[jti] = expires_at
+
+
+revocation_list = RevocationList(settings.TOKEN_REVOCATION_REFRESH_SECONDS)
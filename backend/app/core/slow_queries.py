@@ -0,0 +1,187 @@
+"""Slow-query log with the execution plan of each slow statement
+
+Statements taking longer than SLOW_QUERY_MS are logged as warnings with
+their duration, the route of the request that issued them and the shape of
+their bound parameters (types and list lengths; values are never recorded,
+they may be personal data). The last SLOW_QUERY_LOG_SIZE of them are kept
+per worker for GET /admin/slow-queries.
+
+With SLOW_QUERY_EXPLAIN, the plan is captured right after the statement,
+on the same connection and with the same parameters: EXPLAIN on PostgreSQL
+(EXPLAIN ANALYZE, which runs the query again, for SELECTs when
+SLOW_QUERY_EXPLAIN_ANALYZE is set) and EXPLAIN QUERY PLAN on SQLite. A plan
+is reused for the same statement text for PLAN_REUSE_SECONDS, so a hot slow
+query is not explained on every execution.
+
+The route is known only when RequestMetricsMiddleware is installed
+(METRICS_ENABLED); statements issued outside a request have none.
+"""
+import collections
+import itertools
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.request_metrics import current_route
+
+logger = logging.getLogger(__name__)
+
+PLAN_REUSE_SECONDS = 60
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+MAX_LOGGED_STATEMENT = 2000
+
+
+def _type_runs(values) -> str:
+    # Consecutive parameters of one type (an IN list) collapse to "int*500"
+    runs = []
+    for type_name, group in itertools.groupby(type(value).__name__ for value in values):
+        count = sum(1 for _ in group)
+        runs.append(type_name if count == 1 else f"{type_name}*{count}")
+    return ", ".join(runs)
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> str:
+    """Types of bound parameters without their values, e.g. "(int, str*3)" """
+    if executemany:
+        rows = list(parameters)
+        return f"{len(rows)} x {parameter_shape(rows[0]) if rows else '()'}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{name}: {type(value).__name__}" for name, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return f"({_type_runs(parameters)})"
+    return "()" if parameters is None else type(parameters).__name__
+
+
+class SlowQueryLog:
+    """Ring buffer of slow statements and their plans"""
+
+    def __init__(self, threshold_ms: float, size: int, explain: bool = True, analyze: bool = False):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.analyze = analyze
+        self._entries: Deque[Dict] = collections.deque(maxlen=max(size, 1))
+        self._plans: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms > 0
+
+    def record(self, conn, statement: str, parameters, executemany: bool, seconds: float) -> None:
+        route = current_route()
+        shape = parameter_shape(parameters, executemany)
+        duration_ms = seconds * 1000
+        logger.warning(
+            "Slow query: %.1f ms in %s, parameters %s: %s",
+            duration_ms, route or "no request", shape, " ".join(statement.split())[:MAX_LOGGED_STATEMENT]
+        )
+        plan = None
+        keyword = statement.lstrip()[:6].upper()
+        # ANALYZE executes the statement again, so never for writes
+        analyzed = self.analyze and keyword == "SELECT" and conn.dialect.name == "postgresql"
+        if self.explain and not executemany and keyword.startswith(EXPLAINABLE):
+            plan = self._plan(conn, statement, parameters, analyzed)
+        with self._lock:
+            self._entries.append({
+                "recorded_at": datetime.now(timezone.utc),
+                "duration_ms": round(duration_ms, 3),
+                "route": route,
+                "statement": statement,
+                "parameters": shape,
+                "plan": plan,
+                "analyzed": analyzed and plan is not None,
+            })
+
+    def _plan(self, conn, statement: str, parameters, analyze: bool) -> Optional[str]:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._plans.get(statement)
+        if cached is not None and now - cached[0] < PLAN_REUSE_SECONDS:
+            return cached[1]
+
+        dialect = conn.dialect.name
+        if dialect == "postgresql":
+            prefix = "EXPLAIN (ANALYZE, BUFFERS) " if analyze else "EXPLAIN "
+        elif dialect == "sqlite":
+            prefix = "EXPLAIN QUERY PLAN "
+        else:
+            return None
+        cursor = None
+        savepoint = False
+        try:
+            # A raw DBAPI cursor, so the EXPLAIN itself is neither timed nor counted
+            cursor = conn.connection.cursor()
+            if dialect == "postgresql":
+                # A failed EXPLAIN must not abort the request's transaction
+                cursor.execute("SAVEPOINT slow_query_explain")
+                savepoint = True
+            cursor.execute(prefix + statement, parameters)
+            rows = cursor.fetchall()
+            if savepoint:
+                cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        except Exception as e:
+            # Capturing a plan is best effort: the statement itself has already succeeded
+            if savepoint:
+                try:
+                    cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                except Exception:
+                    logger.exception("Could not roll back after a failed EXPLAIN")
+            logger.warning("Could not explain a slow query: %s", e)
+            return None
+        finally:
+            if cursor is not None:
+                cursor.close()
+
+        if dialect == "sqlite":
+            # (id, parent, notused, detail)
+            plan = "\n".join(row[3] for row in rows)
+        else:
+            plan = "\n".join(row[0] for row in rows)
+        with self._lock:
+            if len(self._plans) >= self._entries.maxlen:
+                self._plans = {
+                    key: value for key, value in self._plans.items()
+                    if now - value[0] < PLAN_REUSE_SECONDS
+                }
+            self._plans[statement] = (now, plan)
+        return plan
+
+    def entries(self) -> List[Dict]:
+        """Recorded statements, newest first"""
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._plans.clear()
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_MS,
+    size=settings.SLOW_QUERY_LOG_SIZE,
+    explain=settings.SLOW_QUERY_EXPLAIN,
+    analyze=settings.SLOW_QUERY_EXPLAIN_ANALYZE,
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_slow_query_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    if slow_query_log.enabled and context is not None:
+        context._slow_query_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _check_slow_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = getattr(context, "_slow_query_start", None)
+    if started is None:
+        return
+    seconds = time.perf_counter() - started
+    if slow_query_log.enabled and seconds * 1000 >= slow_query_log.threshold_ms:
+        slow_query_log.record(conn, statement, parameters, executemany, seconds)
@@ -0,0 +1,39 @@
+"""Prebuilt statements for the hottest lookups
+
+Building a select() and computing its cache key costs more Python time than
+running a primary key lookup on a warm connection. These statements are built
+once at import; their cache keys are memoized on the statement object, so each
+execution only binds parameters and reuses the compiled SQL from the engine's
+compiled cache.
+
+Execute them with a parameter dict, e.g.
+``await db.execute(USER_BY_ID, {"user_id": user_id})``.
+"""
+from sqlalchemy import bindparam, select
+from sqlalchemy.orm import selectinload
+
+from app.models import (
+    Comment as CommentModel,
+    Issue as IssueModel,
+    IssueLabel,
+    Label as LabelModel,
+    User as UserModel
+)
+
+USER_BY_ID = select(UserModel).where(UserModel.id == bindparam("user_id"))
+
+ISSUE_BY_ID = select(IssueModel).where(IssueModel.id == bindparam("issue_id"))
+
+# Existence check only, without loading the row
+ISSUE_EXISTS = select(IssueModel.id).where(IssueModel.id == bindparam("issue_id"))
+
+# Plain rows for read endpoints: no ORM instances, identity map or instance state
+ISSUE_ROWS = select(IssueModel.__table__)
+
+ISSUE_COMMENTS = select(CommentModel).options(
+    selectinload(CommentModel.author)
+).where(CommentModel.issue_id == bindparam("issue_id"))
+
+ISSUE_LABELS = select(LabelModel).join(IssueLabel).where(
+    IssueLabel.issue_id == bindparam("issue_id")
+)
@@ -0,0 +1,277 @@
+"""Bulk generation of realistic issue tracker data
+
+Rows are built in Python from a seeded random generator and written with
+batched Core inserts, one transaction per batch of issues, so millions of
+rows take minutes instead of the hours the API would need. The same
+arguments (including ``until``) always produce the same rows.
+
+The shape follows what a real tracker accumulates:
+- more issues were filed recently than long ago;
+- a few people create and are assigned most issues (Zipf-like weights);
+- older issues are more likely to be resolved or closed;
+- each issue has a history trail consistent with its state and version,
+  a skewed number of comments (mostly by its creator and assignee) and
+  zero to three labels, some labels being far more common than others.
+
+Ids are assigned here, so the tables must be empty. On PostgreSQL the id
+sequences are moved past the generated rows afterwards.
+"""
+import itertools
+import math
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import Engine
+
+from app.models import (
+    Comment,
+    Issue,
+    IssueHistory,
+    IssueLabel,
+    IssuePriority,
+    IssueStatus,
+    Label,
+    User
+)
+
+LABEL_NAMES = [
+    "bug", "feature", "enhancement", "backend", "frontend", "ui", "performance",
+    "documentation", "security", "regression", "needs-triage", "good-first-issue",
+    "api", "database", "mobile", "accessibility", "tech-debt", "duplicate", "wontfix", "question",
+]
+PRIORITY_WEIGHTS = [(IssuePriority.LOW, 30), (IssuePriority.MEDIUM, 45),
+                    (IssuePriority.HIGH, 20), (IssuePriority.CRITICAL, 5)]
+LABELS_PER_ISSUE_WEIGHTS = [(0, 25), (1, 40), (2, 25), (3, 10)]
+TITLE_PROBLEMS = ["Crash", "Slow response", "Wrong total", "Broken layout", "Timeout",
+                  "Missing translation", "Error 500", "Typo", "Cannot save", "Duplicate entries"]
+TITLE_AREAS = ["login", "issue list", "reports", "CSV import", "search", "notifications",
+               "settings page", "export", "comments", "dashboard"]
+UNASSIGNED_SHARE = 0.15
+
+
+def _zipf_cum_weights(count: int, exponent: float = 1.1) -> List[float]:
+    return list(itertools.accumulate(1 / rank ** exponent for rank in range(1, count + 1)))
+
+
+class _Picker:
+    """Weighted choice from a fixed population with precomputed cumulative weights"""
+
+    def __init__(self, rng: random.Random, population: Sequence, cum_weights: Sequence[float]):
+        self.rng = rng
+        self.population = population
+        self.cum_weights = cum_weights
+
+    def __call__(self):
+        return self.rng.choices(self.population, cum_weights=self.cum_weights)[0]
+
+
+def _weighted(rng: random.Random, pairs) -> _Picker:
+    values, weights = zip(*pairs)
+    return _Picker(rng, values, list(itertools.accumulate(weights)))
+
+
+def _batches(rows: Iterator, size: int) -> Iterator[list]:
+    while True:
+        batch = list(itertools.islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+class SyntheticDataGenerator:
+    """Generates one dataset; see generate_dataset"""
+
+    def __init__(
+        self,
+        users: int,
+        labels: int,
+        seed: int,
+        until: datetime,
+        days: int,
+        password_hash: str
+    ):
+        self.user_count = users
+        self.label_count = labels
+        self.until = until
+        self.days = days
+        self.password_hash = password_hash
+        self.rng = rng = random.Random(seed)
+
+        user_ids = list(range(1, users + 1))
+        user_weights = _zipf_cum_weights(users)
+        # Different people are prolific creators and busy assignees
+        self.pick_creator = _Picker(rng, user_ids, user_weights)
+        self.pick_assignee = _Picker(rng, rng.sample(user_ids, users), user_weights)
+        self.pick_priority = _weighted(rng, PRIORITY_WEIGHTS)
+        self.pick_label_count = _weighted(rng, LABELS_PER_ISSUE_WEIGHTS)
+        self.label_weights = [1 / rank for rank in range(1, labels + 1)]
+        self.label_names_by_id = dict(enumerate(self.label_names(), start=1))
+
+    def label_names(self) -> List[str]:
+        extra = (f"area-{n:03d}" for n in itertools.count(1))
+        return list(itertools.islice(itertools.chain(LABEL_NAMES, extra), self.label_count))
+
+    def user_rows(self) -> List[dict]:
+        return [
+            {"id": user_id, "username": f"user{user_id}", "email": f"user{user_id}@example.com",
+             "full_name": f"User {user_id}", "hashed_password": self.password_hash, "is_active": True}
+            for user_id in range(1, self.user_count + 1)
+        ]
+
+    def label_rows(self) -> List[dict]:
+        return [
+            {"id": label_id, "name": name, "color": f"#{self.rng.randrange(0x1000000):06x}"}
+            for label_id, name in enumerate(self.label_names(), start=1)
+        ]
+
+    def _final_status(self, age_days: float) -> IssueStatus:
+        rng = self.rng
+        done = min(0.92, 1 - math.exp(-age_days / 30))
+        if rng.random() < done:
+            return IssueStatus.RESOLVED if rng.random() < 0.6 else IssueStatus.CLOSED
+        return IssueStatus.IN_PROGRESS if rng.random() < 0.35 else IssueStatus.OPEN
+
+    def _status_path(self, status: IssueStatus) -> List[IssueStatus]:
+        if status == IssueStatus.OPEN:
+            return []
+        if status == IssueStatus.CLOSED and self.rng.random() < 0.3:
+            return [IssueStatus.CLOSED]  # Closed without being worked on
+        path = [IssueStatus.IN_PROGRESS, IssueStatus.RESOLVED, IssueStatus.CLOSED]
+        return path[:path.index(status) + 1]
+
+    def issue(self, issue_id: int) -> Tuple[dict, List[dict], List[dict], List[dict]]:
+        """One issue row with its history, comment and label rows"""
+        rng = self.rng
+        # sqrt skews ages toward zero: more issues were filed recently
+        age_days = self.days * (1 - math.sqrt(rng.random()))
+        created_at = self.until - timedelta(days=age_days)
+        creator_id = self.pick_creator()
+        priority = self.pick_priority()
+        assignee_id = None if rng.random() < UNASSIGNED_SHARE else self.pick_assignee()
+        status = self._final_status(age_days)
+
+        # Changes happen in order between creation and now
+        changes: List[Tuple[str, Optional[str], Optional[str], int]] = []
+        if assignee_id is not None and rng.random() < 0.3:
+            previous = self.pick_assignee()
+            if previous != assignee_id:
+                changes.append(("assignee_id", str(previous), str(assignee_id), creator_id))
+        if rng.random() < 0.15:
+            previous = self.pick_priority()
+            if previous != priority:
+                changes.append(("priority", previous.value, priority.value, creator_id))
+        old = IssueStatus.OPEN
+        for new in self._status_path(status):
+            changes.append(("status", old.value, new.value, assignee_id or creator_id))
+            old = new
+
+        step = timedelta(days=age_days) / (len(changes) + 1)
+        history = [{
+            "issue_id": issue_id, "changed_by_id": creator_id, "field_name": "created",
+            "old_value": None, "new_value": "Issue created", "changed_at": created_at,
+        }]
+        resolved_at = None
+        for n, (field, old_value, new_value, changed_by_id) in enumerate(changes, start=1):
+            # Somewhere in the second half of the change's own slot, so the trail stays ordered
+            changed_at = created_at + step * (n - rng.random() / 2)
+            history.append({
+                "issue_id": issue_id, "changed_by_id": changed_by_id, "field_name": field,
+                "old_value": old_value, "new_value": new_value, "changed_at": changed_at,
+            })
+            if field == "status" and new_value == IssueStatus.RESOLVED.value:
+                resolved_at = changed_at
+
+        # Geometric-ish: most issues get a few comments, some get many
+        comment_count = min(int(rng.expovariate(1 / 1.5)), 40)
+        comment_times = sorted(
+            created_at + timedelta(days=age_days) * rng.random() for _ in range(comment_count)
+        )
+        comments = []
+        for n, commented_at in enumerate(comment_times, start=1):
+            draw = rng.random()
+            author_id = (
+                creator_id if draw < 0.35
+                else assignee_id if draw < 0.65 and assignee_id is not None
+                else self.pick_creator()
+            )
+            comments.append({
+                "issue_id": issue_id, "author_id": author_id, "created_at": commented_at,
+                "updated_at": commented_at, "body": f"Comment {n}: " + "details " * rng.randint(1, 30),
+            })
+
+        label_ids = sorted(self._sample_labels(self.pick_label_count()))
+        issue_labels = [{"issue_id": issue_id, "label_id": label_id} for label_id in label_ids]
+        row = {
+            "id": issue_id,
+            "title": f"{rng.choice(TITLE_PROBLEMS)} in {rng.choice(TITLE_AREAS)} (#{issue_id})",
+            "description": "Steps to reproduce: " + "lorem ipsum " * rng.randint(3, 60),
+            "status": status,
+            "priority": priority,
+            "version": 1 + len(changes),
+            "creator_id": creator_id,
+            "assignee_id": assignee_id,
+            "created_at": created_at,
+            "updated_at": history[-1]["changed_at"],
+            "resolved_at": resolved_at,
+            "comment_count": comment_count,
+            "label_names": sorted(self.label_names_by_id[label_id] for label_id in label_ids),
+        }
+        return row, history, comments, issue_labels
+
+    def _sample_labels(self, count: int) -> set:
+        chosen: set = set()
+        count = min(count, self.label_count)
+        while len(chosen) < count:
+            chosen.add(self.rng.choices(range(1, self.label_count + 1), weights=self.label_weights)[0])
+        return chosen
+
+
+def generate_dataset(
+    engine: Engine,
+    users: int,
+    issues: int,
+    labels: int = 20,
+    seed: int = 0,
+    until: Optional[datetime] = None,
+    days: int = 730,
+    password_hash: str = "!",
+    batch_size: int = 2000
+) -> Dict[str, int]:
+    """Insert a generated dataset into empty tables; returns the rows written per table"""
+    with engine.connect() as connection:
+        if connection.execute(select(func.count()).select_from(Issue.__table__)).scalar():
+            raise ValueError("The issues table is not empty; generate into an empty database")
+
+    if until is None:
+        until = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    generator = SyntheticDataGenerator(users, labels, seed, until, days, password_hash)
+    counts = {"users": users, "labels": labels, "issues": 0,
+              "issue_history": 0, "comments": 0, "issue_labels": 0}
+
+    with engine.begin() as connection:
+        connection.execute(User.__table__.insert(), generator.user_rows())
+        connection.execute(Label.__table__.insert(), generator.label_rows())
+
+    children = (("issue_history", IssueHistory.__table__), ("comments", Comment.__table__),
+                ("issue_labels", IssueLabel.__table__))
+    rows = (generator.issue(issue_id) for issue_id in range(1, issues + 1))
+    for batch in _batches(rows, batch_size):
+        # One transaction per batch keeps memory and lock time flat
+        with engine.begin() as connection:
+            connection.execute(Issue.__table__.insert(), [issue for issue, *_ in batch])
+            for index, (name, table) in enumerate(children, start=1):
+                child_rows = [row for item in batch for row in item[index]]
+                if child_rows:
+                    connection.execute(table.insert(), child_rows)
+                    counts[name] += len(child_rows)
+        counts["issues"] += len(batch)
+
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as connection:
+            for table in ("users", "labels", "issues"):
+                connection.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))"
+                ))
+    return counts
@@ -0,0 +1,126 @@
+"""Token-bucket throttling for the unauthenticated auth endpoints
+
+Each attempt takes one token from the client IP's bucket and one from the
+email's bucket. Buckets hold up to *burst* tokens and refill at *per_minute*
+tokens a minute. An empty bucket rejects the attempt with 429 and
+Retry-After before any database or bcrypt work is done.
+
+Buckets live in memory by default, which makes limits per worker. To share
+them across workers and nodes, point AUTH_THROTTLE_BACKEND at a
+ThrottleBackend subclass (e.g. one backed by Redis).
+"""
+import importlib
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+
+
+class ThrottleBackend(ABC):
+    """Storage for token buckets"""
+
+    @abstractmethod
+    async def consume(self, key: str, burst: int, per_minute: float) -> float:
+        """Take a token from a bucket; returns 0 on success, else seconds until one is available"""
+
+
+class MemoryThrottleBackend(ThrottleBackend):
+    """Per-process buckets, least recently used first"""
+
+    MAX_BUCKETS = 100000
+
+    def __init__(self):
+        # key -> (tokens, updated, refill_per_second, burst)
+        self._buckets: OrderedDict[str, Tuple[float, float, float, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def consume(self, key: str, burst: int, per_minute: float) -> float:
+        refill_per_second = per_minute / 60
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.MAX_BUCKETS:
+                    self._prune(now)
+                tokens, updated = burst, now
+            else:
+                tokens, updated = bucket[0], bucket[1]
+                self._buckets.move_to_end(key)
+            tokens = min(burst, tokens + (now - updated) * refill_per_second)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now, refill_per_second, burst)
+                return 0.0
+            self._buckets[key] = (tokens, now, refill_per_second, burst)
+        if refill_per_second <= 0:
+            return math.inf
+        return (1 - tokens) / refill_per_second
+
+    def _prune(self, now: float) -> None:
+        # Buckets that have refilled completely are indistinguishable from new ones
+        for key, (tokens, updated, refill, burst) in list(self._buckets.items()):
+            if refill > 0 and tokens + (now - updated) * refill >= burst:
+                del self._buckets[key]
+        # Then drop the least recently used, leaving headroom so the scan
+        # above runs once per MAX_BUCKETS / 10 new keys at most
+        target = self.MAX_BUCKETS - max(1, self.MAX_BUCKETS // 10)
+        while len(self._buckets) > target:
+            self._buckets.popitem(last=False)
+
+
+def load_backend(path: str) -> ThrottleBackend:
+    """Instantiate a backend from a dotted path such as "package.module.ClassName" """
+    module_name, _, class_name = path.rpartition(".")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+class AuthThrottle:
+    """Per-IP and per-email limits for login and password reset"""
+
+    def __init__(
+        self,
+        backend: ThrottleBackend,
+        ip_burst: int,
+        ip_per_minute: float,
+        email_burst: int,
+        email_per_minute: float,
+        enabled: bool = True
+    ):
+        self.backend = backend
+        self.ip_burst = ip_burst
+        self.ip_per_minute = ip_per_minute
+        self.email_burst = email_burst
+        self.email_per_minute = email_per_minute
+        self.enabled = enabled
+
+    async def check(self, action: str, request: Request, email: Optional[str] = None) -> None:
+        """Count an attempt, raising 429 if the client or the email is over its limit"""
+        if not self.enabled:
+            return
+        host = request.client.host if request.client else "unknown"
+        wait = await self.backend.consume(f"{action}:ip:{host}", self.ip_burst, self.ip_per_minute)
+        if not wait and email:
+            wait = await self.backend.consume(
+                f"{action}:email:{email.strip().lower()}", self.email_burst, self.email_per_minute
+            )
+        if wait:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many attempts, please try again later",
+                headers={"Retry-After": str(max(1, math.ceil(min(wait, 86400))))},
+            )
+
+
+auth_throttle = AuthThrottle(
+    backend=load_backend(settings.AUTH_THROTTLE_BACKEND),
+    ip_burst=settings.AUTH_THROTTLE_IP_BURST,
+    ip_per_minute=settings.AUTH_THROTTLE_IP_PER_MINUTE,
+    email_burst=settings.AUTH_THROTTLE_EMAIL_BURST,
+    email_per_minute=settings.AUTH_THROTTLE_EMAIL_PER_MINUTE,
+    enabled=settings.AUTH_THROTTLE_ENABLED,
+)
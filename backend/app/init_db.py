@@ -1,10 +1,35 @@
-from app.core.database import engine, Base
-from app.models import User, Issue, Comment, Label, IssueLabel, IssueHistory
+import os
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect
+from app.core.database import engine
 
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
 
-def init_db():
-    """Create all database tables"""
-    Base.metadata.create_all(bind=engine)
+# Revision matching the schema that Base.metadata.create_all used to produce
+BASELINE_REVISION = "0001"
+
+
+def get_alembic_config(url: str | None = None) -> Config:
+    """Alembic config for this project, optionally pointed at another database"""
+    config = Config(ALEMBIC_INI)
+    config.attributes["configure_logger"] = False
+    if url:
+        config.set_main_option("sqlalchemy.url", url)
+    return config
+
+
+def init_db(url: str | None = None):
+    """Bring the database schema up to date by running migrations"""
+    config = get_alembic_config(url)
+    inspector = inspect(create_engine(url) if url else engine)
+
+    if inspector.has_table("issues") and not inspector.has_table("alembic_version"):
+        # Tables were created by create_all before migrations existed
+        print(f"Existing schema found, stamping revision {BASELINE_REVISION}...")
+        command.stamp(config, BASELINE_REVISION)
+
+    command.upgrade(config, "head")
     print("Database tables created successfully!")
 
 
@@ -1,12 +1,52 @@
-from fastapi import FastAPI
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.core.config import settings
-from app.routes import issues_router, comments_router, labels_router, reports_router, users_router
+from app.core.compression import CompressionMiddleware
+from app.core.config import LAUNCHED_AT_ENV, settings
+from app.core.passwords import password_hasher
+from app.core.profiling import ProfilingMiddleware, profile_store
+from app.core.request_metrics import (
+    PROMETHEUS_CONTENT_TYPE, RequestMetricsMiddleware, request_metrics, time_endpoints
+)
+from app.core.database import (
+    async_engine, async_read_engine, replica_router, get_client_key, PRIMARY_UNTIL_COOKIE
+)
+from app.routes import (
+    issues_router, comments_router, labels_router, reports_router, users_router, admin_router
+)
 from app.routes import auth as auth_router
 
+logger = logging.getLogger("uvicorn.error")
+
+# Uvicorn configures only its own loggers; give the app's a handler and a level
+logging.basicConfig(format="%(levelname)s:     %(name)s - %(message)s")
+logging.getLogger("app").setLevel(settings.LOG_LEVEL.upper())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    launched_at = os.environ.get(LAUNCHED_AT_ENV)
+    if launched_at:
+        logger.info(
+            "Worker %d ready %.0f ms after server launch",
+            os.getpid(), (time.time() - float(launched_at)) * 1000
+        )
+    yield
+    # In-flight requests have drained by now; close pooled connections cleanly
+    await password_hasher.shutdown()
+    await async_engine.dispose()
+    if async_read_engine is not None:
+        await async_read_engine.dispose()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -19,6 +59,49 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+# Wraps CORS and routing, so error and preflight responses are eligible too
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+)
+
+
+@app.middleware("http")
+async def pin_reads_after_write(request: Request, call_next):
+    """Keep a client's reads on the primary for a while after it writes"""
+    response = await call_next(request)
+    if (replica_router.enabled
+            and request.method not in ("GET", "HEAD", "OPTIONS")
+            and response.status_code < 400):
+        primary_until = replica_router.record_write(get_client_key(request))
+        response.set_cookie(
+            PRIMARY_UNTIL_COOKIE,
+            str(primary_until),
+            max_age=settings.READ_AFTER_WRITE_SECONDS,
+            httponly=True,
+            samesite="lax",
+        )
+    return response
+
+
+# Only installed when enabled, so ordinary deployments pay nothing for it
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware, store=profile_store)
+
+
+# Outermost, so latency and sizes cover compression and the other middleware
+if settings.METRICS_ENABLED:
+    app.add_middleware(
+        RequestMetricsMiddleware,
+        metrics=request_metrics,
+        server_timing=settings.SERVER_TIMING_ENABLED,
+        query_headers=settings.QUERY_DEBUG_HEADERS,
+        query_count_warning=settings.QUERY_COUNT_WARNING,
+    )
+
+
 # Include routers
 app.include_router(auth_router.router, prefix=settings.API_V1_STR)
 app.include_router(users_router, prefix=settings.API_V1_STR)
@@ -26,10 +109,11 @@ app.include_router(issues_router, prefix=settings.API_V1_STR)
 app.include_router(comments_router, prefix=settings.API_V1_STR)
 app.include_router(labels_router, prefix=settings.API_V1_STR)
 app.include_router(reports_router, prefix=settings.API_V1_STR)
+app.include_router(admin_router, prefix=settings.API_V1_STR)
 
 
 @app.get("/")
-def root():
+async def root():
     return {
         "message": "Issue Tracker API",
         "docs": "/docs",
@@ -38,5 +122,13 @@ def root():
 
 
 @app.get("/health")
-def health_check():
+async def health_check():
     return {"status": "healthy"}
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return PlainTextResponse(request_metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+    time_endpoints(app.routes)
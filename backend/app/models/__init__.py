@@ -4,5 +4,6 @@ from .comment import Comment
 from .label import Label
 from .issue_label import IssueLabel
 from .issue_history import IssueHistory
+from .revoked_token import RevokedToken
 
-__all__ = ["User", "Issue", "IssueStatus", "IssuePriority", "Comment", "Label", "IssueLabel", "IssueHistory"]
+__all__ = ["User", "Issue", "IssueStatus", "IssuePriority", "Comment", "Label", "IssueLabel", "IssueHistory", "RevokedToken"]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -6,11 +6,15 @@ from app.core.database import Base
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        # Comments of one issue in posting order
+        Index('ix_comments_issue_created_at', 'issue_id', 'created_at'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     body = Column(Text, nullable=False)
     author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    issue_id = Column(Integer, ForeignKey("issues.id"), nullable=False, index=True)
+    issue_id = Column(Integer, ForeignKey("issues.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
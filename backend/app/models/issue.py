@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, ForeignKey, Index, JSON
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -21,21 +21,33 @@ class IssuePriority(str, enum.Enum):
 
 class Issue(Base):
     __tablename__ = "issues"
+    __table_args__ = (
+        # Covers the top-assignees report (filter + group by) so it can run as an index-only scan,
+        # and any lookup by assignee or by (assignee, status)
+        Index('ix_issues_assignee_status_priority', 'assignee_id', 'status', 'priority'),
+        # Status-filtered issue lists in creation order, with id as a stable tiebreaker
+        Index('ix_issues_status_created_at_id', 'status', 'created_at', 'id'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False, index=True)
     description = Column(Text)
-    status = Column(Enum(IssueStatus), default=IssueStatus.OPEN, nullable=False, index=True)
+    status = Column(Enum(IssueStatus), default=IssueStatus.OPEN, nullable=False)
     priority = Column(Enum(IssuePriority), default=IssuePriority.MEDIUM, nullable=False)
     version = Column(Integer, default=1, nullable=False)  # For optimistic concurrency control
 
     creator_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    assignee_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    assignee_id = Column(Integer, ForeignKey("users.id"), nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     resolved_at = Column(DateTime(timezone=True), nullable=True, index=True)
 
+    # Denormalized for issue lists; kept in sync by the comment and label controllers
+    # and recomputed by repair_counters.py
+    comment_count = Column(Integer, default=0, server_default="0", nullable=False)
+    label_names = Column(JSON, default=list, server_default="[]", nullable=False)  # Sorted label names
+
     # Relationships
     creator = relationship("User", foreign_keys=[creator_id], back_populates="created_issues")
     assignee = relationship("User", foreign_keys=[assignee_id], back_populates="assigned_issues")
@@ -1,14 +1,20 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 
 class IssueHistory(Base):
+    # On PostgreSQL this table is range-partitioned by month on changed_at
+    # (migration 0003); old months are archived by app.core.history_archive
     __tablename__ = "issue_history"
+    __table_args__ = (
+        # Timeline reads: one issue's history in change order
+        Index('ix_issue_history_issue_changed_at', 'issue_id', 'changed_at'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    issue_id = Column(Integer, ForeignKey("issues.id"), nullable=False, index=True)
+    issue_id = Column(Integer, ForeignKey("issues.id"), nullable=False)
     changed_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     field_name = Column(String(50), nullable=False)
     old_value = Column(Text)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -6,12 +6,15 @@ from app.core.database import Base
 class IssueLabel(Base):
     __tablename__ = "issue_labels"
     __table_args__ = (
+        # Also serves lookups by issue_id
         UniqueConstraint('issue_id', 'label_id', name='uq_issue_label'),
+        # Issues carrying a label, without touching the table
+        Index('ix_issue_labels_label_issue', 'label_id', 'issue_id'),
     )
 
     id = Column(Integer, primary_key=True, index=True)
-    issue_id = Column(Integer, ForeignKey("issues.id"), nullable=False, index=True)
-    label_id = Column(Integer, ForeignKey("labels.id"), nullable=False, index=True)
+    issue_id = Column(Integer, ForeignKey("issues.id"), nullable=False)
+    label_id = Column(Integer, ForeignKey("labels.id"), nullable=False)
 
     # Relationships
     issue = relationship("Issue", back_populates="issue_labels")
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class RevokedToken(Base):
+    # Rows are only needed until the token would have expired anyway;
+    # app.core.revocation purges them after that
+    __tablename__ = "revoked_tokens"
+
+    id = Column(Integer, primary_key=True)  # Workers refresh incrementally by id and revoked_at
+    jti = Column(String(64), unique=True, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    revoked_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -3,5 +3,9 @@ from .comments import router as comments_router
 from .labels import router as labels_router
 from .reports import router as reports_router
 from .users import router as users_router
+from .admin import router as admin_router
 
-__all__ = ["issues_router", "comments_router", "labels_router", "reports_router", "users_router"]
+__all__ = [
+    "issues_router", "comments_router", "labels_router", "reports_router", "users_router",
+    "admin_router"
+]
@@ -0,0 +1,43 @@
+from typing import List
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
+from app.core.auth import get_current_admin_user
+from app.core.compression import skip_compression
+from app.models.user import User as UserModel
+from app.schemas import DatabasePoolStats, RequestProfile, SlowQueryReport
+from app.controllers import AdminController
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/db-pool", response_model=DatabasePoolStats)
+async def get_pool_stats(current_user: UserModel = Depends(get_current_admin_user)):
+    """Get live database connection pool statistics (requires admin)"""
+    return AdminController.get_pool_stats()
+
+
+@router.get("/slow-queries", response_model=SlowQueryReport)
+async def get_slow_queries(
+    limit: int = Query(100, ge=1),
+    current_user: UserModel = Depends(get_current_admin_user)
+):
+    """Get recent statements slower than SLOW_QUERY_MS, newest first (requires admin)"""
+    return AdminController.get_slow_queries(limit)
+
+
+@router.get("/profiles", response_model=List[RequestProfile])
+async def get_profiles(current_user: UserModel = Depends(get_current_admin_user)):
+    """List this worker's recent request profiles, newest first (requires admin)"""
+    return AdminController.get_profiles()
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+@skip_compression
+async def get_profile(
+    profile_id: str,
+    format: str = Query("text", pattern="^(text|pstats)$"),
+    sort: str = Query("cumulative", pattern="^(cumulative|tottime|calls)$"),
+    current_user: UserModel = Depends(get_current_admin_user)
+):
+    """Get a request profile as a pstats report, or a .pstats file for snakeviz (requires admin)"""
+    return AdminController.get_profile(profile_id, format, sort)
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from typing import Optional
+from fastapi import APIRouter, Depends, Request, status
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
-from app.core.auth import get_current_user
+from app.core.auth import get_current_user, optional_security
+from app.core.throttle import auth_throttle
 from app.controllers.auth import AuthController
 from app.schemas.auth import (
     UserLogin,
@@ -18,42 +21,54 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
 @router.post("/register", response_model=LoginResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserRegister, db: Session = Depends(get_db)):
+async def register(user_data: UserRegister, db: AsyncSession = Depends(get_db)):
     """Register a new user"""
-    return AuthController.register_user(user_data, db)
+    return await AuthController.register_user(user_data, db)
 
 
 @router.post("/login", response_model=LoginResponse)
-def login(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(
+    credentials: UserLogin,
+    http_request: Request,
+    db: AsyncSession = Depends(get_db)
+):
     """Login user and return access token"""
-    return AuthController.login_user(credentials, db)
+    await auth_throttle.check("login", http_request, credentials.email)
+    return await AuthController.login_user(credentials, db)
 
 
 @router.post("/forgot-password", response_model=PasswordResetResponse)
-def forgot_password(
+async def forgot_password(
     request: PasswordResetRequest,
-    db: Session = Depends(get_db)
+    http_request: Request,
+    db: AsyncSession = Depends(get_db)
 ):
     """Request password reset code"""
-    return AuthController.request_password_reset(request, db)
+    await auth_throttle.check("forgot-password", http_request, request.email)
+    return await AuthController.request_password_reset(request, db)
 
 
 @router.post("/reset-password")
-def reset_password(
+async def reset_password(
     reset_data: PasswordResetConfirm,
-    db: Session = Depends(get_db)
+    http_request: Request,
+    db: AsyncSession = Depends(get_db)
 ):
     """Reset password with code"""
-    return AuthController.reset_password(reset_data, db)
+    await auth_throttle.check("reset-password", http_request, reset_data.email)
+    return await AuthController.reset_password(reset_data, db)
 
 
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user: UserModel = Depends(get_current_user)):
+async def get_me(current_user: UserModel = Depends(get_current_user)):
     """Get current user information"""
     return AuthController.get_current_user_info(current_user)
 
 
 @router.post("/logout")
-def logout():
-    """Logout user (client should remove token)"""
-    return {"success": True, "message": "Logged out successfully"}
+async def logout(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    db: AsyncSession = Depends(get_db)
+):
+    """Logout user, revoking the presented token"""
+    return await AuthController.logout_user(credentials, db)
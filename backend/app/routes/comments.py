@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.core.auth import get_current_user
 from app.models.user import User as UserModel
@@ -10,13 +10,13 @@ router = APIRouter(tags=["comments"])
 
 
 @router.post("/issues/{issue_id}/comments", response_model=Comment, status_code=201)
-def add_comment(
+async def add_comment(
     issue_id: int,
     comment: CommentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user)
 ):
     """Add a comment to an issue (requires authentication)"""
     # Override author_id with current user
     comment.author_id = current_user.id
-    return CommentController.create_comment(issue_id, comment, db)
+    return await CommentController.create_comment(issue_id, comment, db)
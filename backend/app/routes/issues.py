@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, UploadFile, File
-from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
+from fastapi import APIRouter, Depends, UploadFile, File, Query
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncContextManager, Callable, List
+from app.core.database import get_db, get_read_db, get_read_session_factory
 from app.core.auth import get_current_user
+from app.core.responses import json_list_response
 from app.models.user import User as UserModel
 from app.schemas import (
     Issue, IssueCreate, IssueUpdate, IssueWithDetails,
@@ -14,61 +17,90 @@ from app.controllers import IssueController
 
 router = APIRouter(prefix="/issues", tags=["issues"])
 
+ISSUE_LIST = TypeAdapter(List[Issue])
+TIMELINE = TypeAdapter(List[TimelineEvent])
+
 
 @router.post("/", response_model=Issue, status_code=201)
-def create_issue(
+async def create_issue(
     issue: IssueCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user)
 ):
     """Create a new issue (requires authentication)"""
-    return IssueController.create_issue(issue, db)
+    return await IssueController.create_issue(issue, db)
 
 
 @router.get("/", response_model=List[Issue])
-def list_issues(
+async def list_issues(
     status: IssueStatus | None = None,
     assignee_id: int | None = None,
     creator_id: int | None = None,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List issues with optional filtering and pagination"""
-    return IssueController.get_issues(status, assignee_id, creator_id, skip, limit, db)
+    issues = await IssueController.get_issues(status, assignee_id, creator_id, skip, limit, db)
+    return json_list_response(ISSUE_LIST, issues)
+
+
+@router.get("/batch", response_model=List[Issue])
+async def get_issues_batch(
+    ids: List[int] = Query(...),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get several issues by id in one request"""
+    issues = await IssueController.get_issues_batch(ids, db)
+    return json_list_response(ISSUE_LIST, issues)
+
+
+@router.get("/export")
+async def export_issues(
+    status: IssueStatus | None = None,
+    assignee_id: int | None = None,
+    creator_id: int | None = None,
+    read_session: Callable[[], AsyncContextManager[AsyncSession]] = Depends(get_read_session_factory)
+):
+    """Stream issues as CSV, in the format accepted by the import"""
+    return StreamingResponse(
+        IssueController.export_issues_csv(status, assignee_id, creator_id, read_session),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="issues.csv"'}
+    )
 
 
 @router.get("/{issue_id}", response_model=IssueWithDetails)
-def get_issue(issue_id: int, db: Session = Depends(get_db)):
+async def get_issue(issue_id: int, db: AsyncSession = Depends(get_read_db)):
     """Get issue with comments and labels"""
-    return IssueController.get_issue_by_id(issue_id, db)
+    return await IssueController.get_issue_by_id(issue_id, db)
 
 
 @router.patch("/{issue_id}", response_model=Issue)
-def update_issue(
+async def update_issue(
     issue_id: int,
     issue_update: IssueUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user)
 ):
     """Update issue with optimistic concurrency control (requires authentication)"""
-    return IssueController.update_issue(issue_id, issue_update, current_user.id, db)
+    return await IssueController.update_issue(issue_id, issue_update, current_user.id, db)
 
 
 @router.post("/bulk-status", status_code=200)
-def bulk_status_update(
+async def bulk_status_update(
     bulk_update: IssueBulkStatusUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user)
 ):
     """Transactional bulk status update with rollback on error (requires authentication)"""
-    return IssueController.bulk_status_update(bulk_update, current_user.id, db)
+    return await IssueController.bulk_status_update(bulk_update, current_user.id, db)
 
 
 @router.post("/import", response_model=CSVImportResult)
 async def import_issues(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user)
 ):
     """Import issues from CSV file with validation (requires authentication)"""
@@ -76,16 +108,21 @@ async def import_issues(
 
 
 @router.get("/{issue_id}/timeline", response_model=List[TimelineEvent])
-def get_issue_timeline(issue_id: int, db: Session = Depends(get_db)):
-    """Get issue history timeline (Bonus feature)"""
-    return IssueController.get_issue_timeline(issue_id, db)
+async def get_issue_timeline(
+    issue_id: int,
+    include_archived: bool = False,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get issue history timeline (Bonus feature); archived months are read on demand"""
+    timeline = await IssueController.get_issue_timeline(issue_id, db, include_archived)
+    return json_list_response(TIMELINE, timeline)
 
 
 @router.delete("/{issue_id}")
-def delete_issue(
+async def delete_issue(
     issue_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user)
 ):
     """Delete an issue (only by creator) (requires authentication)"""
-    return IssueController.delete_issue(issue_id, current_user.id, db)
+    return await IssueController.delete_issue(issue_id, current_user.id, db)
@@ -1,20 +1,81 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.core.database import get_db
-from app.schemas import TopAssignee, LatencyReport
+from datetime import datetime
+from app.core.database import get_read_db
+from app.models import IssueStatus, IssuePriority
+from app.schemas import ReportFilter, TopAssignee, TopLabel, LatencyReport, CubeReport
 from app.controllers import ReportController
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
 
 @router.get("/top-assignees", response_model=List[TopAssignee])
-def get_top_assignees(limit: int = 10, db: Session = Depends(get_db)):
-    """Get top assignees by number of issues"""
-    return ReportController.get_top_assignees(limit, db)
+async def get_top_assignees(
+    limit: int = 10,
+    status: IssueStatus | None = None,
+    priority: IssuePriority | None = None,
+    label_id: int | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get top assignees by number of issues, optionally filtered"""
+    filters = ReportFilter(
+        status=status,
+        priority=priority,
+        label_id=label_id,
+        created_after=created_after,
+        created_before=created_before
+    )
+    return await ReportController.get_top_assignees(limit, db, filters)
+
+
+@router.get("/top-labels", response_model=List[TopLabel])
+async def get_top_labels(
+    limit: int = 10,
+    status: IssueStatus | None = None,
+    priority: IssuePriority | None = None,
+    label_id: int | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get top labels by number of issues, optionally filtered"""
+    filters = ReportFilter(
+        status=status,
+        priority=priority,
+        label_id=label_id,
+        created_after=created_after,
+        created_before=created_before
+    )
+    return await ReportController.get_top_labels(limit, db, filters)
 
 
 @router.get("/latency", response_model=LatencyReport)
-def get_average_resolution_time(db: Session = Depends(get_db)):
+async def get_average_resolution_time(db: AsyncSession = Depends(get_read_db)):
     """Get average resolution time for resolved issues"""
-    return ReportController.get_average_resolution_time(db)
+    return await ReportController.get_average_resolution_time(db)
+
+
+@router.get("/cube", response_model=CubeReport)
+async def get_report_cube(
+    dims: str = "status,priority",
+    status: IssueStatus | None = None,
+    priority: IssuePriority | None = None,
+    label_id: int | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get issue counts and mean resolution time grouped by every subset of
+    the comma-separated dimensions (status, priority, assignee, label)"""
+    filters = ReportFilter(
+        status=status,
+        priority=priority,
+        label_id=label_id,
+        created_after=created_after,
+        created_before=created_before
+    )
+    dimensions = [d.strip() for d in dims.split(",") if d.strip()]
+    return await ReportController.get_report_cube(dimensions, db, filters)
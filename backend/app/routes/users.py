@@ -1,27 +1,32 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.responses import json_list_response
 from app.schemas import UserCreate
 from app.schemas.user import User
 from app.controllers import UserController
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+USER_LIST = TypeAdapter(List[User])
+
 
 @router.post("/", response_model=User, status_code=201)
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
     """Create a new user"""
-    return UserController.create_user(user, db)
+    return await UserController.create_user(user, db)
 
 
 @router.get("/", response_model=List[User])
-def list_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def list_users(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_read_db)):
     """List all users"""
-    return UserController.get_users(skip, limit, db)
+    users = await UserController.get_users(skip, limit, db)
+    return json_list_response(USER_LIST, users)
 
 
 @router.get("/{user_id}", response_model=User)
-def get_user(user_id: int, db: Session = Depends(get_db)):
+async def get_user(user_id: int, db: AsyncSession = Depends(get_read_db)):
     """Get a specific user"""
-    return UserController.get_user_by_id(user_id, db)
+    return await UserController.get_user_by_id(user_id, db)
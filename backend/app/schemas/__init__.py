@@ -6,8 +6,12 @@ from .issue import (
 from .comment import Comment, CommentCreate, CommentInDB
 from .label import Label, LabelCreate, LabelInDB
 from .csv_import import CSVImportResult, CSVImportRow
-from .reports import TopAssignee, LatencyReport
+from .reports import ReportFilter, TopAssignee, TopLabel, LatencyReport, CubeCell, CubeReport
 from .timeline import TimelineEvent
+from .admin import (
+    HistogramBucket, HistogramSnapshot, PoolStats, DatabasePoolStats, SlowQuery, SlowQueryReport,
+    RequestProfile
+)
 
 __all__ = [
     "User", "UserCreate", "UserInDB",
@@ -16,6 +20,9 @@ __all__ = [
     "Comment", "CommentCreate", "CommentInDB",
     "Label", "LabelCreate", "LabelInDB",
     "CSVImportResult", "CSVImportRow",
-    "TopAssignee", "LatencyReport",
-    "TimelineEvent"
+    "ReportFilter", "TopAssignee", "TopLabel", "LatencyReport",
+    "CubeCell", "CubeReport",
+    "TimelineEvent",
+    "HistogramBucket", "HistogramSnapshot", "PoolStats", "DatabasePoolStats",
+    "SlowQuery", "SlowQueryReport", "RequestProfile"
 ]
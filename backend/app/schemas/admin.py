@@ -0,0 +1,57 @@
+from datetime import datetime
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class HistogramBucket(BaseModel):
+    le: Optional[float] = None  # None is the +Inf bucket
+    count: int
+
+
+class HistogramSnapshot(BaseModel):
+    buckets: List[HistogramBucket]
+    count: int
+    sum: float
+
+
+class PoolStats(BaseModel):
+    name: str
+    pool_class: str
+    size: Optional[int] = None
+    checked_in: Optional[int] = None
+    checked_out: Optional[int] = None
+    overflow: Optional[int] = None
+    waiters: Optional[int] = None
+    checkout_wait_ms: Optional[HistogramSnapshot] = None
+
+
+class DatabasePoolStats(BaseModel):
+    pools: List[PoolStats]
+
+
+class SlowQuery(BaseModel):
+    recorded_at: datetime
+    duration_ms: float
+    route: Optional[str] = None  # "GET /api/v1/issues/"; None outside a request
+    statement: str
+    parameters: str  # Types only, e.g. "(int, str*3)"
+    plan: Optional[str] = None
+    analyzed: bool = False
+
+
+class SlowQueryReport(BaseModel):
+    threshold_ms: float
+    queries: List[SlowQuery]
+
+
+class RequestProfile(BaseModel):
+    id: str
+    created_at: datetime
+    method: str
+    path: str
+    route: Optional[str] = None
+    status_code: int
+    user_id: int
+    duration_ms: float
+    profiled_ms: float  # Time in the request's own code on the event loop
+    function_calls: int
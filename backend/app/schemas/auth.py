@@ -22,6 +22,8 @@ class Token(BaseModel):
 class TokenData(BaseModel):
     user_id: Optional[int] = None
     username: Optional[str] = None
+    jti: Optional[str] = None  # Absent from tokens issued before revocation existed
+    exp: Optional[int] = None
 
 
 class PasswordResetRequest(BaseModel):
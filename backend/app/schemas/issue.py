@@ -32,6 +32,8 @@ class Issue(IssueBase):
     created_at: datetime
     updated_at: datetime
     resolved_at: Optional[datetime] = None
+    comment_count: int = 0
+    label_names: List[str] = []
 
     class Config:
         from_attributes = True
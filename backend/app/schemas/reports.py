@@ -1,4 +1,15 @@
 from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional, List
+from app.models.issue import IssueStatus, IssuePriority
+
+
+class ReportFilter(BaseModel):
+    status: Optional[IssueStatus] = None
+    priority: Optional[IssuePriority] = None
+    label_id: Optional[int] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
 
 
 class TopAssignee(BaseModel):
@@ -7,6 +18,27 @@ class TopAssignee(BaseModel):
     issue_count: int
 
 
+class TopLabel(BaseModel):
+    label_id: int
+    label_name: str
+    issue_count: int
+
+
 class LatencyReport(BaseModel):
     average_resolution_time_hours: float
     total_resolved_issues: int
+
+
+class CubeCell(BaseModel):
+    grouped_by: List[str]
+    status: Optional[IssueStatus] = None
+    priority: Optional[IssuePriority] = None
+    assignee_id: Optional[int] = None
+    label_id: Optional[int] = None
+    issue_count: int
+    average_resolution_time_hours: Optional[float] = None
+
+
+class CubeReport(BaseModel):
+    dims: List[str]
+    cells: List[CubeCell]
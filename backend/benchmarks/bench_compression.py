@@ -0,0 +1,74 @@
+"""
+Benchmark: CPU cost versus bytes saved for gzip levels and Brotli qualities,
+on payloads shaped like the API's large responses.
+
+Usage (from backend/):
+    python -m benchmarks.bench_compression [--page-size 100] [--iterations 50]
+"""
+import argparse
+import time
+import zlib
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app.core.compression import brotli
+from app.core.responses import dump_json
+from app.schemas import CSVImportResult, Issue as IssueSchema, TimelineEvent
+from benchmarks.bench_json import make_issues, make_timeline
+
+GZIP_LEVELS = (1, 4, 6, 9)
+BROTLI_QUALITIES = (1, 4, 6, 9, 11)
+
+
+def payloads(page_size: int) -> dict:
+    import_result = CSVImportResult(
+        total_rows=page_size,
+        successful=page_size // 2,
+        failed=page_size - page_size // 2,
+        results=[
+            {"row_number": i, "success": i % 2 == 0, "issue_id": i if i % 2 == 0 else None,
+             "errors": [] if i % 2 == 0 else ["Creator with ID 42 not found"]}
+            for i in range(page_size)
+        ],
+    )
+    return {
+        "list_issues": dump_json(TypeAdapter(List[IssueSchema]), make_issues(page_size)),
+        "timeline": dump_json(TypeAdapter(List[TimelineEvent]), make_timeline(page_size)),
+        "csv_import": import_result.model_dump_json().encode(),
+    }
+
+
+def measure(compress, body: bytes, iterations: int) -> tuple:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        output = compress(body)
+    return (time.perf_counter() - start) / iterations * 1000, len(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    codecs = [(f"gzip-{level}", lambda body, level=level: zlib.compress(body, level, wbits=31))
+              for level in GZIP_LEVELS]
+    if brotli is not None:
+        codecs += [(f"br-{quality}", lambda body, quality=quality: brotli.compress(body, quality=quality))
+                   for quality in BROTLI_QUALITIES]
+    else:
+        print("Brotli is not installed; only gzip is measured")
+
+    for name, body in payloads(args.page_size).items():
+        print(f"\n{name}: {len(body):,} bytes")
+        print(f"  {'codec':<8} {'ms':>8} {'bytes':>10} {'ratio':>7} {'MB/s':>8} {'KB saved/ms':>12}")
+        for codec, compress in codecs:
+            ms, size = measure(compress, body, args.iterations)
+            saved_kb_per_ms = (len(body) - size) / 1024 / ms
+            print(f"  {codec:<8} {ms:8.3f} {size:10,} {len(body) / size:7.1f} "
+                  f"{len(body) / 1e6 / (ms / 1000):8.1f} {saved_kb_per_ms:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: loading issues as ORM instances (the old select(Issue) + .all()
+path) versus plain row mappings from the Core table (ISSUE_ROWS), with and
+without serialization, measuring time and peak memory.
+
+Usage (from backend/):
+    python -m benchmarks.bench_core_rows [--rows 10000] [--repeat 5]
+"""
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.core.responses import dump_json
+from app.core.statements import ISSUE_ROWS
+from app.models import Issue, User
+from app.schemas import Issue as IssueSchema
+
+ISSUE_LIST = TypeAdapter(List[IssueSchema])
+
+
+def seed(engine, rows: int) -> None:
+    with engine.begin() as connection:
+        connection.execute(User.__table__.insert().values(
+            id=1, username="bench", email="bench@example.com", hashed_password="x"
+        ))
+        connection.execute(Issue.__table__.insert(), [
+            {"title": f"Issue {i}", "description": "Steps to reproduce " * 10,
+             "creator_id": 1, "assignee_id": 1, "label_names": ["bug", "backend"]}
+            for i in range(rows)
+        ])
+
+
+def orm_rows(engine):
+    with Session(engine) as session:
+        return session.execute(select(Issue)).scalars().all()
+
+
+def core_rows(engine):
+    with engine.connect() as connection:
+        return connection.execute(ISSUE_ROWS).mappings().all()
+
+
+def measure(func, repeat: int) -> tuple:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return best * 1000, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    seed(engine, args.rows)
+
+    print(f"{args.rows:,} issues")
+    print(f"  {'path':<26} {'ms':>9} {'rows/s':>11} {'peak MiB':>9}")
+    for name, func in (
+        ("ORM select(Issue).all()", lambda: orm_rows(engine)),
+        ("Core row mappings", lambda: core_rows(engine)),
+        ("ORM + serialize", lambda: dump_json(ISSUE_LIST, orm_rows(engine))),
+        ("Core + serialize", lambda: dump_json(ISSUE_LIST, core_rows(engine))),
+    ):
+        ms, peak = measure(func, args.repeat)
+        print(f"  {name:<26} {ms:9.1f} {args.rows / (ms / 1000):11,.0f} {peak:9.1f}")
+
+    engine.dispose()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+Benchmark suite: times the hot API endpoints through the ASGI app against a
+seeded dataset and writes the results as JSON.
+
+Generates --issues issues, with users, labels, comments and history (see
+app/core/synthetic_data.py), into a fresh SQLite file, or into the empty database
+given by --database-url, after running the migrations. The app is then driven
+in-process through httpx, so timings cover middleware, routing, validation,
+SQL and serialization, but no network.
+
+With --baseline, any endpoint whose median is more than --threshold slower
+than in the baseline file is reported, and the exit status is 1.
+
+Usage (from backend/):
+    python -m benchmarks.bench_endpoints [--issues 10000] [--iterations 30]
+        [--only list_issues,get_issue] [--output results.json]
+        [--baseline baseline.json] [--threshold 0.2]
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List
+
+API = "/api/v1"
+
+
+def summarize(samples_ms: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples_ms)
+    return {
+        "iterations": len(ordered),
+        "min_ms": round(ordered[0], 3),
+        "p50_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Endpoints whose median regressed by more than threshold (0.2 = 20%)"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        ratio = current["p50_ms"] / previous["p50_ms"] if previous["p50_ms"] else 1.0
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{name}: p50 {previous['p50_ms']:.2f} -> {current['p50_ms']:.2f} ms ({ratio - 1:+.0%})"
+            )
+    return regressions
+
+
+def build_cases(
+    issues: int,
+    user_count: int,
+    rng: random.Random,
+    versions: Dict[int, int]
+) -> Dict[str, Callable]:
+    """Request makers per benchmark case; each returns an awaitable response"""
+    # Writes use each issue in versions once, so its version is still the one loaded
+    fresh_ids = list(versions)
+
+    def random_id() -> int:
+        return rng.randint(1, issues)
+
+    def csv_upload():
+        rows = ["title,description,status,priority,creator_id,assignee_id"]
+        rows += [
+            f"Imported {rng.randrange(10**9)},From the benchmark,open,medium,1,{rng.randint(1, user_count)}"
+            for _ in range(100)
+        ]
+        return {"file": ("issues.csv", io.BytesIO("\n".join(rows).encode()), "text/csv")}
+
+    def update_issue(client):
+        issue_id = fresh_ids.pop()
+        return client.patch(
+            f"{API}/issues/{issue_id}",
+            json={"priority": rng.choice(["low", "high"]), "version": versions[issue_id]},
+        )
+
+    statuses = ["in_progress", "resolved", "closed", "open"]
+    return {
+        "list_issues": lambda c: c.get(
+            f"{API}/issues/", params={"skip": rng.randrange(max(issues - 100, 1)), "limit": 100}
+        ),
+        "list_issues_by_status": lambda c: c.get(f"{API}/issues/", params={"status": "open", "limit": 100}),
+        "get_issue": lambda c: c.get(f"{API}/issues/{random_id()}"),
+        "issue_timeline": lambda c: c.get(f"{API}/issues/{random_id()}/timeline"),
+        "issues_batch": lambda c: c.get(
+            f"{API}/issues/batch", params={"ids": [random_id() for _ in range(50)]}
+        ),
+        "update_issue": update_issue,
+        "bulk_status_update": lambda c: c.post(
+            f"{API}/issues/bulk-status",
+            json={"issue_ids": [fresh_ids.pop() for _ in range(50)], "status": rng.choice(statuses)},
+        ),
+        "csv_import_100_rows": lambda c: c.post(f"{API}/issues/import", files=csv_upload()),
+        "report_top_assignees": lambda c: c.get(f"{API}/reports/top-assignees"),
+        "report_top_labels": lambda c: c.get(f"{API}/reports/top-labels"),
+        "report_latency": lambda c: c.get(f"{API}/reports/latency"),
+        "report_cube": lambda c: c.get(f"{API}/reports/cube", params={"dims": "status,priority"}),
+    }
+
+
+async def run_case(
+    client,
+    make_request: Callable[..., Awaitable],
+    iterations: int,
+    warmup: int
+) -> List[float]:
+    samples = []
+    for i in range(warmup + iterations):
+        start = time.perf_counter()
+        response = await make_request(client)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if response.status_code >= 400:
+            raise RuntimeError(f"{response.request.method} {response.request.url} -> "
+                               f"{response.status_code}: {response.text[:200]}")
+        if i >= warmup:
+            samples.append(elapsed_ms)
+    return samples
+
+
+async def load_versions(issue_ids: List[int]) -> Dict[int, int]:
+    from sqlalchemy import select
+
+    from app.core.database import AsyncSessionLocal
+    from app.models import Issue
+
+    versions = {}
+    async with AsyncSessionLocal() as db:
+        for start in range(0, len(issue_ids), 500):
+            result = await db.execute(
+                select(Issue.id, Issue.version).where(Issue.id.in_(issue_ids[start:start + 500]))
+            )
+            versions.update(result.tuples().all())
+    # Keep the random order
+    return {issue_id: versions[issue_id] for issue_id in issue_ids}
+
+
+# Issues each write benchmark consumes per request; each request needs unmodified ones
+WRITES = {"update_issue": 1, "bulk_status_update": 50}
+
+
+def write_budget(args) -> int:
+    """Issues the selected write benchmarks modify over the whole run"""
+    selected = args.only.split(",") if args.only else None
+    return sum(
+        count for name, count in WRITES.items() if selected is None or name in selected
+    ) * (args.iterations + args.warmup)
+
+
+async def run_suite(args, counts: Dict[str, int]) -> Dict[str, Dict]:
+    import httpx
+
+    from app.core.auth import create_access_token
+    from app.core.database import async_engine
+    from app.main import app
+
+    token = create_access_token({"sub": "1", "username": "user1"})
+    rng = random.Random(args.seed)
+    selected = args.only.split(",") if args.only else None
+    versions = await load_versions(rng.sample(range(1, counts["issues"] + 1), write_budget(args)))
+    cases = build_cases(counts["issues"], counts["users"], rng, versions)
+    selected = selected or list(cases)
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://bench",
+        headers={"Authorization": f"Bearer {token}"},
+    ) as client:
+        for name in selected:
+            samples = await run_case(client, cases[name], args.iterations, args.warmup)
+            results[name] = summarize(samples)
+            line = results[name]
+            print(f"{name:<24} p50 {line['p50_ms']:9.2f} ms   p95 {line['p95_ms']:9.2f} ms")
+    await async_engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--issues", type=int, default=10000)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--database-url", help="Empty database to seed (default: a temporary SQLite file)")
+    parser.add_argument("--only", help="Comma-separated case names to run")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed p50 slowdown (0.2 = 20%%)")
+    args = parser.parse_args()
+    # Checked before seeding, which takes a while on large datasets
+    budget = write_budget(args)
+    if budget > args.issues:
+        parser.error(f"--issues must be at least {budget} for the write benchmarks")
+
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    # The app reads its settings at import, so configure the environment first
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["AUTH_THROTTLE_ENABLED"] = "false"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("QUERY_COUNT_WARNING", "0")
+
+    from app.core.database import engine
+    from app.init_db import init_db
+    from app.core.synthetic_data import generate_dataset
+
+    init_db()
+    started = time.perf_counter()
+    counts = generate_dataset(engine, users=max(10, args.issues // 100), issues=args.issues, seed=args.seed)
+    print(f"Generated {counts} in {time.perf_counter() - started:.1f} s ({engine.dialect.name})")
+    engine.dispose()
+
+    results = asyncio.run(run_suite(args, counts))
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "dataset": {"database": engine.dialect.name, "seed": args.seed, **counts},
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("dataset", {}).get("issues") != counts["issues"]:
+            print("Warning: the baseline was recorded with a different dataset size")
+        regressions = compare(results, baseline["results"], args.threshold)
+        if regressions:
+            print(f"Regressions beyond {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark: FastAPI's default response serialization versus the fast path
+in app.core.responses, for a page of issues and an issue timeline.
+
+The fast path is timed from ORM objects, as the routes pass them today, and
+from row mappings. For reference it also times orjson over pydantic's
+JSON-mode dump, which is what the fast path would cost with orjson as the
+encoder. Every variant is checked to be byte-identical before timing.
+
+Usage (from backend/):
+    python -m benchmarks.bench_json [--page-size 100] [--iterations 2000]
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import TypeAdapter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from app.core.responses import dump_json
+from app.models import Issue, IssueHistory, User
+from app.schemas import Issue as IssueSchema, TimelineEvent
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def make_issues(count: int) -> List[Issue]:
+    return [
+        Issue(
+            id=i, title=f"Issue {i}: something is broken", description="Steps to reproduce " * 10,
+            status="open", priority="medium", version=1, creator_id=1, assignee_id=2,
+            created_at=NOW + timedelta(minutes=i), updated_at=NOW + timedelta(minutes=i),
+            resolved_at=None, comment_count=i % 7, label_names=["bug", "backend"]
+        )
+        for i in range(count)
+    ]
+
+
+def make_timeline(count: int) -> List[IssueHistory]:
+    author = User(id=1, username="reporter")
+    return [
+        IssueHistory(
+            id=i, issue_id=1, changed_by_id=1, field_name="status", old_value="open",
+            new_value="in_progress", changed_at=NOW + timedelta(minutes=i), changed_by=author
+        )
+        for i in range(count)
+    ]
+
+
+def row_mapping(item) -> dict:
+    """Plain dict of the loaded attributes, as a Core query would return"""
+    row = {key: value for key, value in vars(item).items() if not key.startswith("_")}
+    if "changed_by" in row:
+        row["changed_by"] = row_mapping(row["changed_by"])
+    return row
+
+
+def default_path(model, content):
+    field = create_response_field(name="Response", type_=model)
+
+    async def render():
+        return JSONResponse(await serialize_response(field=field, response_content=content)).body
+    return render
+
+
+def timed(label: str, func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    per_call_us = (time.perf_counter() - start) / iterations * 1_000_000
+    print(f"{label:<24} {per_call_us:10.1f} us/response")
+    return per_call_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    for name, model, content in (
+        ("list_issues", List[IssueSchema], make_issues(args.page_size)),
+        ("timeline", List[TimelineEvent], make_timeline(args.page_size)),
+    ):
+        render = default_path(model, content)
+        adapter = TypeAdapter(model)
+        mappings = [row_mapping(item) for item in content]
+        expected = loop.run_until_complete(render())
+        assert dump_json(adapter, content) == expected, "outputs differ"
+        assert dump_json(adapter, mappings) == expected, "outputs differ"
+
+        print(f"{name} ({args.page_size} items)")
+        before = timed("  FastAPI + json", lambda: loop.run_until_complete(render()), args.iterations)
+        after = timed("  fast path, ORM objects", lambda: dump_json(adapter, content), args.iterations)
+        rows = timed("  fast path, mappings", lambda: dump_json(adapter, mappings), args.iterations)
+        if orjson is not None:
+            def with_orjson():
+                value = adapter.validate_python(content, from_attributes=True)
+                return orjson.dumps(adapter.dump_python(value, mode="json"))
+            assert with_orjson() == expected, "outputs differ"
+            timed("  orjson, ORM objects", with_orjson, args.iterations)
+        print(f"  speedup {before / after:.2f}x (objects), {before / rows:.2f}x (mappings)")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Micro-benchmark: per-call Python overhead of building statements inline
+versus executing the prebuilt statements in app.core.statements.
+
+Runs the get_issue_by_id lookups (issue, comments with authors, labels)
+against an in-memory SQLite database, so the numbers are dominated by
+Python-side statement construction, cache key generation and ORM work.
+
+Usage (from backend/):
+    python -m benchmarks.bench_statements [--iterations 5000]
+"""
+import argparse
+import time
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.database import Base
+from app.core.statements import ISSUE_BY_ID, ISSUE_COMMENTS, ISSUE_LABELS, USER_BY_ID
+from app.models import Comment, Issue, IssueLabel, Label, User
+
+
+def seed(session: Session) -> int:
+    user = User(email="bench@example.com", username="bench", hashed_password="x")
+    session.add(user)
+    session.flush()
+    issue = Issue(title="Benchmark issue", creator_id=user.id)
+    session.add(issue)
+    session.flush()
+    label = Label(name="bench")
+    session.add(label)
+    session.flush()
+    session.add(IssueLabel(issue_id=issue.id, label_id=label.id))
+    session.add_all(Comment(body=f"comment {i}", issue_id=issue.id, author_id=user.id) for i in range(5))
+    session.commit()
+    return issue.id
+
+
+def inline(session: Session, issue_id: int, user_id: int) -> None:
+    session.execute(select(User).where(User.id == user_id)).scalars().first()
+    session.execute(select(Issue).where(Issue.id == issue_id)).scalars().first()
+    session.execute(select(Comment).options(
+        selectinload(Comment.author)
+    ).where(Comment.issue_id == issue_id)).scalars().all()
+    session.execute(select(Label).join(IssueLabel).where(
+        IssueLabel.issue_id == issue_id
+    )).scalars().all()
+
+
+def prebuilt(session: Session, issue_id: int, user_id: int) -> None:
+    session.execute(USER_BY_ID, {"user_id": user_id}).scalars().first()
+    params = {"issue_id": issue_id}
+    session.execute(ISSUE_BY_ID, params).scalars().first()
+    session.execute(ISSUE_COMMENTS, params).scalars().all()
+    session.execute(ISSUE_LABELS, params).scalars().all()
+
+
+def build_only(issue_id: int, user_id: int) -> None:
+    """Statement construction and cache key generation, without executing"""
+    for statement in (
+        select(User).where(User.id == user_id),
+        select(Issue).where(Issue.id == issue_id),
+        select(Comment).options(selectinload(Comment.author)).where(Comment.issue_id == issue_id),
+        select(Label).join(IssueLabel).where(IssueLabel.issue_id == issue_id),
+    ):
+        statement._generate_cache_key()
+
+
+def timed(label: str, func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    per_call_us = (time.perf_counter() - start) / iterations * 1_000_000
+    print(f"{label:<28} {per_call_us:10.1f} us/request")
+    return per_call_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        issue_id = seed(session)
+        user_id = session.execute(select(User.id)).scalar()
+
+        # Warm the compiled cache for both variants
+        for _ in range(100):
+            inline(session, issue_id, user_id)
+            prebuilt(session, issue_id, user_id)
+            session.expunge_all()
+
+        def run(func):
+            def call():
+                func(session, issue_id, user_id)
+                session.expunge_all()
+            return call
+
+        build = timed("statement build + cache key", lambda: build_only(issue_id, user_id), args.iterations)
+        before = timed("inline statements", run(inline), args.iterations)
+        after = timed("prebuilt statements", run(prebuilt), args.iterations)
+
+    print(f"saved {before - after:.1f} us/request ({(before - after) / before:.0%}); "
+          f"construction alone costs {build:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
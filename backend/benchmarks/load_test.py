@@ -0,0 +1,399 @@
+"""
+Load test: concurrent, mixed traffic against a real server, with latency
+percentiles and throughput per endpoint.
+
+Unlike bench_endpoints, requests go over HTTP to uvicorn workers, so the
+numbers include the network stack, worker scheduling, connection pool
+contention and lock waits between concurrent writers.
+
+The generator is closed-loop: each of --concurrency virtual users logs in,
+then repeatedly picks a scenario from the mix, sends its requests and waits
+for the responses (plus --think-ms) before picking the next one. Throughput
+is therefore what the server sustains at that concurrency, and latency is
+not inflated by a queue building up in the client.
+
+Scenarios:
+- login: POST /auth/login for a random generated user (a full bcrypt check)
+- list_issues: GET /issues/ polling a random page, half of the time filtered by status
+- get_issue, timeline: GET one issue, or its timeline
+- update_issue: GET then PATCH one of the --hot-issues first issues with the version
+  just read; concurrent users editing the same issue get 409, counted as conflicts
+- bulk_update: POST /issues/bulk-status for 20 random issues
+- import: POST /issues/import with a 50-row CSV
+
+By default a dataset of --issues issues is generated (app/core/synthetic_data.py)
+into a temporary SQLite file, or into --database-url (an already seeded
+database is reused), and serve.py is started on a free port with
+--workers workers and login throttling off. With --url the test runs against
+a server you started, which must have been seeded with generate_data.py
+(--users, --issues and --password must match) and run with
+AUTH_THROTTLE_ENABLED=false, or logins from this one address get 429.
+
+Usage (from backend/):
+    python -m benchmarks.load_test [--issues 10000] [--database-url URL] [--workers 2]
+        [--concurrency 20] [--duration 30] [--warmup 5]
+        [--mix read-heavy|write-heavy|login|list_issues=60,update_issue=40]
+        [--output results.json]
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --users 200 --issues 10000
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+API = "/api/v1"
+MIXES = {
+    "read-heavy": {"list_issues": 40, "get_issue": 30, "timeline": 10, "update_issue": 10,
+                   "login": 5, "bulk_update": 3, "import": 2},
+    "write-heavy": {"list_issues": 20, "get_issue": 10, "update_issue": 40, "bulk_update": 15,
+                    "import": 10, "login": 5},
+    "login": {"login": 80, "get_issue": 20},
+}
+STATUSES = ["open", "in_progress", "resolved", "closed"]
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+class Recorder:
+    """Latencies and outcomes per endpoint, collected once the warmup is over"""
+
+    def __init__(self):
+        self.recording = False
+        self.samples: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.conflicts: Dict[str, int] = {}
+        self.error_examples: Dict[str, str] = {}
+
+    def record(self, name: str, seconds: float, outcome: str, detail: str = "") -> None:
+        if not self.recording:
+            return
+        self.samples.setdefault(name, []).append(seconds * 1000)
+        if outcome == "conflict":
+            self.conflicts[name] = self.conflicts.get(name, 0) + 1
+        elif outcome == "error":
+            self.errors[name] = self.errors.get(name, 0) + 1
+            self.error_examples.setdefault(name, detail)
+
+    def report(self, elapsed: float) -> Dict[str, Dict]:
+        results = {}
+        for name, samples in sorted(self.samples.items()):
+            ordered = sorted(samples)
+            results[name] = {
+                "requests": len(ordered),
+                "errors": self.errors.get(name, 0),
+                "conflicts": self.conflicts.get(name, 0),
+                "rps": round(len(ordered) / elapsed, 2),
+                "p50_ms": round(percentile(ordered, 0.50), 2),
+                "p90_ms": round(percentile(ordered, 0.90), 2),
+                "p99_ms": round(percentile(ordered, 0.99), 2),
+                "max_ms": round(ordered[-1], 2),
+                "mean_ms": round(sum(ordered) / len(ordered), 2),
+            }
+        return results
+
+
+class VirtualUser:
+    """One simulated client: its own token and random stream, the shared connection pool"""
+
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, rng: random.Random, args):
+        self.client = client
+        self.recorder = recorder
+        self.rng = rng
+        self.args = args
+        self.headers: Dict[str, str] = {}
+
+    async def request(self, name: str, method: str, url: str, expected=(), **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=self.headers, **kwargs)
+        except httpx.HTTPError as e:
+            self.recorder.record(name, time.perf_counter() - started, "error", f"{type(e).__name__}: {e}")
+            return None
+        elapsed = time.perf_counter() - started
+        if response.status_code in expected:
+            self.recorder.record(name, elapsed, "conflict")
+        elif response.status_code >= 400:
+            self.recorder.record(name, elapsed, "error", f"{response.status_code}: {response.text[:200]}")
+        else:
+            self.recorder.record(name, elapsed, "ok")
+        return response
+
+    def random_issue(self) -> int:
+        return self.rng.randint(1, self.args.issues)
+
+    async def login(self, name: str = "login") -> Optional[httpx.Response]:
+        user_id = self.rng.randint(1, self.args.users)
+        return await self.request(
+            name, "POST", f"{API}/auth/login",
+            json={"email": f"user{user_id}@example.com", "password": self.args.password},
+        )
+
+    async def sign_in(self) -> None:
+        response = await self.login("initial_login")
+        if response is None or response.status_code != 200:
+            detail = response.text[:200] if response is not None else "no response"
+            raise RuntimeError(f"Virtual user could not log in: {detail}")
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def list_issues(self) -> None:
+        params = {"skip": self.rng.randrange(max(self.args.issues - 50, 1)), "limit": 50}
+        if self.rng.random() < 0.5:
+            params = {"status": self.rng.choice(STATUSES), "limit": 50}
+        await self.request("list_issues", "GET", f"{API}/issues/", params=params)
+
+    async def get_issue(self) -> None:
+        await self.request("get_issue", "GET", f"{API}/issues/{self.random_issue()}")
+
+    async def timeline(self) -> None:
+        await self.request("timeline", "GET", f"{API}/issues/{self.random_issue()}/timeline")
+
+    async def update_issue(self) -> None:
+        issue_id = self.rng.randint(1, min(self.args.hot_issues, self.args.issues))
+        response = await self.request("get_issue", "GET", f"{API}/issues/{issue_id}")
+        if response is None or response.status_code != 200:
+            return
+        await self.request(
+            "update_issue", "PATCH", f"{API}/issues/{issue_id}", expected=(409,),
+            json={"priority": self.rng.choice(["low", "medium", "high"]), "version": response.json()["version"]},
+        )
+
+    async def bulk_update(self) -> None:
+        issue_ids = self.rng.sample(range(1, self.args.issues + 1), min(20, self.args.issues))
+        await self.request(
+            "bulk_update", "POST", f"{API}/issues/bulk-status",
+            json={"issue_ids": issue_ids, "status": self.rng.choice(STATUSES)},
+        )
+
+    async def import_issues(self) -> None:
+        rows = ["title,description,status,priority,creator_id,assignee_id"]
+        rows += [
+            f"Load test {self.rng.randrange(10**9)},Imported under load,open,medium,"
+            f"{self.rng.randint(1, self.args.users)},{self.rng.randint(1, self.args.users)}"
+            for _ in range(50)
+        ]
+        await self.request(
+            "import", "POST", f"{API}/issues/import",
+            files={"file": ("issues.csv", "\n".join(rows).encode(), "text/csv")},
+        )
+
+    def scenarios(self) -> Dict[str, Callable]:
+        return {
+            "login": self.login,
+            "list_issues": self.list_issues,
+            "get_issue": self.get_issue,
+            "timeline": self.timeline,
+            "update_issue": self.update_issue,
+            "bulk_update": self.bulk_update,
+            "import": self.import_issues,
+        }
+
+    async def run(self, mix: Dict[str, int], deadline: float) -> None:
+        scenarios = self.scenarios()
+        names = list(mix)
+        cum_weights = list(itertools.accumulate(mix.values()))
+        while time.perf_counter() < deadline:
+            name = self.rng.choices(names, cum_weights=cum_weights)[0]
+            await scenarios[name]()
+            if self.args.think_ms:
+                await asyncio.sleep(self.rng.expovariate(1000 / self.args.think_ms))
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    if value in MIXES:
+        return MIXES[value]
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+
+async def run_load(base_url: str, args, mix: Dict[str, int]) -> Dict:
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        users = [
+            VirtualUser(client, recorder, random.Random(f"{args.seed}-{n}"), args)
+            for n in range(args.concurrency)
+        ]
+        await asyncio.gather(*(user.sign_in() for user in users))
+
+        started = time.perf_counter()
+        deadline = started + args.warmup + args.duration
+        tasks = [asyncio.create_task(user.run(mix, deadline)) for user in users]
+        await asyncio.sleep(args.warmup)
+        recorder.recording = True
+        measured_from = time.perf_counter()
+        await asyncio.gather(*tasks)
+        # The last requests finish a little after the deadline
+        elapsed = time.perf_counter() - measured_from
+
+    results = recorder.report(elapsed)
+    total = sum(line["requests"] for line in results.values())
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "requests": total,
+        "rps": round(total / elapsed, 2),
+        "results": results,
+        "error_examples": recorder.error_examples,
+    }
+
+
+def print_report(report: Dict) -> None:
+    print(f"\n{'endpoint':<14}{'requests':>9}{'rps':>9}{'p50 ms':>9}{'p90 ms':>9}"
+          f"{'p99 ms':>9}{'max ms':>9}{'errors':>8}{'409s':>7}")
+    for name, line in report["results"].items():
+        print(f"{name:<14}{line['requests']:>9}{line['rps']:>9.1f}{line['p50_ms']:>9.1f}{line['p90_ms']:>9.1f}"
+              f"{line['p99_ms']:>9.1f}{line['max_ms']:>9.1f}{line['errors']:>8}{line['conflicts']:>7}")
+    print(f"\n{report['requests']} requests in {report['elapsed_s']} s: {report['rps']} requests/s")
+    for name, example in report["error_examples"].items():
+        print(f"  first {name} error: {example}")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def prepare_database(database_url: str, args) -> None:
+    """Seed the database unless it already has issues; sets args.users and args.issues"""
+    from sqlalchemy import func, select
+
+    from app.core.auth import get_password_hash
+    from app.core.database import build_engine
+    from app.core.synthetic_data import generate_dataset
+    from app.init_db import init_db
+    from app.models import Issue, User
+
+    init_db(database_url)
+    engine = build_engine(database_url)
+    try:
+        with engine.connect() as connection:
+            issues = connection.execute(select(func.max(Issue.id))).scalar()
+            users = connection.execute(select(func.max(User.id))).scalar()
+        if issues:
+            print(f"Reusing the existing {issues} issues and {users} users")
+            args.issues, args.users = issues, users
+            return
+        started = time.perf_counter()
+        counts = generate_dataset(
+            engine, users=args.users, issues=args.issues, seed=args.seed,
+            password_hash=get_password_hash(args.password),
+        )
+        print(f"Generated {counts} in {time.perf_counter() - started:.1f} s ({engine.dialect.name})")
+    finally:
+        engine.dispose()
+
+
+def start_server(database_url: str, args) -> Tuple[subprocess.Popen, str]:
+    port = free_port()
+    env = dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        AUTH_THROTTLE_ENABLED="false",
+        LOG_LEVEL=os.environ.get("LOG_LEVEL", "WARNING"),
+        QUERY_COUNT_WARNING=os.environ.get("QUERY_COUNT_WARNING", "0"),
+    )
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    # The access log would drown the report
+    log_path = os.path.join(tempfile.mkdtemp(), "server.log")
+    with open(log_path, "w") as log:
+        server = subprocess.Popen(
+            [sys.executable, "serve.py", "--host", "127.0.0.1", "--port", str(port),
+             "--workers", str(args.workers), "--no-migrate"],
+            cwd=backend_dir, env=env, stdout=log, stderr=subprocess.STDOUT,
+        )
+    print(f"Server log: {log_path}")
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f"The server exited with status {server.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return server, base_url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise SystemExit("The server did not become healthy within 60 s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="Test this running server instead of starting one")
+    parser.add_argument("--database-url", help="Database for the started server (default: a temporary SQLite file)")
+    parser.add_argument("--workers", type=int, default=1, help="Workers of the started server")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--issues", type=int, default=10000)
+    parser.add_argument("--password", default="password123", help="Password of the generated users")
+    parser.add_argument("--concurrency", type=int, default=20, help="Virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="Seconds of load before measuring")
+    parser.add_argument("--think-ms", type=float, default=0, help="Mean pause between a user's scenarios")
+    parser.add_argument("--hot-issues", type=int, default=20, help="Issues that update_issue edits")
+    parser.add_argument("--mix", type=parse_mix, default="read-heavy",
+                        help=f"One of {', '.join(MIXES)}, or name=weight,... of: {', '.join(MIXES['read-heavy'])}")
+    parser.add_argument("--timeout", type=float, default=30, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    unknown = set(args.mix) - set(MIXES["read-heavy"])
+    if unknown:
+        parser.error(f"unknown scenarios in --mix: {', '.join(sorted(unknown))}")
+
+    server = None
+    database = "external"
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'load.db')}"
+        database = database_url.split(":", 1)[0]
+        prepare_database(database_url, args)
+        server, base_url = start_server(database_url, args)
+
+    print(f"{args.concurrency} virtual users for {args.warmup:g} + {args.duration:g} s against {base_url}, "
+          f"mix {args.mix}")
+    try:
+        report = asyncio.run(run_load(base_url, args, args.mix))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=60)
+    print_report(report)
+
+    if args.output:
+        report = {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "setup": {
+                "database": database, "workers": None if args.url else args.workers,
+                "users": args.users, "issues": args.issues, "concurrency": args.concurrency,
+                "think_ms": args.think_ms, "hot_issues": args.hot_issues, "mix": args.mix,
+            },
+            "environment": {"python": platform.python_version(), "platform": platform.platform()},
+            **report,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
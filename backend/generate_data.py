@@ -0,0 +1,71 @@
+"""
+Generate a large, realistic dataset for local testing and benchmarking
+Users, labels, issues with history trails, comments and label assignments
+are bulk-inserted with batched Core statements; see app/core/synthetic_data.py.
+Every user can log in with --password. The target database must be empty.
+"""
+import argparse
+import time
+from datetime import datetime, timezone
+
+from app.core.auth import get_password_hash
+from app.core.config import settings
+from app.core.database import build_engine
+from app.core.synthetic_data import generate_dataset
+from app.init_db import init_db
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--issues", type=int, default=10000)
+    parser.add_argument("--labels", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0, help="Same seed and --until, same data")
+    parser.add_argument("--days", type=int, default=730, help="How far back issues were filed")
+    parser.add_argument(
+        "--until", type=datetime.fromisoformat,
+        help="Date of the newest activity, e.g. 2026-01-31 (default: today)"
+    )
+    parser.add_argument("--password", default="password123", help="Password of every generated user")
+    parser.add_argument("--batch-size", type=int, default=2000, help="Issues per insert transaction")
+    parser.add_argument(
+        "--migrate", action=argparse.BooleanOptionalAction, default=True,
+        help="Apply schema migrations first"
+    )
+    args = parser.parse_args()
+
+    if args.migrate:
+        init_db(args.database_url)
+
+    until = args.until
+    if until is not None and until.tzinfo is None:
+        until = until.replace(tzinfo=timezone.utc)
+
+    engine = build_engine(args.database_url)
+    started = time.perf_counter()
+    try:
+        counts = generate_dataset(
+            engine,
+            users=args.users,
+            issues=args.issues,
+            labels=args.labels,
+            seed=args.seed,
+            until=until,
+            days=args.days,
+            # Hashed once: bcrypt per user is what makes seeding through the API slow
+            password_hash=get_password_hash(args.password),
+            batch_size=args.batch_size,
+        )
+    except ValueError as e:
+        parser.exit(1, f"{e}\n")
+    finally:
+        engine.dispose()
+
+    elapsed = time.perf_counter() - started
+    print(", ".join(f"{count} {table}" for table, count in counts.items()))
+    print(f"Generated in {elapsed:.1f} s ({sum(counts.values()) / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
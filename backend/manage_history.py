@@ -0,0 +1,41 @@
+"""
+Issue history partition maintenance and retention
+Run ensure-partitions regularly (e.g. daily from cron) so the next months'
+partitions exist, and archive to apply the retention policy.
+"""
+import argparse
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.history_archive import archive_history, ensure_partitions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    ensure = subcommands.add_parser("ensure-partitions", help="Create upcoming monthly partitions")
+    ensure.add_argument("--months-ahead", type=int, default=settings.HISTORY_PARTITION_MONTHS_AHEAD)
+
+    archive = subcommands.add_parser("archive", help="Export and remove months past retention")
+    archive.add_argument("--retain-months", type=int, default=settings.HISTORY_RETENTION_MONTHS)
+    archive.add_argument("--archive-dir", default=settings.HISTORY_ARCHIVE_DIR)
+
+    args = parser.parse_args()
+
+    if args.command == "ensure-partitions":
+        months = ensure_partitions(engine, args.months_ahead)
+        if not months:
+            print("issue_history is not partitioned; nothing to do.")
+        for month in months:
+            print(f"Partition ready for {month:%Y-%m}")
+    else:
+        archived = archive_history(engine, args.retain_months, args.archive_dir)
+        if not archived:
+            print("Nothing to archive.")
+        for month, count in archived.items():
+            print(f"Archived {count} rows for {month} to {args.archive_dir}")
+
+
+if __name__ == "__main__":
+    main()
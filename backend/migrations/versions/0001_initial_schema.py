@@ -0,0 +1,117 @@
+"""Initial schema, as created by init_db and migrate_user_auth.py
+
+Databases created before migrations existed are stamped at this revision by
+init_db, so only later revisions run against them.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+issue_status = sa.Enum("OPEN", "IN_PROGRESS", "RESOLVED", "CLOSED", name="issuestatus")
+issue_priority = sa.Enum("LOW", "MEDIUM", "HIGH", "CRITICAL", name="issuepriority")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("full_name", sa.String()),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("reset_code", sa.String(), nullable=True),
+        sa.Column("reset_code_expires", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "labels",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(50), nullable=False),
+        sa.Column("color", sa.String(7)),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_labels_id", "labels", ["id"])
+    op.create_index("ix_labels_name", "labels", ["name"], unique=True)
+
+    op.create_table(
+        "issues",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text()),
+        sa.Column("status", issue_status, nullable=False),
+        sa.Column("priority", issue_priority, nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("creator_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("assignee_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("resolved_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_issues_id", "issues", ["id"])
+    op.create_index("ix_issues_title", "issues", ["title"])
+    op.create_index("ix_issues_status", "issues", ["status"])
+    op.create_index("ix_issues_assignee_id", "issues", ["assignee_id"])
+    op.create_index("ix_issues_created_at", "issues", ["created_at"])
+    op.create_index("ix_issues_resolved_at", "issues", ["resolved_at"])
+
+    op.create_table(
+        "comments",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("body", sa.Text(), nullable=False),
+        sa.Column("author_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("issue_id", sa.Integer(), sa.ForeignKey("issues.id"), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_comments_id", "comments", ["id"])
+    op.create_index("ix_comments_issue_id", "comments", ["issue_id"])
+
+    op.create_table(
+        "issue_labels",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("issue_id", sa.Integer(), sa.ForeignKey("issues.id"), nullable=False),
+        sa.Column("label_id", sa.Integer(), sa.ForeignKey("labels.id"), nullable=False),
+        sa.UniqueConstraint("issue_id", "label_id", name="uq_issue_label"),
+    )
+    op.create_index("ix_issue_labels_id", "issue_labels", ["id"])
+    op.create_index("ix_issue_labels_issue_id", "issue_labels", ["issue_id"])
+    op.create_index("ix_issue_labels_label_id", "issue_labels", ["label_id"])
+
+    op.create_table(
+        "issue_history",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("issue_id", sa.Integer(), sa.ForeignKey("issues.id"), nullable=False),
+        sa.Column("changed_by_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("field_name", sa.String(50), nullable=False),
+        sa.Column("old_value", sa.Text()),
+        sa.Column("new_value", sa.Text()),
+        sa.Column("changed_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_issue_history_id", "issue_history", ["id"])
+    op.create_index("ix_issue_history_issue_id", "issue_history", ["issue_id"])
+    op.create_index("ix_issue_history_changed_at", "issue_history", ["changed_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("issue_history")
+    op.drop_table("issue_labels")
+    op.drop_table("comments")
+    op.drop_table("issues")
+    op.drop_table("labels")
+    op.drop_table("users")
+    issue_priority.drop(op.get_bind(), checkfirst=True)
+    issue_status.drop(op.get_bind(), checkfirst=True)
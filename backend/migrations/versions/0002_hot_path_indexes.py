@@ -0,0 +1,75 @@
+"""Composite indexes for the hot query paths
+
+New indexes:
+- issues(assignee_id, status, priority): top-assignees report as an index-only
+  scan; also serves every (assignee_id, status) lookup through its prefix
+- issues(status, created_at, id): status-filtered lists in creation order
+- issue_history(issue_id, changed_at): issue timelines
+- comments(issue_id, created_at): comments of an issue
+- issue_labels(label_id, issue_id): issues carrying a label
+
+Single-column indexes that become a prefix of one of the above (or of
+uq_issue_label) are dropped, since they only add write cost.
+
+On PostgreSQL every index is built and dropped CONCURRENTLY outside a
+transaction, so this can run against a live database. If a concurrent build
+fails it leaves an INVALID index behind; drop it and run the upgrade again.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+NEW_INDEXES = [
+    ("ix_issues_assignee_status_priority", "issues", ["assignee_id", "status", "priority"]),
+    ("ix_issues_status_created_at_id", "issues", ["status", "created_at", "id"]),
+    ("ix_issue_history_issue_changed_at", "issue_history", ["issue_id", "changed_at"]),
+    ("ix_comments_issue_created_at", "comments", ["issue_id", "created_at"]),
+    ("ix_issue_labels_label_issue", "issue_labels", ["label_id", "issue_id"]),
+]
+
+REDUNDANT_INDEXES = [
+    ("ix_issues_assignee_id", "issues", ["assignee_id"]),
+    ("ix_issues_status", "issues", ["status"]),
+    ("ix_issue_history_issue_id", "issue_history", ["issue_id"]),
+    ("ix_comments_issue_id", "comments", ["issue_id"]),
+    ("ix_issue_labels_issue_id", "issue_labels", ["issue_id"]),
+    ("ix_issue_labels_label_id", "issue_labels", ["label_id"]),
+]
+
+
+def _create_indexes(indexes) -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in indexes:
+            op.create_index(
+                name, table, columns,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+            )
+
+
+def _drop_indexes(indexes) -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in indexes:
+            op.drop_index(
+                name, table_name=table,
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
+
+
+def upgrade() -> None:
+    # Build the replacements before dropping anything they cover
+    _create_indexes(NEW_INDEXES)
+    _drop_indexes(REDUNDANT_INDEXES)
+
+
+def downgrade() -> None:
+    _create_indexes(REDUNDANT_INDEXES)
+    _drop_indexes(NEW_INDEXES)
@@ -0,0 +1,127 @@
+"""Partition issue_history by month on changed_at (PostgreSQL only)
+
+The table is rebuilt as a range-partitioned table with one partition per
+month from the oldest row through HISTORY_PARTITION_MONTHS_AHEAD months from
+now, plus a default partition for anything outside that range. Partitioned
+tables need the partition key in the primary key, so it becomes
+(id, changed_at); ids keep coming from the existing sequence.
+
+Rows are copied while the table is locked, so run this in a maintenance
+window. Afterwards, `python manage_history.py ensure-partitions` keeps future
+partitions ready and `python manage_history.py archive` applies retention.
+
+Other databases keep a plain table; retention there deletes archived rows.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+from app.core.history_archive import add_months, create_partition, month_start
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+COLUMNS = "id, issue_id, changed_by_id, field_name, old_value, new_value, changed_at"
+INDEXES = [
+    ("ix_issue_history_id", ["id"]),
+    ("ix_issue_history_changed_at", ["changed_at"]),
+    ("ix_issue_history_issue_changed_at", ["issue_id", "changed_at"]),
+]
+
+
+def _drop_indexes() -> None:
+    for name, _ in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def _create_indexes() -> None:
+    for name, columns in INDEXES:
+        op.create_index(name, "issue_history", columns)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE issue_history RENAME TO issue_history_legacy")
+    op.execute(
+        "ALTER TABLE issue_history_legacy "
+        "RENAME CONSTRAINT issue_history_pkey TO issue_history_legacy_pkey"
+    )
+    _drop_indexes()
+
+    op.execute("""
+        CREATE TABLE issue_history (
+            id INTEGER NOT NULL DEFAULT nextval('issue_history_id_seq'),
+            issue_id INTEGER NOT NULL REFERENCES issues (id),
+            changed_by_id INTEGER NOT NULL REFERENCES users (id),
+            field_name VARCHAR(50) NOT NULL,
+            old_value TEXT,
+            new_value TEXT,
+            changed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, changed_at)
+        ) PARTITION BY RANGE (changed_at)
+    """)
+    # Keep the sequence alive when the legacy table is dropped
+    op.execute("ALTER SEQUENCE issue_history_id_seq OWNED BY issue_history.id")
+    op.execute("CREATE TABLE issue_history_default PARTITION OF issue_history DEFAULT")
+
+    current = month_start(datetime.now(timezone.utc))
+    oldest = None
+    if not op.get_context().as_sql:
+        oldest = bind.execute(sa.text("SELECT min(changed_at) FROM issue_history_legacy")).scalar()
+    month = month_start(oldest.astimezone(timezone.utc)) if oldest else current
+    last = add_months(current, settings.HISTORY_PARTITION_MONTHS_AHEAD)
+    while month <= last:
+        create_partition(bind, month)
+        month = add_months(month, 1)
+
+    op.execute(f"""
+        INSERT INTO issue_history ({COLUMNS})
+        SELECT id, issue_id, changed_by_id, field_name, old_value, new_value,
+               coalesce(changed_at, now())
+        FROM issue_history_legacy
+    """)
+    op.execute("DROP TABLE issue_history_legacy")
+    _create_indexes()
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE issue_history RENAME TO issue_history_partitioned")
+    op.execute(
+        "ALTER TABLE issue_history_partitioned "
+        "RENAME CONSTRAINT issue_history_pkey TO issue_history_partitioned_pkey"
+    )
+    _drop_indexes()
+
+    op.execute("""
+        CREATE TABLE issue_history (
+            id INTEGER NOT NULL DEFAULT nextval('issue_history_id_seq') PRIMARY KEY,
+            issue_id INTEGER NOT NULL REFERENCES issues (id),
+            changed_by_id INTEGER NOT NULL REFERENCES users (id),
+            field_name VARCHAR(50) NOT NULL,
+            old_value TEXT,
+            new_value TEXT,
+            changed_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+        )
+    """)
+    op.execute("ALTER SEQUENCE issue_history_id_seq OWNED BY issue_history.id")
+    op.execute(f"""
+        INSERT INTO issue_history ({COLUMNS})
+        SELECT {COLUMNS} FROM issue_history_partitioned
+    """)
+    op.execute("DROP TABLE issue_history_partitioned CASCADE")
+    _create_indexes()
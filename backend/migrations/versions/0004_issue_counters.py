@@ -0,0 +1,71 @@
+"""Denormalized comment_count and label_names on issues
+
+Both columns get constant server defaults, so adding them does not rewrite
+the table on PostgreSQL 11+. Existing rows are then backfilled: comment counts
+with one correlated UPDATE, label names per issue since JSON aggregation is
+not portable across dialects. repair_counters.py performs the same
+recomputation in batches if the counters ever drift.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from collections import defaultdict
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+issues = sa.table(
+    "issues",
+    sa.column("id", sa.Integer),
+    sa.column("comment_count", sa.Integer),
+    sa.column("label_names", sa.JSON),
+)
+comments = sa.table("comments", sa.column("id", sa.Integer), sa.column("issue_id", sa.Integer))
+issue_labels = sa.table(
+    "issue_labels", sa.column("issue_id", sa.Integer), sa.column("label_id", sa.Integer)
+)
+labels = sa.table("labels", sa.column("id", sa.Integer), sa.column("name", sa.String))
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("issues") as batch:
+        batch.add_column(sa.Column("comment_count", sa.Integer(), server_default="0", nullable=False))
+        batch.add_column(sa.Column("label_names", sa.JSON(), server_default="[]", nullable=False))
+
+    op.execute(
+        issues.update().values(
+            comment_count=sa.select(sa.func.count(comments.c.id))
+            .where(comments.c.issue_id == issues.c.id)
+            .scalar_subquery()
+        )
+    )
+
+    if context.is_offline_mode():
+        # Label names need a round trip; run repair_counters.py after applying the SQL
+        return
+
+    names = defaultdict(list)
+    for issue_id, name in op.get_bind().execute(
+        sa.select(issue_labels.c.issue_id, labels.c.name)
+        .join(labels, labels.c.id == issue_labels.c.label_id)
+    ):
+        names[issue_id].append(name)
+    if names:
+        op.get_bind().execute(
+            issues.update()
+            .where(issues.c.id == sa.bindparam("issue_id"))
+            .values(label_names=sa.bindparam("names", type_=sa.JSON)),
+            [{"issue_id": issue_id, "names": sorted(values)} for issue_id, values in names.items()],
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("issues") as batch:
+        batch.drop_column("label_names")
+        batch.drop_column("comment_count")
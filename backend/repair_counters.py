@@ -0,0 +1,21 @@
+"""
+Recompute the denormalized comment_count and label_names columns on issues
+Safe to run against a live database; rows are fixed in batches.
+"""
+import argparse
+
+from app.core.database import engine
+from app.core.issue_counters import repair_issue_counters
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    repaired = repair_issue_counters(engine, args.batch_size)
+    print(f"Repaired counters on {repaired} issues.")
+
+
+if __name__ == "__main__":
+    main()
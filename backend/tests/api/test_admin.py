@@ -0,0 +1,152 @@
+import marshal
+import pytest
+from starlette.middleware import Middleware
+from app.core.config import settings
+from app.core.profiling import ProfilingMiddleware, profile_store
+from app.main import app
+
+
+@pytest.fixture
+def admin_headers(auth_headers, test_user, monkeypatch):
+    """Grant admin privileges to the test user"""
+    monkeypatch.setattr(settings, "ADMIN_EMAILS", [test_user.email])
+    return auth_headers
+
+
+@pytest.mark.integration
+@pytest.mark.max_queries(2)
+class TestAdmin:
+    """Test admin endpoints"""
+
+    def test_pool_stats_requires_auth(self, client):
+        """Test pool stats without authentication"""
+        response = client.get("/api/v1/admin/db-pool")
+        assert response.status_code == 403
+
+    def test_pool_stats_requires_admin(self, client, auth_headers):
+        """Test pool stats as a regular user"""
+        response = client.get("/api/v1/admin/db-pool", headers=auth_headers)
+        assert response.status_code == 403
+        assert response.json()["detail"] == "Admin privileges required"
+
+    def test_pool_stats(self, client, admin_headers):
+        """Test pool stats as an admin"""
+        response = client.get("/api/v1/admin/db-pool", headers=admin_headers)
+        assert response.status_code == 200
+        pools = response.json()["pools"]
+        assert pools[0]["name"] == "primary"
+        assert pools[0]["pool_class"] == "InstrumentedAsyncQueuePool"
+        assert pools[0]["size"] == settings.DB_POOL_SIZE
+        assert pools[0]["checkout_wait_ms"]["buckets"][-1]["le"] is None
+
+
+@pytest.mark.integration
+@pytest.mark.max_queries(2)
+class TestMetrics:
+    """Test the Prometheus metrics endpoint"""
+
+    def test_metrics_endpoint(self, client, test_user, auth_headers):
+        """Test API requests show up in /metrics under their route template"""
+        from app.core.request_metrics import request_metrics
+
+        request_metrics.clear()
+        response = client.get(f"/api/v1/users/{test_user.id}", headers=auth_headers)
+        assert response.status_code == 200
+        timings = dict(part.split(";dur=") for part in response.headers["server-timing"].split(", "))
+        assert float(timings["db"]) > 0
+
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert (
+            'http_request_duration_seconds_count{method="GET",'
+            'route="/api/v1/users/{user_id}",status="200"} 1'
+        ) in response.text
+
+
+@pytest.mark.integration
+@pytest.mark.max_queries(3)
+class TestSlowQueries:
+    """Test the slow-query log endpoint"""
+
+    def test_slow_queries_requires_admin(self, client, auth_headers):
+        """Test the slow-query log as a regular user"""
+        response = client.get("/api/v1/admin/slow-queries", headers=auth_headers)
+        assert response.status_code == 403
+
+    def test_slow_queries(self, client, admin_headers, test_issue, monkeypatch):
+        """Test statements over the threshold are listed with route, parameter shape and plan"""
+        from app.core.slow_queries import slow_query_log
+
+        slow_query_log.clear()
+        monkeypatch.setattr(slow_query_log, "threshold_ms", 1e-6)
+        response = client.get("/api/v1/issues/", params={"status": "open"})
+        assert response.status_code == 200
+        monkeypatch.setattr(slow_query_log, "threshold_ms", 0)
+
+        response = client.get("/api/v1/admin/slow-queries", headers=admin_headers)
+        assert response.status_code == 200
+        report = response.json()
+        assert report["threshold_ms"] == 0
+        entry = next(q for q in report["queries"] if "FROM issues" in q["statement"])
+        assert entry["route"] == "GET /api/v1/issues/"
+        assert entry["parameters"] == "(str, int*2)"
+        assert entry["plan"]
+        slow_query_log.clear()
+
+
+@pytest.fixture
+def profiling(client, monkeypatch):
+    """Install the profiling middleware, as PROFILING_ENABLED does"""
+    monkeypatch.setattr(
+        app, "user_middleware", [Middleware(ProfilingMiddleware, store=profile_store)] + app.user_middleware
+    )
+    monkeypatch.setattr(app, "middleware_stack", None)
+    profile_store.clear()
+    yield profile_store
+    profile_store.clear()
+
+
+@pytest.mark.integration
+@pytest.mark.max_queries(4)
+class TestProfiling:
+    """Test on-demand request profiling"""
+
+    def test_profile_request(self, client, profiling, admin_headers, test_issue):
+        """Test an admin's flagged request is profiled and its report can be fetched"""
+        response = client.get(f"/api/v1/issues/{test_issue['id']}", headers={**admin_headers, "X-Profile": "1"})
+        assert response.status_code == 200
+        profile_id = response.headers["x-profile-id"]
+
+        response = client.get("/api/v1/admin/profiles", headers=admin_headers)
+        assert response.status_code == 200
+        (profile,) = response.json()
+        assert profile["id"] == profile_id
+        assert profile["route"] == "/api/v1/issues/{issue_id}"
+        assert profile["function_calls"] > 0
+
+        response = client.get(f"/api/v1/admin/profiles/{profile_id}", headers=admin_headers)
+        assert response.status_code == 200
+        assert "Ordered by: cumulative time" in response.text
+
+        response = client.get(
+            f"/api/v1/admin/profiles/{profile_id}", params={"format": "pstats"}, headers=admin_headers
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/octet-stream"
+        assert "content-encoding" not in response.headers
+        # The endpoint runs in a task spawned by the middleware below, and is still recorded
+        functions = {name for _, _, name in marshal.loads(response.content)}
+        assert "get_issue_by_id" in functions
+
+    def test_profile_requires_admin(self, client, profiling, auth_headers):
+        """Test a regular user's X-Profile header is refused"""
+        response = client.get("/api/v1/issues/", headers={**auth_headers, "X-Profile": "1"})
+        assert response.status_code == 403
+        assert response.json()["detail"] == "Profiling requires admin privileges"
+        assert profiling.list() == []
+
+    def test_unknown_profile(self, client, admin_headers):
+        """Test fetching a profile this worker does not have"""
+        response = client.get("/api/v1/admin/profiles/missing", headers=admin_headers)
+        assert response.status_code == 404
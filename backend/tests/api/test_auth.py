@@ -2,6 +2,7 @@ import pytest
 
 
 @pytest.mark.auth
+@pytest.mark.max_queries(4)
 class TestAuthentication:
     """Test authentication endpoints"""
 
@@ -175,3 +176,146 @@ class TestAuthentication:
         response = client.post("/api/v1/auth/logout")
         assert response.status_code == 200
         assert response.json()["success"] is True
+
+    def test_current_user_is_cached(self, client, auth_headers, test_user, db_session):
+        """Test an authenticated user is served from the cache on later requests"""
+        from sqlalchemy import text
+
+        assert client.get("/api/v1/auth/me", headers=auth_headers).status_code == 200
+        # Changed behind the ORM's back, so the cache cannot know
+        db_session.execute(text("UPDATE users SET full_name = 'Renamed'"))
+        db_session.commit()
+
+        response = client.get("/api/v1/auth/me", headers=auth_headers)
+        assert response.json()["full_name"] == "Test User"
+
+    def test_deactivation_invalidates_cached_user(self, client, auth_headers, test_user, db_session):
+        """Test deactivating a user through the ORM takes effect immediately"""
+        assert client.get("/api/v1/auth/me", headers=auth_headers).status_code == 200
+
+        test_user.is_active = False
+        db_session.commit()
+
+        response = client.get("/api/v1/auth/me", headers=auth_headers)
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Inactive user"
+
+    def test_user_cache_holds_no_secrets(self, client, auth_headers, test_user, db_session):
+        """Test cached users keep the fields authorization needs, not the password hash"""
+        from app.core.auth import user_cache
+
+        test_user.reset_code = "123456"
+        db_session.commit()
+        assert client.get("/api/v1/auth/me", headers=auth_headers).status_code == 200
+
+        cached = user_cache.get(test_user.id)
+        assert cached["email"] == "test@example.com" and cached["is_active"]
+        assert "hashed_password" not in cached
+        assert "reset_code" not in cached
+
+        response = client.get("/api/v1/auth/me", headers=auth_headers)
+        assert response.json()["username"] == "testuser"
+
+    def test_password_reset_invalidates_cached_user(self, client, auth_headers, test_user):
+        """Test a password reset drops the user from the cache"""
+        from app.core.auth import user_cache
+
+        client.get("/api/v1/auth/me", headers=auth_headers)
+        assert user_cache.get(test_user.id) is not None
+
+        client.post("/api/v1/auth/forgot-password", json={"email": "test@example.com"})
+        assert user_cache.get(test_user.id) is None
+
+    def test_login_rehashes_on_cost_change(self, client, test_user, db_session, monkeypatch):
+        """Test logging in upgrades a hash made with an outdated bcrypt cost"""
+        from app.core.password_hashing import hash_rounds
+        from app.core.passwords import password_hasher
+
+        monkeypatch.setattr(password_hasher, "rounds", hash_rounds(test_user.hashed_password) + 1)
+        response = client.post(
+            "/api/v1/auth/login",
+            json={"email": "test@example.com", "password": "testpassword123"}
+        )
+        assert response.status_code == 200
+
+        db_session.refresh(test_user)
+        assert hash_rounds(test_user.hashed_password) == password_hasher.rounds
+        response = client.post(
+            "/api/v1/auth/login",
+            json={"email": "test@example.com", "password": "testpassword123"}
+        )
+        assert response.status_code == 200
+
+    def test_login_throttled_per_email(self, client, test_user, monkeypatch):
+        """Test repeated attempts against one email are rejected with Retry-After"""
+        from app.core.throttle import auth_throttle
+
+        monkeypatch.setattr(auth_throttle, "email_burst", 2)
+        credentials = {"email": "Test@example.com", "password": "wrong"}
+        for _ in range(2):
+            assert client.post("/api/v1/auth/login", json=credentials).status_code == 401
+
+        response = client.post(
+            "/api/v1/auth/login",
+            json={"email": "test@example.com", "password": "testpassword123"}
+        )
+        assert response.status_code == 429
+        assert int(response.headers["retry-after"]) >= 1
+
+        # Other emails are unaffected
+        response = client.post(
+            "/api/v1/auth/login",
+            json={"email": "other@example.com", "password": "wrong"}
+        )
+        assert response.status_code == 401
+
+    def test_reset_throttled_per_ip(self, client, test_user, monkeypatch):
+        """Test one client cycling through emails is stopped by its IP bucket"""
+        from app.core.throttle import auth_throttle
+
+        monkeypatch.setattr(auth_throttle, "ip_burst", 3)
+        statuses = [
+            client.post(
+                "/api/v1/auth/forgot-password", json={"email": f"user{i}@example.com"}
+            ).status_code
+            for i in range(4)
+        ]
+        assert statuses == [200, 200, 200, 429]
+
+    def test_logout_revokes_token(self, client, auth_headers, test_user):
+        """Test a token is rejected after logging out with it, other tokens are not"""
+        other = client.post(
+            "/api/v1/auth/login",
+            json={"email": "test@example.com", "password": "testpassword123"}
+        ).json()["access_token"]
+
+        assert client.get("/api/v1/auth/me", headers=auth_headers).status_code == 200
+        response = client.post("/api/v1/auth/logout", headers=auth_headers)
+        assert response.status_code == 200
+
+        response = client.get("/api/v1/auth/me", headers=auth_headers)
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Token has been revoked"
+        response = client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {other}"})
+        assert response.status_code == 200
+
+    def test_revocation_from_another_worker(self, client, auth_headers, test_user, db_session):
+        """Test a revocation written elsewhere is picked up at the next refresh"""
+        from datetime import datetime, timedelta, timezone
+        from app.core.auth import decode_access_token
+        from app.core.revocation import revocation_list
+        from app.models import RevokedToken
+
+        assert client.get("/api/v1/auth/me", headers=auth_headers).status_code == 200
+        token_data = decode_access_token(auth_headers["Authorization"].split()[1])
+        db_session.add(RevokedToken(
+            jti=token_data.jti,
+            user_id=test_user.id,
+            expires_at=datetime.now(timezone.utc) + timedelta(days=1),
+        ))
+        db_session.commit()
+
+        # Still served from memory until the refresh interval has passed
+        assert client.get("/api/v1/auth/me", headers=auth_headers).status_code == 200
+        revocation_list._refreshed_at = None
+        assert client.get("/api/v1/auth/me", headers=auth_headers).status_code == 401
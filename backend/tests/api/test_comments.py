@@ -2,6 +2,7 @@ import pytest
 
 
 @pytest.mark.comments
+@pytest.mark.max_queries(5)
 class TestComments:
     """Test comment endpoints"""
 
@@ -74,3 +75,44 @@ class TestComments:
         assert len(data["comments"]) >= 1
         assert data["comments"][0]["body"] == "Test comment"
         assert "author" in data["comments"][0]
+
+    def test_add_comment_updates_comment_count(self, client, auth_headers, test_issue):
+        """Test the issue's comment_count follows new comments"""
+        assert test_issue["comment_count"] == 0
+        for body in ("First", "Second"):
+            client.post(
+                f"/api/v1/issues/{test_issue['id']}/comments",
+                headers=auth_headers,
+                json={"body": body, "author_id": test_issue["creator_id"]}
+            )
+
+        response = client.get("/api/v1/issues")
+        assert response.json()[0]["comment_count"] == 2
+        # Counters are not user edits
+        assert response.json()[0]["version"] == test_issue["version"]
+
+    def test_issue_details_query_count_is_constant(
+        self, client, auth_headers, test_issue, db_session, count_queries
+    ):
+        """Test comment authors are loaded in one query, however many authors there are"""
+        from app.models.user import User as UserModel
+
+        authors = [
+            UserModel(username=f"author{i}", email=f"author{i}@example.com", hashed_password="x")
+            for i in range(6)
+        ]
+        db_session.add_all(authors)
+        db_session.commit()
+
+        def comment_then_count(new_authors):
+            for author in new_authors:
+                client.post(
+                    f"/api/v1/issues/{test_issue['id']}/comments",
+                    headers=auth_headers,
+                    json={"body": f"By {author.username}", "author_id": author.id}
+                )
+            with count_queries() as queries:
+                assert client.get(f"/api/v1/issues/{test_issue['id']}").status_code == 200
+            return len(queries)
+
+        assert comment_then_count(authors[:1]) == comment_then_count(authors[1:])
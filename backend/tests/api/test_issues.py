@@ -2,6 +2,7 @@ import pytest
 
 
 @pytest.mark.issues
+@pytest.mark.max_queries(8)
 class TestIssues:
     """Test issue management endpoints"""
 
@@ -39,6 +40,7 @@ class TestIssues:
         )
         assert response.status_code == 403
 
+    @pytest.mark.max_queries(1)
     def test_get_all_issues(self, client, test_issue):
         """Test getting all issues (public)"""
         response = client.get("/api/v1/issues")
@@ -47,6 +49,7 @@ class TestIssues:
         assert isinstance(data, list)
         assert len(data) >= 1
 
+    @pytest.mark.max_queries(3)
     def test_get_issue_by_id(self, client, test_issue):
         """Test getting a specific issue"""
         response = client.get(f"/api/v1/issues/{test_issue['id']}")
@@ -120,6 +123,7 @@ class TestIssues:
         response = client.delete(f"/api/v1/issues/{test_issue['id']}")
         assert response.status_code == 403
 
+    @pytest.mark.max_queries(1)
     def test_filter_issues_by_status(self, client, test_issue):
         """Test filtering issues by status"""
         response = client.get("/api/v1/issues?status=open")
@@ -190,3 +194,180 @@ class TestIssues:
         assert "field_name" in data[0]
         assert "old_value" in data[0]
         assert "new_value" in data[0]
+
+    def test_timeline_query_count_is_constant(
+        self, client, auth_headers, test_issue, test_user_2, count_queries
+    ):
+        """Test who made each change is loaded in one query, however many people did"""
+        token = client.post(
+            "/api/v1/auth/login",
+            json={"email": "test2@example.com", "password": "testpassword123"}
+        ).json()["access_token"]
+        editors = [auth_headers, {"Authorization": f"Bearer {token}"}]
+
+        def update_then_count(headers_list):
+            for headers in headers_list:
+                issue = client.get(f"/api/v1/issues/{test_issue['id']}").json()
+                client.patch(
+                    f"/api/v1/issues/{test_issue['id']}",
+                    headers=headers,
+                    json={"title": f"Edited {issue['version']}", "version": issue["version"]}
+                )
+            with count_queries() as queries:
+                response = client.get(f"/api/v1/issues/{test_issue['id']}/timeline")
+            assert response.status_code == 200
+            return len(queries)
+
+        assert update_then_count(editors[:1]) == update_then_count(editors + editors)
+
+    def test_get_issue_timeline_with_archived(
+        self, client, auth_headers, test_issue, db_session, tmp_path, monkeypatch
+    ):
+        """Test archived history is merged into the timeline on request"""
+        import gzip
+        import json
+        from datetime import datetime
+        from app.core.config import settings
+        from app.models import Issue as IssueModel
+
+        monkeypatch.setattr(settings, "HISTORY_ARCHIVE_DIR", str(tmp_path))
+        # Archives from before the issue was created are not read
+        db_session.get(IssueModel, test_issue["id"]).created_at = datetime(2019, 12, 1)
+        db_session.commit()
+        with gzip.open(tmp_path / "issue_history_2020_01.jsonl.gz", "wt") as archive:
+            archive.write(json.dumps({
+                "id": 999,
+                "issue_id": test_issue["id"],
+                "changed_by_id": test_issue["creator_id"],
+                "field_name": "priority",
+                "old_value": "low",
+                "new_value": "medium",
+                "changed_at": "2020-01-15T10:00:00+00:00"
+            }) + "\n")
+        client.patch(
+            f"/api/v1/issues/{test_issue['id']}",
+            headers=auth_headers,
+            json={"status": "in_progress", "version": test_issue["version"]}
+        )
+
+        response = client.get(f"/api/v1/issues/{test_issue['id']}/timeline")
+        assert all(event["id"] != 999 for event in response.json())
+
+        response = client.get(
+            f"/api/v1/issues/{test_issue['id']}/timeline",
+            params={"include_archived": True}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data[-1]["id"] == 999
+        assert data[-1]["changed_by"]["id"] == test_issue["creator_id"]
+        assert data[0]["field_name"] == "status"
+
+    def test_fast_json_responses_are_identical(self, client, auth_headers, test_issue, monkeypatch):
+        """Test the fast JSON path returns the same bytes as the default path"""
+        from app.core.config import settings
+
+        client.patch(
+            f"/api/v1/issues/{test_issue['id']}",
+            headers=auth_headers,
+            json={"title": "Ünïcødé \"title\"", "version": test_issue["version"]}
+        )
+        urls = ["/api/v1/issues", f"/api/v1/issues/{test_issue['id']}/timeline"]
+        default = [client.get(url).content for url in urls]
+
+        monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+        fast = [client.get(url) for url in urls]
+
+        assert [response.content for response in fast] == default
+        assert all(response.headers["content-type"] == "application/json" for response in fast)
+
+    def test_get_issues_batch(self, client, auth_headers, test_issue):
+        """Test fetching several issues by id, in the order requested"""
+        other = client.post(
+            "/api/v1/issues",
+            headers=auth_headers,
+            json={"title": "Second", "creator_id": test_issue["creator_id"]}
+        ).json()
+
+        response = client.get(
+            "/api/v1/issues/batch",
+            params={"ids": [other["id"], test_issue["id"], other["id"]]}
+        )
+        assert response.status_code == 200
+        assert [issue["id"] for issue in response.json()] == [other["id"], test_issue["id"]]
+        assert response.json()[1] == client.get("/api/v1/issues").json()[0]
+
+    def test_get_issues_batch_missing(self, client, test_issue):
+        """Test a batch naming an unknown issue fails"""
+        response = client.get("/api/v1/issues/batch", params={"ids": [test_issue["id"], 99999]})
+        assert response.status_code == 404
+
+    def test_export_issues(self, client, auth_headers, test_issue, monkeypatch):
+        """Test the CSV export streams every issue and can be imported again"""
+        import csv
+        import io
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "ISSUE_EXPORT_BATCH_SIZE", 1)
+        client.post(
+            "/api/v1/issues",
+            headers=auth_headers,
+            json={"title": "Second, with \"quotes\"", "creator_id": test_issue["creator_id"]}
+        )
+
+        response = client.get("/api/v1/issues/export")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["title"] for row in rows] == [test_issue["title"], "Second, with \"quotes\""]
+        assert rows[0]["status"] == "open"
+        assert rows[0]["assignee_id"] == ""
+
+        response = client.post(
+            "/api/v1/issues/import",
+            headers=auth_headers,
+            files={"file": ("issues.csv", response.content, "text/csv")}
+        )
+        assert response.json()["successful"] == 2
+
+    def test_export_compressed_while_streaming(self, client, test_issue, monkeypatch):
+        """Test the streamed export is gzipped and decompresses to the plain CSV"""
+        import gzip
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "ISSUE_EXPORT_BATCH_SIZE", 1)
+        plain = client.get("/api/v1/issues/export", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+
+        with client.stream("GET", "/api/v1/issues/export", headers={"Accept-Encoding": "gzip"}) as response:
+            assert response.headers["content-encoding"] == "gzip"
+            assert "content-length" not in response.headers
+            compressed = b"".join(response.iter_raw())
+        assert gzip.decompress(compressed) == plain.content
+
+    def test_export_opens_its_own_session(self, client, test_issue):
+        """Test the export reads through a session opened and closed by the stream"""
+        import contextlib
+        from app.main import app
+        from app.core.database import get_read_session_factory
+
+        session_factory = app.dependency_overrides[get_read_session_factory]()
+        events = []
+
+        @contextlib.asynccontextmanager
+        async def read_session():
+            events.append("open")
+            async with session_factory() as db:
+                yield db
+            events.append("close")
+
+        app.dependency_overrides[get_read_session_factory] = lambda: read_session
+        response = client.get("/api/v1/issues/export")
+        assert test_issue["title"] in response.text
+        assert events == ["open", "close"]
+
+    @pytest.mark.max_queries(1)
+    def test_export_issues_filtered(self, client, test_issue):
+        """Test the export applies the list filters"""
+        response = client.get("/api/v1/issues/export", params={"status": "closed"})
+        assert response.text.strip().splitlines()[1:] == []
@@ -2,6 +2,7 @@ import pytest
 
 
 @pytest.mark.labels
+@pytest.mark.max_queries(7)
 class TestLabels:
     """Test label endpoints"""
 
@@ -30,6 +31,7 @@ class TestLabels:
         )
         assert response.status_code == 400
 
+    @pytest.mark.max_queries(1)
     def test_get_all_labels(self, client, test_label):
         """Test getting all labels"""
         response = client.get("/api/v1/labels")
@@ -85,3 +87,21 @@ class TestLabels:
             params={"label_ids": [99999]}
         )
         assert response.status_code == 404
+
+    def test_replace_labels_updates_label_names(self, client, test_issue, test_label):
+        """Test the issue's label summary follows label replacement"""
+        other = client.post("/api/v1/labels", json={"name": "Alpha", "color": "#00FF00"}).json()
+        client.put(
+            f"/api/v1/labels/issues/{test_issue['id']}/labels",
+            params={"label_ids": [test_label["id"], other["id"]]}
+        )
+
+        response = client.get("/api/v1/issues")
+        assert response.json()[0]["label_names"] == sorted(["Alpha", test_label["name"]])
+
+        client.put(
+            f"/api/v1/labels/issues/{test_issue['id']}/labels",
+            params={"label_ids": [other["id"]]}
+        )
+        response = client.get(f"/api/v1/issues/{test_issue['id']}")
+        assert response.json()["label_names"] == ["Alpha"]
@@ -2,6 +2,7 @@ import pytest
 
 
 @pytest.mark.reports
+@pytest.mark.max_queries(7)
 class TestReports:
     """Test report endpoints"""
 
@@ -71,3 +72,144 @@ class TestReports:
 
         response = client.get("/api/v1/reports/latency")
         assert response.status_code == 200
+
+    def test_top_assignees_filtered(self, client, auth_headers, test_user, test_user_2):
+        """Test top assignees report filtered by status and priority"""
+        for assignee, priority in [
+            (test_user, "critical"),
+            (test_user_2, "critical"),
+            (test_user_2, "critical"),
+            (test_user, "low"),
+            (test_user, "low"),
+            (test_user, "low"),
+        ]:
+            client.post(
+                "/api/v1/issues",
+                headers=auth_headers,
+                json={
+                    "title": "Issue",
+                    "status": "open",
+                    "priority": priority,
+                    "creator_id": test_user.id,
+                    "assignee_id": assignee.id
+                }
+            )
+
+        response = client.get("/api/v1/reports/top-assignees?status=open&priority=critical")
+        assert response.status_code == 200
+        data = response.json()
+        assert [r["assignee_id"] for r in data] == [test_user_2.id, test_user.id]
+        assert [r["issue_count"] for r in data] == [2, 1]
+
+        response = client.get("/api/v1/reports/top-assignees?status=closed")
+        assert response.status_code == 200
+        assert response.json() == []
+
+    def test_top_labels_report(self, client, auth_headers, test_user, test_label):
+        """Test top labels report with label and status filters"""
+        other = client.post(
+            "/api/v1/labels",
+            json={"name": "Other", "color": "#00FF00"}
+        ).json()
+
+        for label_ids in [[test_label["id"]], [test_label["id"], other["id"]]]:
+            issue = client.post(
+                "/api/v1/issues",
+                headers=auth_headers,
+                json={
+                    "title": "Labelled Issue",
+                    "status": "open",
+                    "priority": "high",
+                    "creator_id": test_user.id
+                }
+            ).json()
+            query = "&".join(f"label_ids={label_id}" for label_id in label_ids)
+            client.put(f"/api/v1/labels/issues/{issue['id']}/labels?{query}")
+
+        response = client.get("/api/v1/reports/top-labels")
+        assert response.status_code == 200
+        data = response.json()
+        assert data[0] == {
+            "label_id": test_label["id"],
+            "label_name": test_label["name"],
+            "issue_count": 2
+        }
+        assert data[1]["label_id"] == other["id"]
+        assert data[1]["issue_count"] == 1
+
+        response = client.get(f"/api/v1/reports/top-labels?label_id={other['id']}")
+        assert [r["issue_count"] for r in response.json()] == [1, 1]
+
+        response = client.get("/api/v1/reports/top-labels?priority=low")
+        assert response.json() == []
+
+    def test_report_cube(self, client, auth_headers, test_user, test_user_2, test_label):
+        """Test cube report with subtotals over status, assignee and label"""
+        issues = []
+        for assignee, status in [
+            (test_user, "open"),
+            (test_user, "open"),
+            (test_user_2, "in_progress"),
+        ]:
+            issues.append(client.post(
+                "/api/v1/issues",
+                headers=auth_headers,
+                json={
+                    "title": "Cube Issue",
+                    "status": status,
+                    "priority": "high",
+                    "creator_id": test_user.id,
+                    "assignee_id": assignee.id
+                }
+            ).json())
+        client.put(f"/api/v1/labels/issues/{issues[0]['id']}/labels?label_ids={test_label['id']}")
+
+        response = client.get("/api/v1/reports/cube?dims=status,assignee,label")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["dims"] == ["status", "assignee", "label"]
+        cells = data["cells"]
+
+        grand_total = [c for c in cells if c["grouped_by"] == []]
+        assert len(grand_total) == 1
+        assert grand_total[0]["issue_count"] == 3
+
+        by_status = {c["status"]: c["issue_count"] for c in cells if c["grouped_by"] == ["status"]}
+        assert by_status == {"open": 2, "in_progress": 1}
+
+        by_label = {c["label_id"]: c["issue_count"] for c in cells if c["grouped_by"] == ["label"]}
+        assert by_label == {test_label["id"]: 1, None: 2}
+
+        full = [c for c in cells if c["grouped_by"] == ["status", "assignee", "label"]]
+        assert sum(c["issue_count"] for c in full) == 3
+
+    def test_report_cube_resolution_time(self, client, auth_headers, test_user):
+        """Test cube report mean resolution time only counts resolved issues"""
+        issue = client.post(
+            "/api/v1/issues",
+            headers=auth_headers,
+            json={"title": "To Resolve", "creator_id": test_user.id}
+        ).json()
+        client.patch(
+            f"/api/v1/issues/{issue['id']}",
+            headers=auth_headers,
+            json={"status": "resolved", "version": issue["version"]}
+        )
+
+        response = client.get("/api/v1/reports/cube?dims=status")
+        assert response.status_code == 200
+        cells = {c["status"]: c for c in response.json()["cells"] if c["grouped_by"]}
+        assert cells["resolved"]["average_resolution_time_hours"] is not None
+
+    def test_report_cube_invalid_dims(self, client):
+        """Test cube report rejects unknown dimensions"""
+        response = client.get("/api/v1/reports/cube?dims=status,creator")
+        assert response.status_code == 400
+
+    def test_report_cube_cardinality_cap(self, client, monkeypatch):
+        """Test cube report rejects cubes above the configured cell limit"""
+        from app.core.config import settings
+        monkeypatch.setattr(settings, "REPORT_CUBE_MAX_CELLS", 20)
+
+        response = client.get("/api/v1/reports/cube?dims=status,priority")
+        assert response.status_code == 400
@@ -2,6 +2,7 @@ import pytest
 
 
 @pytest.mark.users
+@pytest.mark.max_queries(4)
 class TestUsers:
     """Test user endpoints"""
 
@@ -36,6 +37,7 @@ class TestUsers:
         )
         assert response.status_code == 400
 
+    @pytest.mark.max_queries(1)
     def test_get_all_users(self, client, test_user):
         """Test getting all users"""
         response = client.get("/api/v1/users")
@@ -44,6 +46,7 @@ class TestUsers:
         assert isinstance(data, list)
         assert len(data) >= 1
 
+    @pytest.mark.max_queries(1)
     def test_get_user_by_id(self, client, test_user):
         """Test getting a specific user"""
         response = client.get(f"/api/v1/users/{test_user.id}")
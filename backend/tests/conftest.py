@@ -1,29 +1,96 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import List, Optional
 import pytest
+
+# Before the app reads its settings: hash in the threadpool, at the cheapest bcrypt cost
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
 
 from app.main import app
-from app.core.database import Base, get_db
+from app.core.database import Base, get_db, get_read_db, get_read_session_factory, to_async_url
 from app.models.user import User as UserModel
-from app.core.auth import get_password_hash
+from app.core.auth import get_password_hash, token_cache, user_cache
+from app.core.revocation import revocation_list
+from app.core.throttle import MemoryThrottleBackend, auth_throttle
 
-# Use in-memory SQLite for testing
-SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///:memory:"
+# Use a throwaway SQLite file so fixtures (sync) and the app (aiosqlite) share data
+SQLALCHEMY_TEST_DATABASE_URL = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
 
 engine = create_engine(
     SQLALCHEMY_TEST_DATABASE_URL,
     connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Each TestClient runs its own event loop, so async connections must not be pooled
+async_engine = create_async_engine(
+    to_async_url(SQLALCHEMY_TEST_DATABASE_URL),
+    poolclass=NullPool,
+)
+TestingAsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
+# Every statement the app sends; fixtures write through the sync engine and are not included
+issued_statements: List[str] = []
+
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    issued_statements.append(statement)
+
+
+class BudgetedTestClient(TestClient):
+    """TestClient that fails any request issuing more than max_queries statements"""
+
+    max_queries: Optional[int] = None
+
+    def request(self, method, url, *args, **kwargs):
+        if self.max_queries is None:
+            return super().request(method, url, *args, **kwargs)
+        start = len(issued_statements)
+        response = super().request(method, url, *args, **kwargs)
+        issued = issued_statements[start:]
+        assert len(issued) <= self.max_queries, (
+            f"{method} {url} issued {len(issued)} SQL statements, budget is {self.max_queries}:\n"
+            + "\n".join(f"  {statement}" for statement in issued)
+        )
+        return response
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """Apply @pytest.mark.max_queries(n) to the client calls in the test body only"""
+    marker = item.get_closest_marker("max_queries")
+    client = getattr(item, "funcargs", {}).get("client")
+    if marker is None or client is None:
+        yield
+        return
+    client.max_queries = marker.args[0]
+    try:
+        yield
+    finally:
+        client.max_queries = None
+
 
 @pytest.fixture(scope="function")
 def db_session():
     """Create a fresh database for each test"""
     Base.metadata.create_all(bind=engine)
+    # Ids are reused across tests, so users cached by an earlier test must not leak
+    user_cache.clear()
+    issued_statements.clear()
+    token_cache.clear()
+    revocation_list.clear()
+    auth_throttle.backend = MemoryThrottleBackend()
     session = TestingSessionLocal()
     try:
         yield session
@@ -35,14 +102,14 @@ def db_session():
 @pytest.fixture(scope="function")
 def client(db_session):
     """Create a test client with database session"""
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
+    async def override_get_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
 
     app.dependency_overrides[get_db] = override_get_db
-    with TestClient(app) as test_client:
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_read_session_factory] = lambda: TestingAsyncSessionLocal
+    with BudgetedTestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
 
@@ -129,3 +196,17 @@ def test_label(client):
     )
     assert response.status_code == 201
     return response.json()
+
+
+@pytest.fixture
+def count_queries():
+    """Collect the SQL statements the app issues inside a with block"""
+    @contextmanager
+    def counting():
+        issued: List[str] = []
+        start = len(issued_statements)
+        try:
+            yield issued
+        finally:
+            issued.extend(issued_statements[start:])
+    return counting
@@ -0,0 +1,49 @@
+import pytest
+
+from app.core import cache
+from app.core.cache import TTLCache
+
+
+@pytest.mark.unit
+class TestTTLCache:
+    """Test the bounded TTL cache"""
+
+    def test_evicts_least_recently_used(self):
+        """Test the size bound drops the least recently used entry"""
+        entries = TTLCache(maxsize=2, ttl_seconds=60)
+        entries.set("a", 1)
+        entries.set("b", 2)
+        assert entries.get("a") == 1
+        entries.set("c", 3)
+
+        assert entries.get("b") is None
+        assert entries.get("a") == 1
+        assert entries.get("c") == 3
+
+    def test_entries_expire(self, monkeypatch):
+        """Test entries disappear after their TTL, or a shorter per-entry one"""
+        now = [1000.0]
+        monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+        entries = TTLCache(maxsize=10, ttl_seconds=60)
+        entries.set("long", 1)
+        entries.set("short", 2, ttl_seconds=5)
+
+        now[0] += 10
+        assert entries.get("short") is None
+        assert entries.get("long") == 1
+        now[0] += 60
+        assert entries.get("long") is None
+
+    def test_stale_generation_is_not_stored(self):
+        """Test a value read before an invalidation is not cached after it"""
+        entries = TTLCache(maxsize=10, ttl_seconds=60)
+        generation = entries.generation
+        entries.pop("a")
+        entries.set("a", "stale", generation=generation)
+        assert entries.get("a") is None
+
+    def test_disabled(self):
+        """Test a zero size or TTL disables caching"""
+        for entries in (TTLCache(maxsize=0, ttl_seconds=60), TTLCache(maxsize=10, ttl_seconds=0)):
+            entries.set("a", 1)
+            assert entries.get("a") is None
@@ -0,0 +1,124 @@
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+
+from app.core import compression
+from app.core.compression import CompressionMiddleware, negotiate_encoding, skip_compression
+
+PAYLOAD = "issue " * 1000
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/large")
+    async def large():
+        return PlainTextResponse(PAYLOAD)
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("tiny")
+
+    @app.get("/raw")
+    @skip_compression
+    async def raw():
+        return PlainTextResponse(PAYLOAD)
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(3):
+                yield PAYLOAD
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return TestClient(app)
+
+
+@pytest.mark.unit
+class TestNegotiateEncoding:
+    """Test Accept-Encoding negotiation"""
+
+    def test_prefers_brotli_when_installed(self, monkeypatch):
+        """Test br wins ties, and only when the package is available"""
+        monkeypatch.setattr(compression, "brotli", object())
+        assert negotiate_encoding("gzip, deflate, br") == "br"
+        monkeypatch.setattr(compression, "brotli", None)
+        assert negotiate_encoding("gzip, deflate, br") == "gzip"
+
+    def test_honours_q_values(self, monkeypatch):
+        """Test weights, wildcards and explicit refusals"""
+        monkeypatch.setattr(compression, "brotli", object())
+        assert negotiate_encoding("br;q=0.5, gzip") == "gzip"
+        assert negotiate_encoding("*") == "br"
+        assert negotiate_encoding("*, br;q=0") == "gzip"
+        assert negotiate_encoding("gzip;q=0, identity") is None
+        assert negotiate_encoding("") is None
+
+
+@pytest.mark.unit
+class TestCompressionMiddleware:
+    """Test response compression"""
+
+    def test_gzip_large_response(self):
+        """Test responses above the threshold are gzipped"""
+        response = make_client().get("/large", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert int(response.headers["content-length"]) < len(PAYLOAD)
+        assert response.text == PAYLOAD
+
+    def test_small_response_untouched(self):
+        """Test responses below the threshold are sent as is"""
+        response = make_client().get("/small", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert response.text == "tiny"
+
+    def test_route_opt_out(self):
+        """Test @skip_compression routes are never compressed"""
+        response = make_client().get("/raw", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert response.text == PAYLOAD
+
+    def test_identity_when_not_accepted(self):
+        """Test clients that do not accept compression get plain bodies"""
+        response = make_client().get("/large", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_streamed_response_flushes_each_chunk(self):
+        """Test every streamed chunk is decodable as soon as it arrives"""
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            for _ in range(3):
+                await send({"type": "http.response.body", "body": PAYLOAD.encode(), "more_body": True})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+        await CompressionMiddleware(app, minimum_size=100)(scope, None, send)
+
+        headers = dict(messages[0]["headers"])
+        assert headers[b"content-encoding"] == b"gzip"
+        assert b"content-length" not in headers
+        decoder = zlib.decompressobj(31)
+        for message in messages[1:4]:
+            assert decoder.decompress(message["body"]) == PAYLOAD.encode()
+        chunks = b"".join(message["body"] for message in messages[1:])
+        assert gzip.decompress(chunks) == (PAYLOAD * 3).encode()
+
+    @pytest.mark.skipif(compression.brotli is None, reason="Brotli is not installed")
+    def test_brotli(self):
+        """Test Brotli is used when preferred by the client"""
+        response = make_client().get("/large", headers={"Accept-Encoding": "br"})
+        assert response.headers["content-encoding"] == "br"
+        # httpx decodes Brotli transparently when the package is installed
+        assert response.content == PAYLOAD.encode()
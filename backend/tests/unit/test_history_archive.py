@@ -0,0 +1,109 @@
+import gzip
+import json
+import os
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, select
+
+from app.core.database import Base
+from app.core.history_archive import (
+    add_months,
+    archive_history,
+    archive_path,
+    manifest_path,
+    read_archived_history,
+)
+from app.models import Issue, IssueHistory, User
+
+NOW = datetime(2024, 6, 15, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def history_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'history.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(User.__table__.insert().values(
+            id=1, email="a@example.com", username="a", hashed_password="x"
+        ))
+        connection.execute(Issue.__table__.insert().values(
+            id=1, title="Issue", creator_id=1
+        ))
+        connection.execute(IssueHistory.__table__.insert(), [
+            {"id": 1, "issue_id": 1, "changed_by_id": 1, "field_name": "status",
+             "old_value": "open", "new_value": "in_progress", "changed_at": datetime(2023, 1, 10)},
+            {"id": 2, "issue_id": 1, "changed_by_id": 1, "field_name": "priority",
+             "old_value": "low", "new_value": "high", "changed_at": datetime(2023, 3, 5)},
+            {"id": 3, "issue_id": 1, "changed_by_id": 1, "field_name": "status",
+             "old_value": "in_progress", "new_value": "resolved", "changed_at": datetime(2024, 5, 1)},
+        ])
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.unit
+class TestHistoryArchive:
+    """Test issue history retention and archival"""
+
+    def test_add_months_crosses_years(self):
+        """Test month arithmetic across year boundaries"""
+        assert add_months(datetime(2023, 11, 1), 3) == datetime(2024, 2, 1)
+        assert add_months(datetime(2024, 1, 1), -1) == datetime(2023, 12, 1)
+
+    def test_archives_months_outside_retention(self, history_engine, tmp_path):
+        """Test old months are exported and removed from the database"""
+        archive_dir = str(tmp_path / "archive")
+
+        archived = archive_history(history_engine, 12, archive_dir, now=NOW)
+
+        assert archived == {"2023-01": 1, "2023-02": 0, "2023-03": 1, "2023-04": 0, "2023-05": 0}
+        with history_engine.connect() as connection:
+            remaining = connection.execute(select(IssueHistory.id)).scalars().all()
+        assert remaining == [3]
+        assert os.path.exists(archive_path(archive_dir, datetime(2023, 1, 1)))
+        # Empty months produce no file
+        assert not os.path.exists(archive_path(archive_dir, datetime(2023, 2, 1)))
+        with gzip.open(archive_path(archive_dir, datetime(2023, 3, 1)), "rt") as archive:
+            assert archive.read().count("\n") == 1
+
+    def test_read_archived_history(self, history_engine, tmp_path):
+        """Test archived rows are read back per issue"""
+        archive_dir = str(tmp_path / "archive")
+        archive_history(history_engine, 12, archive_dir, now=NOW)
+
+        rows = read_archived_history(1, archive_dir)
+        assert sorted(row["id"] for row in rows) == [1, 2]
+        assert all(isinstance(row["changed_at"], datetime) for row in rows)
+        assert read_archived_history(2, archive_dir) == []
+
+    def test_rerun_is_idempotent(self, history_engine, tmp_path):
+        """Test a second run archives nothing new"""
+        archive_dir = str(tmp_path / "archive")
+        archive_history(history_engine, 12, archive_dir, now=NOW)
+
+        assert sum(archive_history(history_engine, 12, archive_dir, now=NOW).values()) == 0
+        assert len(read_archived_history(1, archive_dir)) == 2
+
+    def test_manifest_skips_archives_without_the_issue(self, history_engine, tmp_path):
+        """Test archives whose manifest does not list the issue are never opened"""
+        archive_dir = str(tmp_path / "archive")
+        archive_history(history_engine, 12, archive_dir, now=NOW)
+        january = archive_path(archive_dir, datetime(2023, 1, 1))
+        with open(manifest_path(january)) as f:
+            assert json.load(f) == [1]
+
+        # Unreadable if opened: only the March archive may be read for issue 1
+        with open(january, "wb") as f:
+            f.write(b"not gzip")
+        with open(manifest_path(january), "w") as f:
+            json.dump([2], f)
+        assert [row["id"] for row in read_archived_history(1, archive_dir)] == [2]
+
+    def test_read_archived_history_since(self, history_engine, tmp_path):
+        """Test archives of months before the issue existed are skipped"""
+        archive_dir = str(tmp_path / "archive")
+        archive_history(history_engine, 12, archive_dir, now=NOW)
+
+        rows = read_archived_history(1, archive_dir, since=datetime(2023, 2, 20))
+        assert [row["id"] for row in rows] == [2]
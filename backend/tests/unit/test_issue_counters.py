@@ -0,0 +1,62 @@
+import pytest
+from sqlalchemy import create_engine, select, update
+
+from app.core.database import Base
+from app.core.issue_counters import repair_issue_counters
+from app.models import Comment, Issue, IssueLabel, Label, User
+
+
+@pytest.fixture
+def counters_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'counters.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(User.__table__.insert().values(
+            id=1, email="a@example.com", username="a", hashed_password="x"
+        ))
+        connection.execute(Issue.__table__.insert(), [
+            {"id": issue_id, "title": f"Issue {issue_id}", "creator_id": 1} for issue_id in (1, 2, 3)
+        ])
+        connection.execute(Label.__table__.insert(), [
+            {"id": 1, "name": "bug", "color": "#FF0000"},
+            {"id": 2, "name": "api", "color": "#00FF00"},
+        ])
+        connection.execute(IssueLabel.__table__.insert(), [
+            {"issue_id": 1, "label_id": 1},
+            {"issue_id": 1, "label_id": 2},
+        ])
+        connection.execute(Comment.__table__.insert(), [
+            {"issue_id": 1, "author_id": 1, "body": "one"},
+            {"issue_id": 1, "author_id": 1, "body": "two"},
+            {"issue_id": 3, "author_id": 1, "body": "three"},
+        ])
+        # Issue 2 drifted: counters claim data that does not exist
+        connection.execute(
+            update(Issue).where(Issue.id == 2).values(comment_count=7, label_names=["stale"])
+        )
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.unit
+class TestRepairIssueCounters:
+    """Test bulk recomputation of denormalized issue counters"""
+
+    def test_repairs_drifted_rows(self, counters_engine):
+        """Test every wrong row is fixed, across batch boundaries"""
+        assert repair_issue_counters(counters_engine, batch_size=2) == 3
+
+        with counters_engine.connect() as connection:
+            rows = connection.execute(
+                select(Issue.id, Issue.comment_count, Issue.label_names).order_by(Issue.id)
+            ).all()
+        assert [tuple(row) for row in rows] == [
+            (1, 2, ["api", "bug"]),
+            (2, 0, []),
+            (3, 1, []),
+        ]
+
+    def test_second_run_finds_nothing(self, counters_engine):
+        """Test a repaired table needs no further changes"""
+        repair_issue_counters(counters_engine)
+        assert repair_issue_counters(counters_engine) == 0
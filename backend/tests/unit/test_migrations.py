@@ -0,0 +1,59 @@
+import pytest
+from alembic import command
+from sqlalchemy import create_engine, inspect, text
+
+from app.core.database import Base
+from app.init_db import BASELINE_REVISION, get_alembic_config, init_db
+
+
+def _schema(url):
+    """Index and unique constraint definitions per table"""
+    inspector = inspect(create_engine(url))
+    schema = {}
+    for table in inspector.get_table_names():
+        if table == "alembic_version":
+            continue
+        schema[table] = {
+            "indexes": sorted(
+                (index["name"], tuple(index["column_names"]), bool(index["unique"]))
+                for index in inspector.get_indexes(table)
+            ),
+            "unique": sorted(
+                (constraint["name"], tuple(constraint["column_names"]))
+                for constraint in inspector.get_unique_constraints(table)
+            ),
+            "columns": sorted(column["name"] for column in inspector.get_columns(table)),
+        }
+    return schema
+
+
+@pytest.mark.unit
+class TestMigrations:
+    """Test versioned schema migrations"""
+
+    def test_migrations_match_models(self, tmp_path):
+        """Test upgrading to head yields the same schema as the models"""
+        migrated_url = f"sqlite:///{tmp_path / 'migrated.db'}"
+        init_db(migrated_url)
+
+        models_url = f"sqlite:///{tmp_path / 'models.db'}"
+        Base.metadata.create_all(bind=create_engine(models_url))
+
+        assert _schema(migrated_url) == _schema(models_url)
+
+    def test_existing_schema_is_stamped(self, tmp_path):
+        """Test a database created before migrations is upgraded in place"""
+        url = f"sqlite:///{tmp_path / 'legacy.db'}"
+        engine = create_engine(url)
+        # The schema create_all used to produce, without any migration bookkeeping
+        command.upgrade(get_alembic_config(url), BASELINE_REVISION)
+        with engine.begin() as connection:
+            connection.execute(text("DROP TABLE alembic_version"))
+
+        init_db(url)
+
+        inspector = inspect(engine)
+        assert inspector.has_table("alembic_version")
+        index_names = {index["name"] for index in inspector.get_indexes("issues")}
+        assert "ix_issues_status_created_at_id" in index_names
+        assert "comment_count" in {column["name"] for column in inspector.get_columns("issues")}
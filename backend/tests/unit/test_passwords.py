@@ -0,0 +1,40 @@
+import pytest
+from fastapi import HTTPException
+
+from app.core.password_hashing import hash_password, hash_rounds, needs_rehash
+from app.core.passwords import PasswordHasher
+
+
+@pytest.mark.unit
+class TestPasswordHasher:
+    """Test bcrypt offloading"""
+
+    @pytest.mark.asyncio
+    async def test_process_pool_round_trip(self):
+        """Test hashing and verification in a worker process"""
+        hasher = PasswordHasher(workers=1, max_pending=4, rounds=4)
+        try:
+            hashed = await hasher.hash("secret")
+            assert hash_rounds(hashed) == 4
+            assert await hasher.verify("secret", hashed)
+            assert not await hasher.verify("wrong", hashed)
+        finally:
+            await hasher.shutdown()
+        assert hasher.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_queue_depth_limit(self):
+        """Test callers beyond the pending limit are turned away immediately"""
+        hasher = PasswordHasher(workers=0, max_pending=0, rounds=4)
+        with pytest.raises(HTTPException) as error:
+            await hasher.hash("secret")
+        assert error.value.status_code == 503
+        assert error.value.headers["Retry-After"] == "1"
+        assert hasher.pending == 0
+
+    def test_needs_rehash(self):
+        """Test hashes are flagged when their cost differs from the configured one"""
+        hashed = hash_password("secret", 4)
+        assert not needs_rehash(hashed, 4)
+        assert needs_rehash(hashed, 5)
+        assert needs_rehash("not-a-bcrypt-hash", 4)
@@ -0,0 +1,60 @@
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from app.core.database import InstrumentedQueuePool
+
+
+@pytest.mark.unit
+class TestInstrumentedQueuePool:
+    """Test connection pool instrumentation"""
+
+    def test_records_checkout_wait(self, tmp_path):
+        """Test each checkout is recorded in the wait histogram"""
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}",
+            poolclass=InstrumentedQueuePool,
+            pool_size=2,
+            max_overflow=0,
+        )
+        pool = engine.pool
+
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            assert pool.checkedout() == 1
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+        snapshot = pool.checkout_wait_ms.snapshot()
+        assert snapshot["count"] == 2
+        assert snapshot["buckets"][-1]["count"] == 2
+        assert pool.checkedout() == 0
+        assert pool.waiters() == 0
+
+    def test_counts_only_blocked_checkouts(self, tmp_path):
+        """Test a checkout is a waiter only while the pool is exhausted"""
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}",
+            poolclass=InstrumentedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.05,
+        )
+        pool = engine.pool
+        observed = []
+        checkout = QueuePool._do_get
+
+        def observing_do_get(self):
+            observed.append(self.waiters())
+            return checkout(self)
+
+        with patch.object(QueuePool, "_do_get", observing_do_get):
+            with engine.connect():
+                with pytest.raises(PoolTimeoutError):
+                    engine.connect()
+
+        assert observed == [0, 1]
+        assert pool.waiters() == 0
@@ -0,0 +1,128 @@
+import asyncio
+import cProfile
+import pstats
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.core.profiling import PROFILE_ID_HEADER, ProfileStore, ProfilingMiddleware, stats_report
+
+ADMIN = {"X-Profile": "1", "Authorization": "Bearer admin"}
+
+
+def spin_profiled(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def spin_other(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+async def allow_admins(scope):
+    return 1 if dict(scope["headers"]).get(b"authorization") == b"Bearer admin" else None
+
+
+def _functions(profiler: cProfile.Profile) -> set:
+    return {name for _, _, name in pstats.Stats(profiler).stats}
+
+
+@pytest.fixture
+def profiled_app():
+    """A small app behind the profiling middleware, with CPU-bound endpoints"""
+    app = FastAPI()
+    store = ProfileStore(size=5)
+
+    @app.get("/profiled")
+    async def profiled():
+        # Yield between slices so a concurrent request gets the loop too
+        for _ in range(10):
+            spin_profiled(0.002)
+            await asyncio.sleep(0)
+        return {"ok": True}
+
+    @app.get("/other")
+    async def other():
+        for _ in range(10):
+            spin_other(0.002)
+            await asyncio.sleep(0)
+        return {"ok": True}
+
+    @app.get("/child-task")
+    async def child_task():
+        await asyncio.get_running_loop().create_task(profiled())
+        return {"ok": True}
+
+    return ProfilingMiddleware(app, store=store, authorize=allow_admins), store
+
+
+def _get(wrapped, requests):
+    """Send (path, headers) requests concurrently; also returns the loop's task factory afterwards"""
+    async def send_all():
+        transport = httpx.ASGITransport(app=wrapped)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            responses = await asyncio.gather(*(client.get(path, headers=headers) for path, headers in requests))
+        return responses, asyncio.get_running_loop().get_task_factory()
+    return asyncio.run(send_all())
+
+
+@pytest.mark.unit
+class TestProfiling:
+    """Test on-demand request profiling"""
+
+    def test_profiles_only_the_flagged_request(self, profiled_app):
+        """Test a concurrent request's calls are not recorded, and the task factory is restored"""
+        wrapped, store = profiled_app
+        (profiled, other), task_factory = _get(wrapped, [("/profiled", ADMIN), ("/other", {})])
+        assert profiled.status_code == 200 and other.status_code == 200
+        assert PROFILE_ID_HEADER not in other.headers
+        assert task_factory is None
+
+        profile = store.get(profiled.headers[PROFILE_ID_HEADER])
+        assert profile["path"] == "/profiled"
+        assert profile["status_code"] == 200
+        assert profile["function_calls"] > 0
+        assert 0 < profile["profiled_ms"] <= profile["duration_ms"]
+        functions = _functions(profile["profiler"])
+        assert "spin_profiled" in functions
+        assert "spin_other" not in functions
+        assert "spin_profiled" in stats_report(profile["profiler"])
+
+    def test_child_tasks_are_profiled(self, profiled_app):
+        """Test work in tasks spawned by the request is included"""
+        wrapped, store = profiled_app
+        (response,), _ = _get(wrapped, [("/child-task", ADMIN)])
+        profile = store.get(response.headers[PROFILE_ID_HEADER])
+        assert "spin_profiled" in _functions(profile["profiler"])
+
+    def test_requires_admin(self, profiled_app):
+        """Test the header is refused without an admin token"""
+        wrapped, store = profiled_app
+        (response,), _ = _get(wrapped, [("/profiled", {"X-Profile": "1"})])
+        assert response.status_code == 403
+        assert store.list() == []
+
+    def test_no_header_no_profile(self, profiled_app):
+        """Test ordinary requests are passed through untouched"""
+        wrapped, store = profiled_app
+        (response,), _ = _get(wrapped, [("/profiled", {"Authorization": "Bearer admin"})])
+        assert response.status_code == 200
+        assert PROFILE_ID_HEADER not in response.headers
+        assert store.list() == []
+
+    def test_store_writes_directory(self, tmp_path):
+        """Test only the newest profiles are kept, and each is also written as a .pstats file"""
+        store = ProfileStore(size=1, directory=str(tmp_path))
+        for profile_id in ("abc", "def"):
+            profiler = cProfile.Profile()
+            profiler.runcall(spin_profiled, 0.001)
+            store.add({"id": profile_id, "profiler": profiler})
+
+        assert [profile["id"] for profile in store.list()] == ["def"]
+        stats = pstats.Stats(str(tmp_path / "abc.pstats"))
+        assert "spin_profiled" in {name for _, _, name in stats.stats}
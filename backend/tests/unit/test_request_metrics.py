@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.core.request_metrics import (
+    RequestMetrics,
+    RequestMetricsMiddleware,
+    RequestTiming,
+    _current_timing,
+    time_endpoints,
+)
+
+
+def _server_timing(header: str) -> dict:
+    parts = (part.strip().split(";dur=") for part in header.split(","))
+    return {name: float(value) for name, value in parts}
+
+
+@pytest.fixture
+def instrumented():
+    """A small app with the metrics middleware and a slow endpoint"""
+    app = FastAPI()
+    metrics = RequestMetrics()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        await asyncio.sleep(0.02)
+        return {"id": item_id, "payload": "x" * 500}
+
+    @app.post("/items")
+    def create_item(item: dict):
+        return item
+
+    time_endpoints(app.routes)
+    time_endpoints(app.routes)  # Idempotent
+    app.add_middleware(RequestMetricsMiddleware, metrics=metrics)
+    return TestClient(app), metrics
+
+
+@pytest.mark.unit
+class TestRequestMetrics:
+    """Test per-route request metrics"""
+
+    def test_series_use_route_templates(self, instrumented):
+        """Test requests are labelled by route template, with unmatched paths collapsed"""
+        client, metrics = instrumented
+        client.get("/items/1")
+        client.get("/items/2")
+        client.get("/nope/1")
+        client.get("/nope/2")
+
+        output = metrics.render()
+        assert (
+            'http_request_duration_seconds_count{method="GET",route="/items/{item_id}",status="200"} 2'
+            in output
+        )
+        assert 'route="unmatched",status="404"} 2' in output
+        assert "/items/1" not in output and "/nope" not in output
+        assert 'http_requests_in_progress{method="GET"} 0' in output
+
+    def test_payload_sizes(self, instrumented):
+        """Test request and response body sizes are recorded"""
+        client, metrics = instrumented
+        response = client.post("/items", json={"name": "a" * 2000})
+
+        output = metrics.render()
+        labels = 'method="POST",route="/items",status="200"'
+        assert f"http_request_size_bytes_sum{{{labels}}} {len(response.request.content)}.000000" in output
+        assert f'http_response_size_bytes_bucket{{{labels},le="1000"}} 0' in output
+        assert f'http_response_size_bytes_bucket{{{labels},le="10000"}} 1' in output
+
+    def test_server_timing_header(self, instrumented):
+        """Test Server-Timing splits the request into db, app and serialization time"""
+        client, _ = instrumented
+        timings = _server_timing(client.get("/items/1").headers["server-timing"])
+
+        assert set(timings) == {"db", "app", "serialize", "total"}
+        assert timings["app"] >= 20
+        # Each part is rounded to 0.1 ms
+        assert timings["total"] >= timings["app"] + timings["serialize"] - 0.2
+
+    def test_db_time_is_measured(self, tmp_path):
+        """Test SQL execution time is added to the current request's timing"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'timing.db'}")
+        timing = RequestTiming()
+        token = _current_timing.set(timing)
+        try:
+            with engine.connect() as connection:
+                connection.execute(text(
+                    "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 200000)"
+                    " SELECT count(*) FROM n"
+                ))
+        finally:
+            _current_timing.reset(token)
+
+        assert timing.db_seconds > 0
+        header = _server_timing(timing.server_timing(0.0, 1.0))
+        assert header["db"] == pytest.approx(timing.db_seconds * 1000, abs=0.1)
+
+    def test_query_headers_and_warning(self, tmp_path, caplog):
+        """Test statement counts reach the debug headers and the N+1 warning"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'queries.db'}")
+        app = FastAPI()
+
+        @app.get("/chatty")
+        def chatty():
+            with engine.connect() as connection:
+                for _ in range(3):
+                    connection.execute(text("SELECT 1"))
+            return {}
+
+        app.add_middleware(
+            RequestMetricsMiddleware, metrics=RequestMetrics(), query_headers=True, query_count_warning=2
+        )
+        with caplog.at_level("WARNING", logger="app.core.request_metrics"):
+            response = TestClient(app).get("/chatty")
+
+        assert response.headers["x-db-query-count"] == "3"
+        assert float(response.headers["x-db-time-ms"]) >= 0
+        assert "GET /chatty -> 200: 3 SQL statements" in caplog.text
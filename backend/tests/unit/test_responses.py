@@ -0,0 +1,72 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import TypeAdapter
+
+from app.core import responses
+from app.core.config import settings
+from app.models import Issue, IssueHistory, Label, User
+from app.schemas import Issue as IssueSchema, Label as LabelSchema, TimelineEvent
+from app.schemas.user import User as UserSchema
+
+# Non-ASCII, control characters, quotes and separators that encoders tend to disagree on
+AWKWARD_TEXT = 'Ünïcødé 🐛 "quoted" \\ back/slash\n\t\x00\x1f\x7f   </script>'
+NOW = datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+
+
+def fastapi_body(model, content) -> bytes:
+    """Bytes FastAPI produces for content returned from a route with this response_model"""
+    field = create_response_field(name="Response", type_=model)
+    value = asyncio.run(serialize_response(field=field, response_content=content))
+    return JSONResponse(value).body
+
+
+@pytest.mark.unit
+class TestFastJSON:
+    """Test the fast response path matches FastAPI byte for byte"""
+
+    def test_issues(self):
+        """Test issue lists, including nulls, enums and JSON columns"""
+        issues = [
+            Issue(
+                id=i, title=AWKWARD_TEXT, description=None if i % 2 else AWKWARD_TEXT,
+                status="in_progress", priority="high", version=i, creator_id=1,
+                assignee_id=None, created_at=NOW, updated_at=NOW - timedelta(hours=i),
+                resolved_at=None, comment_count=i, label_names=["bug", AWKWARD_TEXT]
+            )
+            for i in range(1, 4)
+        ]
+        assert responses.dump_json(TypeAdapter(List[IssueSchema]), issues) == \
+            fastapi_body(List[IssueSchema], issues)
+
+    def test_users_labels_and_timeline(self):
+        """Test the other list schemas, including naive datetimes and nested models"""
+        author = User(id=1, username=AWKWARD_TEXT, email="a@example.com", full_name=None,
+                      created_at=NOW.replace(tzinfo=None))
+        labels = [Label(id=1, name=AWKWARD_TEXT, color="#FF0000", created_at=NOW)]
+        timeline = [IssueHistory(
+            id=1, issue_id=1, changed_by_id=1, field_name="status", old_value=None,
+            new_value=AWKWARD_TEXT, changed_at=NOW, changed_by=author
+        )]
+
+        for model, content in (
+            (List[UserSchema], [author]),
+            (List[LabelSchema], labels),
+            (List[TimelineEvent], timeline),
+        ):
+            assert responses.dump_json(TypeAdapter(model), content) == fastapi_body(model, content)
+
+    def test_disabled_by_default(self, monkeypatch):
+        """Test items are handed back to the response_model unless opted in"""
+        items = [object()]
+        assert responses.json_list_response(TypeAdapter(List[LabelSchema]), items) is items
+
+        monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+        response = responses.json_list_response(TypeAdapter(List[LabelSchema]), [])
+        assert response.body == b"[]"
+        assert response.media_type == "application/json"
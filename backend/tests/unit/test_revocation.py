@@ -0,0 +1,111 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core import revocation
+from app.core.database import Base
+from app.core.revocation import RevocationList
+from app.models import RevokedToken, User
+
+LATER = datetime.now(timezone.utc) + timedelta(days=1)
+
+
+@pytest.fixture
+def async_engine(tmp_path):
+    """Create a database with one user and return an async engine for it"""
+    path = tmp_path / "revocation.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(User.__table__.insert().values(
+            id=1, username="u", email="u@example.com", hashed_password="x"
+        ))
+    engine.dispose()
+    return create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestRevocationList:
+    """Test the in-memory revocation list"""
+
+    async def test_lookups_between_refreshes_do_not_query(self, async_engine):
+        """Test only the first check within a refresh interval reaches the database"""
+        statements = []
+        event.listen(
+            async_engine.sync_engine, "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement)
+        )
+        revoked = RevocationList(refresh_seconds=60)
+
+        async with async_sessionmaker(async_engine)() as db:
+            for _ in range(50):
+                assert await revoked.is_revoked(db, "live") is False
+            assert await revoked.is_revoked(db, None) is False
+        assert len(statements) == 1
+
+    async def test_refresh_is_incremental_and_drops_expired(self, async_engine, monkeypatch):
+        """Test a refresh only loads new rows and forgets expired tokens"""
+        revoked = RevocationList(refresh_seconds=0)
+        soon = datetime.now(timezone.utc) + timedelta(minutes=1)
+
+        async with async_sessionmaker(async_engine)() as db:
+            db.add_all([
+                RevokedToken(jti="a", user_id=1, expires_at=LATER),
+                RevokedToken(jti="b", user_id=1, expires_at=soon),
+            ])
+            await db.commit()
+            assert await revoked.is_revoked(db, "a")
+            assert await revoked.is_revoked(db, "b")
+
+            db.add(RevokedToken(jti="c", user_id=1, expires_at=LATER))
+            await db.commit()
+            statements = []
+            event.listen(
+                async_engine.sync_engine, "before_cursor_execute",
+                lambda conn, cursor, statement, parameters, *args: statements.append(parameters)
+            )
+            monkeypatch.setattr(revocation.time, "time", lambda: soon.timestamp() + 1)
+            await revoked.refresh(db)
+
+        assert len(statements) == 1 and statements[0][0] == 2
+        assert sorted(revoked._expiry) == ["a", "c"]
+
+    async def test_refresh_loads_revocations_committed_out_of_order(self, async_engine):
+        """Test a row committed after a higher id was loaded is still picked up"""
+        revoked = RevocationList(refresh_seconds=0)
+
+        async with async_sessionmaker(async_engine)() as db:
+            db.add_all([
+                RevokedToken(id=1, jti="a", user_id=1, expires_at=LATER),
+                RevokedToken(id=3, jti="c", user_id=1, expires_at=LATER),
+            ])
+            await db.commit()
+            await revoked.refresh(db)
+            assert revoked._last_id == 3
+
+            # Id 2 was handed out first, but its transaction commits last
+            db.add(RevokedToken(id=2, jti="b", user_id=1, expires_at=LATER))
+            await db.commit()
+            await revoked.refresh(db)
+
+        assert sorted(revoked._expiry) == ["a", "b", "c"]
+
+    async def test_revoke_purges_expired_rows(self, async_engine):
+        """Test revoking records the token once and removes rows that no longer matter"""
+        revoked = RevocationList(refresh_seconds=60)
+        past = datetime.now(timezone.utc) - timedelta(minutes=1)
+
+        async with async_sessionmaker(async_engine)() as db:
+            db.add(RevokedToken(jti="old", user_id=1, expires_at=past))
+            await db.commit()
+            await revoked.revoke(db, "new", 1, time.time() + 3600)
+            await revoked.revoke(db, "new", 1, time.time() + 3600)
+            jtis = (await db.execute(select(RevokedToken.jti))).scalars().all()
+
+        assert jtis == ["new"]
+        assert "new" in revoked._expiry
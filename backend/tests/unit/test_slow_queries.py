@@ -0,0 +1,104 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.core.slow_queries import SlowQueryLog, parameter_shape, slow_query_log
+
+
+@pytest.fixture
+def sqlite_engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def slow_log(sqlite_engine, monkeypatch):
+    """Treat every statement as slow, on a fresh log (after the table is created)"""
+    log = SlowQueryLog(threshold_ms=1e-6, size=3)
+    monkeypatch.setattr(slow_query_log, "threshold_ms", log.threshold_ms)
+    monkeypatch.setattr(slow_query_log, "record", log.record)
+    return log
+
+
+class FailingCursor:
+    """DBAPI cursor whose connection is in an aborted transaction"""
+
+    def __init__(self):
+        self.executed = []
+        self.closed = False
+
+    def execute(self, statement, parameters=None):
+        self.executed.append(statement)
+        raise RuntimeError("current transaction is aborted")
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.unit
+class TestSlowQueries:
+    """Test the slow-query log"""
+
+    def test_parameter_shape(self):
+        """Test parameters are described by type, with runs collapsed and no values"""
+        assert parameter_shape((1, 2, 3, "secret")) == "(int*3, str)"
+        assert parameter_shape({"email": "a@example.com", "limit": 10}) == "{email: str, limit: int}"
+        assert parameter_shape([(1,), (2,)], executemany=True) == "2 x (int)"
+        assert parameter_shape(()) == "()"
+
+    def test_slow_statement_recorded_with_plan(self, slow_log, sqlite_engine):
+        """Test a slow SELECT is kept with its parameter shape and plan"""
+        with sqlite_engine.connect() as conn:
+            conn.execute(text("SELECT name FROM items WHERE id = :id"), {"id": 7})
+
+        entry = slow_log.entries()[0]
+        assert entry["statement"] == "SELECT name FROM items WHERE id = ?"
+        assert entry["parameters"] == "(int)"
+        assert "7" not in entry["parameters"]
+        assert "USING INTEGER PRIMARY KEY" in entry["plan"]
+        assert entry["route"] is None
+        assert entry["analyzed"] is False
+
+    def test_executemany_not_explained(self, slow_log, sqlite_engine):
+        """Test bulk inserts are recorded without running EXPLAIN"""
+        with sqlite_engine.begin() as conn:
+            conn.execute(text("INSERT INTO items (name) VALUES (:name)"), [{"name": "a"}, {"name": "b"}])
+
+        entry = slow_log.entries()[0]
+        assert entry["parameters"] == "2 x (str)"
+        assert entry["plan"] is None
+
+    def test_ring_buffer_keeps_newest(self, slow_log, sqlite_engine):
+        """Test only the last entries are kept, newest first"""
+        with sqlite_engine.connect() as conn:
+            for n in range(5):
+                conn.execute(text(f"SELECT {n}"))
+
+        assert [entry["statement"] for entry in slow_log.entries()] == ["SELECT 4", "SELECT 3", "SELECT 2"]
+
+    def test_fast_statements_ignored(self, slow_log, sqlite_engine, monkeypatch):
+        """Test statements under the threshold are not recorded"""
+        monkeypatch.setattr(slow_query_log, "threshold_ms", 60000)
+        with sqlite_engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        assert slow_log.entries() == []
+
+    def test_failed_savepoint_records_no_plan(self):
+        """Test a SAVEPOINT that fails is logged and the statement recorded without a plan"""
+        log = SlowQueryLog(threshold_ms=1e-6, size=3)
+        cursor = FailingCursor()
+        conn = SimpleNamespace(
+            dialect=SimpleNamespace(name="postgresql"),
+            connection=SimpleNamespace(cursor=lambda: cursor),
+        )
+
+        log.record(conn, "SELECT 1", (), False, 1.0)
+
+        assert log.entries()[0]["plan"] is None
+        assert cursor.executed == ["SAVEPOINT slow_query_explain"]
+        assert cursor.closed
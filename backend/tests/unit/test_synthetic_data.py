@@ -0,0 +1,80 @@
+from collections import Counter
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, select
+
+from app.core.database import Base
+from app.core.synthetic_data import generate_dataset
+from app.models import Comment, Issue, IssueHistory, IssueLabel, IssueStatus, Label
+
+UNTIL = datetime(2026, 1, 31, tzinfo=timezone.utc)
+
+
+def _engine(path):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def _generate(engine, seed=7):
+    return generate_dataset(engine, users=20, issues=300, labels=8, seed=seed, until=UNTIL, batch_size=64)
+
+
+@pytest.mark.unit
+class TestSyntheticData:
+    """Test the bulk data generator"""
+
+    def test_counts_and_consistency(self, tmp_path):
+        """Test denormalized columns, versions and resolved_at agree with the generated rows"""
+        engine = _engine(tmp_path / "data.db")
+        counts = _generate(engine)
+
+        with engine.connect() as connection:
+            issues = connection.execute(select(Issue.__table__)).mappings().all()
+            history = connection.execute(select(IssueHistory.__table__)).mappings().all()
+            comments = Counter(connection.execute(select(Comment.issue_id)).scalars())
+            label_names = dict(connection.execute(select(Label.id, Label.name)).all())
+            issue_labels = connection.execute(select(IssueLabel.issue_id, IssueLabel.label_id)).all()
+
+        assert counts["issues"] == len(issues) == 300
+        assert counts["issue_history"] == len(history)
+        assert counts["comments"] == sum(comments.values())
+        names = {}
+        for issue_id, label_id in issue_labels:
+            names.setdefault(issue_id, []).append(label_names[label_id])
+        trails = {}
+        for row in history:
+            trails.setdefault(row["issue_id"], []).append(row)
+
+        for issue in issues:
+            trail = trails[issue["id"]]
+            assert trail[0]["field_name"] == "created"
+            assert [row["changed_at"] for row in trail] == sorted(row["changed_at"] for row in trail)
+            assert issue["version"] == len(trail)
+            assert issue["comment_count"] == comments[issue["id"]]
+            assert issue["label_names"] == sorted(names.get(issue["id"], []))
+            statuses = [row["new_value"] for row in trail if row["field_name"] == "status"]
+            assert (statuses[-1] if statuses else "open") == issue["status"].value
+            assert (issue["resolved_at"] is not None) == (IssueStatus.RESOLVED.value in statuses)
+
+    def test_same_seed_same_data(self, tmp_path):
+        """Test a seed reproduces the dataset exactly, and another seed does not"""
+        def snapshot(path, seed):
+            engine = _engine(path)
+            _generate(engine, seed)
+            with engine.connect() as connection:
+                return connection.execute(
+                    select(Issue.title, Issue.status, Issue.assignee_id, Issue.created_at)
+                ).all()
+
+        first = snapshot(tmp_path / "a.db", 1)
+        assert snapshot(tmp_path / "b.db", 1) == first
+        assert snapshot(tmp_path / "c.db", 2) != first
+
+    def test_refuses_non_empty_database(self, tmp_path):
+        """Test generating twice into the same database is rejected"""
+        engine = _engine(tmp_path / "data.db")
+        _generate(engine)
+        with pytest.raises(ValueError):
+            _generate(engine)
@@ -0,0 +1,69 @@
+import pytest
+
+from app.core import throttle
+from app.core.throttle import MemoryThrottleBackend
+
+
+@pytest.mark.unit
+class TestMemoryThrottleBackend:
+    """Test in-memory token buckets"""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_refill(self, monkeypatch):
+        """Test a bucket allows its burst, then one attempt per refill interval"""
+        now = [100.0]
+        monkeypatch.setattr(throttle.time, "monotonic", lambda: now[0])
+        backend = MemoryThrottleBackend()
+
+        assert [await backend.consume("k", 3, 6) for _ in range(3)] == [0, 0, 0]
+        assert await backend.consume("k", 3, 6) == pytest.approx(10)
+
+        now[0] += 10
+        assert await backend.consume("k", 3, 6) == 0
+        assert await backend.consume("other", 3, 6) == 0
+
+    @pytest.mark.asyncio
+    async def test_prunes_refilled_buckets(self, monkeypatch):
+        """Test the bucket table stays bounded by dropping refilled buckets"""
+        now = [100.0]
+        monkeypatch.setattr(throttle.time, "monotonic", lambda: now[0])
+        monkeypatch.setattr(MemoryThrottleBackend, "MAX_BUCKETS", 2)
+        backend = MemoryThrottleBackend()
+        await backend.consume("a", 1, 60)
+        await backend.consume("b", 1, 60)
+
+        now[0] += 5
+        await backend.consume("c", 1, 60)
+        assert set(backend._buckets) == {"c"}
+
+    @pytest.mark.asyncio
+    async def test_prune_keeps_partially_refilled_buckets(self, monkeypatch):
+        """Test a bucket still below its burst survives pruning"""
+        now = [100.0]
+        monkeypatch.setattr(throttle.time, "monotonic", lambda: now[0])
+        monkeypatch.setattr(MemoryThrottleBackend, "MAX_BUCKETS", 10)
+        backend = MemoryThrottleBackend()
+        for _ in range(5):
+            await backend.consume("drained", 5, 60)
+        for key in range(9):
+            await backend.consume(str(key), 1, 60)
+
+        # One token back for "drained", the single-token buckets are full again
+        now[0] += 1
+        await backend.consume("new", 1, 60)
+        assert set(backend._buckets) == {"drained", "new"}
+        assert [await backend.consume("drained", 5, 60) for _ in range(2)] == [0, pytest.approx(1)]
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used_when_nothing_refilled(self, monkeypatch):
+        """Test the bucket table stays bounded when every bucket is still draining"""
+        monkeypatch.setattr(throttle.time, "monotonic", lambda: 100.0)
+        monkeypatch.setattr(MemoryThrottleBackend, "MAX_BUCKETS", 10)
+        backend = MemoryThrottleBackend()
+        for key in range(10):
+            await backend.consume(str(key), 1, 60)
+        await backend.consume("0", 1, 60)
+
+        await backend.consume("new", 1, 60)
+        # "1" is the least recently used once "0" has been touched again
+        assert list(backend._buckets) == ["2", "3", "4", "5", "6", "7", "8", "9", "0", "new"]
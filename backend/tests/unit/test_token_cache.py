@@ -0,0 +1,71 @@
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import auth, cache
+from app.core.auth import create_access_token, decode_access_token, token_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    token_cache.clear()
+    yield
+    token_cache.clear()
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    calls = []
+    original = auth.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(auth.jwt, "decode", counting_decode)
+    return calls
+
+
+@pytest.mark.unit
+class TestTokenCache:
+    """Test reuse of verified access tokens"""
+
+    def test_repeat_decode_skips_verification(self, decode_calls):
+        """Test a token is verified once and then served from the cache"""
+        token = create_access_token({"sub": "7", "username": "alice"})
+
+        first = decode_access_token(token)
+        second = decode_access_token(token)
+
+        assert (second.user_id, second.username) == (7, "alice")
+        assert first is second
+        assert len(decode_calls) == 1
+
+    def test_entry_does_not_outlive_exp(self, decode_calls, monkeypatch):
+        """Test a cached token goes back to verification once its exp has passed"""
+        token = create_access_token({"sub": "7"}, expires_delta=timedelta(seconds=30))
+        decode_access_token(token)
+        decode_access_token(token)
+        assert len(decode_calls) == 1
+
+        clock = cache.time.monotonic() + 31
+        monkeypatch.setattr(cache.time, "monotonic", lambda: clock)
+        decode_access_token(token)
+        assert len(decode_calls) == 2
+
+    def test_invalid_tokens_are_not_cached(self, decode_calls):
+        """Test rejected tokens are verified again on every attempt"""
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                decode_access_token("not-a-token")
+        assert len(decode_calls) == 2
+        assert len(token_cache) == 0
+
+    def test_disabled_cache(self, decode_calls, monkeypatch):
+        """Test TOKEN_CACHE_SIZE=0 verifies every time"""
+        monkeypatch.setattr(token_cache, "maxsize", 0)
+        token = create_access_token({"sub": "7"})
+        decode_access_token(token)
+        decode_access_token(token)
+        assert len(decode_calls) == 2
@@ -9,6 +9,7 @@ import Login from './pages/Login';
 import Register from './pages/Register';
 import ForgotPassword from './pages/ForgotPassword';
 import ProtectedRoute from './components/ProtectedRoute';
+import { authAPI } from './services/api';
 
 function App() {
   const navigate = useNavigate();
@@ -28,6 +29,8 @@ function App() {
   }, []);
 
   const handleLogout = () => {
+    // Revoke the token server-side; sent before it is removed from storage
+    authAPI.logout().catch(() => {});
     localStorage.removeItem('token');
     localStorage.removeItem('user');
     setUser(null);